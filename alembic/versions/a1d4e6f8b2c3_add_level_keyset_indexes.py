@@ -0,0 +1,42 @@
+"""add level keyset indexes
+
+Revision ID: a1d4e6f8b2c3
+Revises: 9c2b7f1e3a4d
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a1d4e6f8b2c3"
+down_revision: Union[str, Sequence[str], None] = "9c2b7f1e3a4d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_levels_official_keyset",
+        "levels",
+        ["official_order", "id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PUBLISHED' AND is_official = true"),
+    )
+    op.create_index(
+        "ix_levels_community_keyset",
+        "levels",
+        ["created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PUBLISHED' AND is_official = false"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_levels_community_keyset", table_name="levels")
+    op.drop_index("ix_levels_official_keyset", table_name="levels")
@@ -0,0 +1,166 @@
+"""add level map_packed column
+
+Revision ID: b7e3c9d2f1a5
+Revises: a1d4e6f8b2c3
+Create Date: 2026-10-17 10:00:00.000000
+
+回填使用本檔內凍結的正規化與編碼（packed 格式 version 1），
+不 import app 的 codec/schema，之後修改它們不會改變這個 migration 的結果。
+"""
+import struct
+from typing import Any, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3c9d2f1a5"
+down_revision: Union[str, Sequence[str], None] = "a1d4e6f8b2c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+# --- 凍結的 packed 格式 version 1（對應 app/core/map_codec.py 當時的實作） ---
+MAX_DIMENSION = 128
+_HEADER = struct.Struct(">BBBBBBBH")
+_COLOR_CODES = {"R": 1, "G": 2, "B": 3}
+
+levels = sa.table(
+    "levels",
+    sa.column("id", sa.String),
+    sa.column("map_data", JSONB),
+    sa.column("map_packed", sa.LargeBinary),
+)
+
+
+class _NotNormalized(ValueError):
+    """map_data 缺少 bounds，需先正規化"""
+
+
+def _encode_map(map_data: dict[str, Any]) -> bytes:
+    """將正規化後的 map_data 編碼為 packed grid（format version 1）"""
+    bounds = map_data.get("bounds")
+    if not bounds:
+        raise _NotNormalized("地圖缺少 bounds")
+    width = bounds["maxX"] - bounds["minX"] + 1
+    height = bounds["maxY"] - bounds["minY"] + 1
+    stars = map_data["stars"]
+    start = map_data["start"]
+
+    out = bytearray(_HEADER.pack(
+        1, width, height, map_data.get("padding", 0),
+        start["x"], start["y"], start["dir"], len(stars),
+    ))
+    for star in stars:
+        out += bytes((star["x"], star["y"]))
+
+    grid = bytearray((width * height + 3) // 4)
+    for tile in map_data["tiles"]:
+        x, y = tile["x"], tile["y"]
+        if not (0 <= x < width and 0 <= y < height):
+            raise _NotNormalized(f"地板座標超出 bounds: ({x}, {y})")
+        index = y * width + x
+        shift = 6 - (index & 3) * 2
+        byte = index >> 2
+        grid[byte] = (grid[byte] & ~(3 << shift)) | (_COLOR_CODES[tile["color"]] << shift)
+    out += grid
+    return bytes(out)
+
+
+def _normalize_map(map_data: dict[str, Any]) -> dict[str, Any]:
+    """將舊地圖正規化（與當時 MapData 驗證的結果相同）
+
+    座標平移到 padding 之後、地板以最後一筆去重、星星去重、起點補地板、
+    計算 bounds 與 gridSize。
+    """
+    padding = map_data.get("padding", 0)
+    start = {"x": map_data["start"]["x"], "y": map_data["start"]["y"], "dir": map_data["start"]["dir"]}
+
+    tiles: dict[tuple[int, int], dict] = {}
+    for tile in map_data["tiles"]:
+        tiles[(tile["x"], tile["y"])] = {"x": tile["x"], "y": tile["y"], "color": tile["color"]}
+    stars: dict[tuple[int, int], dict] = {}
+    for star in map_data["stars"]:
+        stars.setdefault((star["x"], star["y"]), {"x": star["x"], "y": star["y"]})
+
+    xs = [start["x"], *(x for x, _ in tiles), *(x for x, _ in stars)]
+    ys = [start["y"], *(y for _, y in tiles), *(y for _, y in stars)]
+    min_x, min_y = min(xs), min(ys)
+    width = max(xs) - min_x + 1 + padding * 2
+    height = max(ys) - min_y + 1 + padding * 2
+    if width > MAX_DIMENSION or height > MAX_DIMENSION:
+        raise ValueError(f"地圖尺寸過大，最多 {MAX_DIMENSION}x{MAX_DIMENSION} (含預留空氣)")
+
+    if (start["x"], start["y"]) not in tiles:
+        tiles[(start["x"], start["y"])] = {"x": start["x"], "y": start["y"], "color": "R"}
+
+    shift_x, shift_y = padding - min_x, padding - min_y
+    for point in (start, *tiles.values(), *stars.values()):
+        point["x"] += shift_x
+        point["y"] += shift_y
+
+    return {
+        "gridSize": max(width, height),
+        "padding": padding,
+        "bounds": {"minX": 0, "minY": 0, "maxX": width - 1, "maxY": height - 1},
+        "start": start,
+        "stars": list(stars.values()),
+        "tiles": list(tiles.values()),
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("levels", sa.Column("map_packed", sa.LargeBinary(), nullable=True))
+
+    # 依 id 分批回填，避免一次把所有 map_data 載入記憶體
+    bind = op.get_bind()
+    last_id = ""
+    while True:
+        rows = bind.execute(
+            sa.select(levels.c.id, levels.c.map_data)
+            .where(levels.c.id > last_id)
+            .order_by(levels.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        packed_only = []
+        renormalized = []
+        for row in rows:
+            try:
+                packed_only.append({"b_id": row.id, "b_packed": _encode_map(row.map_data)})
+            except (_NotNormalized, struct.error, KeyError, TypeError):
+                # 未經正規化的舊資料：重新正規化並一併更新 map_data，兩種表示保持一致；
+                # 已正規化的列只寫 map_packed，不重寫 map_data
+                map_data = _normalize_map(row.map_data)
+                renormalized.append(
+                    {"b_id": row.id, "b_map_data": map_data, "b_packed": _encode_map(map_data)}
+                )
+
+        if packed_only:
+            bind.execute(
+                levels.update()
+                .where(levels.c.id == sa.bindparam("b_id"))
+                .values(map_packed=sa.bindparam("b_packed")),
+                packed_only,
+            )
+        if renormalized:
+            bind.execute(
+                levels.update()
+                .where(levels.c.id == sa.bindparam("b_id"))
+                .values(map_data=sa.bindparam("b_map_data"), map_packed=sa.bindparam("b_packed")),
+                renormalized,
+            )
+        last_id = rows[-1].id
+
+    op.alter_column("levels", "map_packed", nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("levels", "map_packed")
@@ -0,0 +1,62 @@
+"""add level hot query indexes
+
+Revision ID: d4f8a2c6e1b3
+Revises: b7e3c9d2f1a5
+Create Date: 2026-10-17 12:00:00.000000
+
+官方/社群列表已由 ix_levels_official_keyset、ix_levels_community_keyset 涵蓋
+（a1d4e6f8b2c3）。這裡補上其餘熱門查詢：
+
+- 設計者列表 WHERE author_id = ? ORDER BY updated_at DESC
+- 審核佇列 WHERE status = 'PENDING' ORDER BY updated_at DESC
+- 下一個官方序號 max(official_order)
+
+新的複合索引以 author_id / status 開頭，取代原本的單欄索引。
+以 CREATE/DROP INDEX CONCURRENTLY 建立，不鎖住 levels 的寫入；
+CONCURRENTLY 不能在交易內執行，因此放在 autocommit_block。
+中途失敗可能留下 INVALID 索引，重跑前先 DROP INDEX CONCURRENTLY 該索引。
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4f8a2c6e1b3"
+down_revision: Union[str, Sequence[str], None] = "b7e3c9d2f1a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEW_INDEXES = (
+    ("ix_levels_author_updated", ["author_id", "updated_at"]),
+    ("ix_levels_status_updated", ["status", "updated_at"]),
+    ("ix_levels_official_order", ["official_order"]),
+)
+SUPERSEDED_INDEXES = (
+    ("ix_levels_author_id", ["author_id"]),
+    ("ix_levels_status", ["status"]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, columns in NEW_INDEXES:
+            op.create_index(
+                name, "levels", columns, unique=False,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        for name, _ in SUPERSEDED_INDEXES:
+            op.drop_index(name, table_name="levels", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, columns in SUPERSEDED_INDEXES:
+            op.create_index(
+                name, "levels", columns, unique=False,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        for name, _ in NEW_INDEXES:
+            op.drop_index(name, table_name="levels", postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,47 @@
+"""add trigram search indexes
+
+Revision ID: e5b9c3d7a2f4
+Revises: d4f8a2c6e1b3
+Create Date: 2026-10-17 13:00:00.000000
+
+管理員列表的標題、使用者名稱子字串搜尋（ILIKE '%q%'）以 pg_trgm GIN 索引支援。
+CREATE EXTENSION 需要資料庫擁有者或 superuser 權限（PostgreSQL 13+ 的 trusted
+extension 則資料庫擁有者即可）。索引以 CONCURRENTLY 建立，見 d4f8a2c6e1b3。
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b9c3d7a2f4"
+down_revision: Union[str, Sequence[str], None] = "d4f8a2c6e1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = (
+    ("ix_levels_title_trgm", "levels", "title"),
+    ("ix_users_username_trgm", "users", "username"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name, table, [column], unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in TRIGRAM_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    # pg_trgm 可能已被其他物件使用，不移除 extension
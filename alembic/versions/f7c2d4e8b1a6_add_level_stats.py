@@ -0,0 +1,161 @@
+"""add level_stats with triggers on level_progress
+
+Revision ID: f7c2d4e8b1a6
+Revises: e5b9c3d7a2f4
+Create Date: 2026-10-17 14:00:00.000000
+
+level_stats 每關一列：players、completions、steps_histogram（完成者的 best_steps 分布）、
+stars_histogram（stars_collected 分布）。level_progress 的 AFTER 觸發器依 OLD/NEW 增減，
+與進度寫入在同一交易內完成；UPDATE 觸發器只在統計相關欄位改變時執行，
+未改善成績的自動儲存不會鎖到 level_stats。最佳/中位數步數讀取時由直方圖計算。
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f7c2d4e8b1a6"
+down_revision: Union[str, Sequence[str], None] = "e5b9c3d7a2f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION level_stats_bump(histogram jsonb, bucket integer, delta integer)
+RETURNS jsonb AS $$
+    SELECT CASE
+        WHEN bucket IS NULL THEN histogram
+        WHEN coalesce((histogram ->> bucket::text)::integer, 0) + delta <= 0
+            THEN histogram - bucket::text
+        ELSE jsonb_set(
+            histogram,
+            ARRAY[bucket::text],
+            to_jsonb(coalesce((histogram ->> bucket::text)::integer, 0) + delta)
+        )
+    END
+$$ LANGUAGE sql IMMUTABLE
+"""
+
+APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION level_stats_apply() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE level_stats SET
+            players = players - 1,
+            completions = completions - OLD.is_completed::integer,
+            steps_histogram = level_stats_bump(
+                steps_histogram, CASE WHEN OLD.is_completed THEN OLD.best_steps END, -1
+            ),
+            stars_histogram = level_stats_bump(stars_histogram, OLD.stars_collected, -1),
+            updated_at = now()
+        WHERE level_id = OLD.level_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO level_stats AS s
+            (level_id, players, completions, steps_histogram, stars_histogram, updated_at)
+        VALUES (
+            NEW.level_id,
+            1,
+            NEW.is_completed::integer,
+            level_stats_bump('{}'::jsonb, CASE WHEN NEW.is_completed THEN NEW.best_steps END, 1),
+            level_stats_bump('{}'::jsonb, NEW.stars_collected, 1),
+            now()
+        )
+        ON CONFLICT (level_id) DO UPDATE SET
+            players = s.players + 1,
+            completions = s.completions + EXCLUDED.completions,
+            steps_histogram = level_stats_bump(
+                s.steps_histogram, CASE WHEN NEW.is_completed THEN NEW.best_steps END, 1
+            ),
+            stars_histogram = level_stats_bump(s.stars_histogram, NEW.stars_collected, 1),
+            updated_at = now();
+    END IF;
+
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+BACKFILL = """
+INSERT INTO level_stats (level_id, players, completions, steps_histogram, stars_histogram, updated_at)
+SELECT
+    p.level_id,
+    count(*),
+    count(*) FILTER (WHERE p.is_completed),
+    coalesce((
+        SELECT jsonb_object_agg(steps, n)
+        FROM (
+            SELECT best_steps AS steps, count(*) AS n
+            FROM level_progress
+            WHERE level_id = p.level_id AND is_completed AND best_steps IS NOT NULL
+            GROUP BY best_steps
+        ) AS steps
+    ), '{}'::jsonb),
+    coalesce((
+        SELECT jsonb_object_agg(stars, n)
+        FROM (
+            SELECT stars_collected AS stars, count(*) AS n
+            FROM level_progress
+            WHERE level_id = p.level_id AND stars_collected IS NOT NULL
+            GROUP BY stars_collected
+        ) AS stars
+    ), '{}'::jsonb),
+    now()
+FROM level_progress AS p
+GROUP BY p.level_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "level_stats",
+        sa.Column("level_id", sa.String(length=12), primary_key=True),
+        sa.Column("players", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("completions", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("steps_histogram", JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column("stars_histogram", JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.ForeignKeyConstraint(["level_id"], ["levels.id"], ondelete="CASCADE"),
+    )
+    op.execute(BUMP_FUNCTION)
+    op.execute(APPLY_FUNCTION)
+
+    # 回填與建立觸發器之間不能有新的進度寫入，否則會漏算
+    op.execute("LOCK TABLE level_progress IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(BACKFILL)
+    op.execute("""
+        CREATE TRIGGER level_progress_stats_insert_delete
+        AFTER INSERT OR DELETE ON level_progress
+        FOR EACH ROW EXECUTE FUNCTION level_stats_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER level_progress_stats_update
+        AFTER UPDATE ON level_progress
+        FOR EACH ROW
+        WHEN (
+            OLD.level_id IS DISTINCT FROM NEW.level_id
+            OR OLD.is_completed IS DISTINCT FROM NEW.is_completed
+            OR OLD.best_steps IS DISTINCT FROM NEW.best_steps
+            OR OLD.stars_collected IS DISTINCT FROM NEW.stars_collected
+        )
+        EXECUTE FUNCTION level_stats_apply()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS level_progress_stats_update ON level_progress")
+    op.execute("DROP TRIGGER IF EXISTS level_progress_stats_insert_delete ON level_progress")
+    op.execute("DROP FUNCTION IF EXISTS level_stats_apply()")
+    op.execute("DROP FUNCTION IF EXISTS level_stats_bump(jsonb, integer, integer)")
+    op.drop_table("level_stats")
@@ -1,8 +1,12 @@
 """Admin API - 需 superuser 權限"""
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Annotated, Literal
+
+from anyio import to_thread
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session, joinedload
 
-from app.database import get_db
+from app.database import get_db, engine, async_engine
 from app.models.user import User
 from app.models.level import Level, LevelStatus
 from app.models.progress import LevelProgress
@@ -10,55 +14,96 @@ from app.models.program import LevelProgram
 from app.schemas.level import (
     LevelApprove,
     LevelReject,
+    LevelBulkApprove,
+    LevelBulkReject,
+    LevelBulkResult,
     LevelDetail,
-    LevelListItem,
+    PendingLevelItem,
     AdminLevelListItem,
+    AdminLevelPage,
+    AdminLevelQuery,
     AdminLevelUpdate,
 )
-from app.schemas.user import AdminUserCreate, AdminUserUpdate, UserOut
-from app.schemas.admin import LevelTransferRequest, LevelTransferResult
+from app.schemas.user import AdminUserCreate, AdminUserUpdate, AdminUserQuery, UserOut, UserPage
+from app.schemas.admin import (
+    LevelTransferRequest,
+    LevelTransferResult,
+    DatabasePoolReport,
+    LevelEvaluationRequest,
+    LevelEvaluationReport,
+)
 from app.core.security import get_password_hash
+from app.core.auth_cache import auth_cache
 from app.core.deps import require_superuser
-from app.services import ModerationService, LevelService
+from app.services import (
+    ModerationService,
+    LevelService,
+    LevelQueryService,
+    UserQueryService,
+    EvaluationService,
+    ExportService,
+)
+from app.services.export_service import NDJSON_MEDIA_TYPE
+from app.services.level_cache import level_list_cache, visible_list, OFFICIAL, COMMUNITY
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
-@router.get("/queue", response_model=list[LevelListItem])
+@router.get("/queue", response_model=list[PendingLevelItem])
 def list_pending_levels(
+    sort: Literal["updated", "difficulty"] = Query("updated", description="difficulty = 依最短解由易到難"),
     current_user: User = Depends(require_superuser),
     db: Session = Depends(get_db)
 ):
     """列出待審核關卡
 
     Args:
+        sort: updated = 更新時間倒序；difficulty = 依發布時估計的最短解由易到難，
+            尚未估計或搜尋不到解的排最後
         current_user: 當前使用者（需為管理員）
         db: 資料庫 session
 
     Returns:
-        list[LevelListItem]: 待審核關卡列表
+        list[PendingLevelItem]: 待審核關卡列表（含最短解長度與步數）
 
     Requires:
         管理員權限
     """
-    levels = (
-        db.query(Level)
-        .options(joinedload(Level.author))
-        .filter(Level.status == LevelStatus.PENDING)
-        .order_by(Level.updated_at.desc())
-        .all()
-    )
-    return levels
+    return db.execute(LevelQueryService.pending_levels(sort)).all()
 
 
-@router.get("/users", response_model=list[UserOut])
+@router.get("/pool", response_model=DatabasePoolReport)
+async def get_pool_stats(current_user: User = Depends(require_superuser)):
+    """連線池與 threadpool 即時狀態（async 端點：AnyIO limiter 只能在事件迴圈內讀取）
+
+    checked_out/idle/overflow 為即時值，其餘為程序啟動後的累計值。
+    wait_histogram 為取得連線（含排隊）耗時的累計分佈。
+    """
+    limiter = to_thread.current_default_thread_limiter()
+    return {
+        "sync_pool": engine.pool.metrics.snapshot(engine.pool),
+        "async_pool": (
+            async_engine.sync_engine.pool.metrics.snapshot(async_engine.sync_engine.pool)
+            if async_engine is not None
+            else None
+        ),
+        "threadpool": {"total": int(limiter.total_tokens), "in_use": limiter.borrowed_tokens},
+    }
+
+
+@router.get("/users", response_model=UserPage)
 def list_users(
+    params: Annotated[AdminUserQuery, Query()],
     current_user: User = Depends(require_superuser),
     db: Session = Depends(get_db)
 ):
-    """列出所有使用者（管理用）"""
-    users = db.query(User).order_by(User.id).all()
-    return users
+    """列出使用者（管理用，keyset 分頁 + 篩選 + 使用者名稱搜尋）"""
+    rows = db.execute(
+        UserQueryService.admin_users_page(
+            params.cursor, params.limit, params.sort, params.is_superuser, params.q
+        )
+    ).all()
+    return LevelQueryService.build_page(rows, params.limit, UserQueryService.cursor_key(params.sort))
 
 
 @router.post("/users", response_model=UserOut, status_code=status.HTTP_201_CREATED)
@@ -95,7 +140,9 @@ def update_user(
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="使用者不存在")
 
+    renamed = False
     if data.username and data.username != user.username:
+        renamed = True
         existing = db.query(User).filter(User.username == data.username).first()
         if existing:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="使用者名稱已存在")
@@ -108,6 +155,10 @@ def update_user(
         user.is_superuser = data.is_superuser
 
     db.commit()
+    auth_cache.invalidate_user(user_id)
+    if renamed:
+        # 列表項目含 author_name
+        level_list_cache.invalidate(OFFICIAL, COMMUNITY)
     db.refresh(user)
     return user
 
@@ -146,6 +197,7 @@ def delete_user(
 
     db.delete(user)
     db.commit()
+    auth_cache.invalidate_user(user_id)
     return None
 
 
@@ -186,26 +238,46 @@ def transfer_user_levels(
             detail="關卡不存在或不屬於該帳號",
         )
 
+    affected_lists = {visible_list(level) for level in levels}
     for level in levels:
         level.author_id = transfer_map[level.id]
 
     db.commit()
+    level_list_cache.invalidate(*affected_lists)
     return LevelTransferResult(transferred=len(levels))
 
 
-@router.get("/levels", response_model=list[AdminLevelListItem])
+@router.get("/levels", response_model=AdminLevelPage)
 def list_all_levels(
+    params: Annotated[AdminLevelQuery, Query()],
+    accept: str | None = Header(default=None),
     current_user: User = Depends(require_superuser),
     db: Session = Depends(get_db)
 ):
-    """列出所有關卡（管理用）"""
-    levels = (
-        db.query(Level)
-        .options(joinedload(Level.author))
-        .order_by(Level.updated_at.desc())
-        .all()
-    )
-    return levels
+    """列出關卡（管理用，keyset 分頁 + 篩選）
+
+    format=ndjson（或 Accept: application/x-ndjson）時串流所有符合條件的關卡，
+    每行一筆 AdminLevelListItem，不在記憶體中累積。
+
+    Args:
+        params: 分頁、排序與篩選參數（status、is_official、author_id、updated 範圍、標題搜尋）
+        accept: Accept 標頭（format 未指定時用於選擇 NDJSON）
+        current_user: 當前使用者（需為管理員）
+        db: 資料庫 session
+
+    Returns:
+        AdminLevelPage | StreamingResponse: 分頁或 NDJSON 串流
+    """
+    if ExportService.wants_ndjson(params.format, accept):
+        stmt = LevelQueryService.admin_levels(sort=params.sort, **params.filters())
+        return StreamingResponse(
+            ExportService.ndjson(stmt, AdminLevelListItem), media_type=NDJSON_MEDIA_TYPE
+        )
+
+    rows = db.execute(
+        LevelQueryService.admin_levels_page(params.cursor, params.limit, params.sort, **params.filters())
+    ).all()
+    return LevelQueryService.build_page(rows, params.limit, LevelQueryService.admin_cursor_key(params.sort))
 
 
 @router.get("/levels/{level_id}", response_model=LevelDetail)
@@ -257,6 +329,29 @@ def delete_level_admin(
     return None
 
 
+@router.post("/levels/bulk-approve", response_model=LevelBulkResult)
+def bulk_approve_levels(
+    data: LevelBulkApprove,
+    current_user: User = Depends(require_superuser),
+    db: Session = Depends(get_db)
+):
+    """批次審核通過（單一 UPDATE，官方序號一次分配）
+
+    非 PENDING 或不存在的關卡不會中斷整批，於結果中標示 not_pending / not_found。
+    """
+    return ModerationService.bulk_approve(db, data.level_ids, data.as_official)
+
+
+@router.post("/levels/bulk-reject", response_model=LevelBulkResult)
+def bulk_reject_levels(
+    data: LevelBulkReject,
+    current_user: User = Depends(require_superuser),
+    db: Session = Depends(get_db)
+):
+    """批次駁回（單一 UPDATE，同一理由）"""
+    return ModerationService.bulk_reject(db, data.level_ids, data.reason)
+
+
 @router.post("/levels/{level_id}/approve", response_model=LevelDetail)
 def approve_level(
     level_id: str,
@@ -325,3 +420,46 @@ def reject_level(
 
     level = ModerationService.reject_level(db, level, data.reason)
     return level
+
+
+@router.post("/levels/{level_id}/evaluate", response_model=LevelEvaluationReport)
+def evaluate_level_programs(
+    level_id: str,
+    data: LevelEvaluationRequest | None = None,
+    current_user: User = Depends(require_superuser),
+    db: Session = Depends(get_db)
+):
+    """批次評估多個程式（例如課堂批改）
+
+    未提供 programs 時評估此關卡所有已儲存的 level_programs。
+    大批次會分塊送進程序池平行執行。
+
+    Args:
+        level_id: 關卡 ID
+        data: 要評估的程式與步數上限
+        current_user: 當前使用者（需為管理員）
+        db: 資料庫 session
+
+    Returns:
+        LevelEvaluationReport: 每個程式的 solved/steps/stars
+
+    Raises:
+        HTTPException 404: 關卡不存在
+        HTTPException 422: 關卡地圖無法執行
+
+    Requires:
+        管理員權限
+    """
+    level = db.get(Level, level_id)
+    if not level:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="關卡不存在")
+
+    data = data or LevelEvaluationRequest()
+    if data.programs is not None:
+        entries, programs = EvaluationService.from_request(data)
+    else:
+        rows = db.execute(EvaluationService.saved_programs(level_id)).all()
+        entries, programs = EvaluationService.from_saved(rows)
+
+    results = EvaluationService.evaluate(level, programs, data.max_steps)
+    return EvaluationService.build_report(level.id, entries, results)
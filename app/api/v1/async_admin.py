@@ -0,0 +1,186 @@
+"""Admin API（非同步版本）- 需 superuser 權限
+
+只涵蓋關卡審核與管理端點；使用者管理等低頻端點仍由同步路由處理。
+settings.db_async 開啟時由 main.use_async_routes 原地取代同路徑同方法的同步端點，
+保留同步路由的註冊順序；每個端點都必須有對應的同步版本。
+"""
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.database import get_async_db
+from app.models.user import User
+from app.models.level import Level
+from app.schemas.level import (
+    LevelApprove,
+    LevelReject,
+    LevelBulkApprove,
+    LevelBulkReject,
+    LevelBulkResult,
+    LevelDetail,
+    PendingLevelItem,
+    AdminLevelListItem,
+    AdminLevelPage,
+    AdminLevelQuery,
+    AdminLevelUpdate,
+)
+from app.schemas.admin import LevelEvaluationRequest, LevelEvaluationReport
+from app.core.deps import require_superuser_async
+from app.services import (
+    AsyncModerationService,
+    AsyncLevelService,
+    LevelQueryService,
+    EvaluationService,
+    ExportService,
+)
+from app.services.export_service import NDJSON_MEDIA_TYPE
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+async def _get_level(db: AsyncSession, level_id: str) -> Level:
+    level = await db.get(Level, level_id)
+    if not level:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="關卡不存在")
+    return level
+
+
+@router.get("/queue", response_model=list[PendingLevelItem])
+async def list_pending_levels(
+    sort: Literal["updated", "difficulty"] = Query("updated", description="difficulty = 依最短解由易到難"),
+    current_user: User = Depends(require_superuser_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """列出待審核關卡"""
+    return (await db.execute(LevelQueryService.pending_levels(sort))).all()
+
+
+@router.get("/levels", response_model=AdminLevelPage)
+async def list_all_levels(
+    params: Annotated[AdminLevelQuery, Query()],
+    accept: str | None = Header(default=None),
+    current_user: User = Depends(require_superuser_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """列出關卡（管理用，keyset 分頁 + 篩選；NDJSON 串流見同步版本）"""
+    if ExportService.wants_ndjson(params.format, accept):
+        stmt = LevelQueryService.admin_levels(sort=params.sort, **params.filters())
+        return StreamingResponse(
+            ExportService.ndjson(stmt, AdminLevelListItem), media_type=NDJSON_MEDIA_TYPE
+        )
+
+    rows = (await db.execute(
+        LevelQueryService.admin_levels_page(params.cursor, params.limit, params.sort, **params.filters())
+    )).all()
+    return LevelQueryService.build_page(rows, params.limit, LevelQueryService.admin_cursor_key(params.sort))
+
+
+@router.get("/levels/{level_id}", response_model=LevelDetail)
+async def get_level_admin(
+    level_id: str,
+    current_user: User = Depends(require_superuser_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """管理員獲取關卡詳情（含 solution）"""
+    level = await db.scalar(
+        select(Level).options(joinedload(Level.author)).where(Level.id == level_id)
+    )
+    if not level:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="關卡不存在")
+    return level
+
+
+@router.put("/levels/{level_id}", response_model=LevelDetail)
+async def update_level_admin(
+    level_id: str,
+    data: AdminLevelUpdate,
+    current_user: User = Depends(require_superuser_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """管理員更新關卡（可部分更新）"""
+    level = await _get_level(db, level_id)
+    return await AsyncLevelService.admin_update_level(db, level, data)
+
+
+@router.delete("/levels/{level_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_level_admin(
+    level_id: str,
+    current_user: User = Depends(require_superuser_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """管理員刪除關卡"""
+    level = await _get_level(db, level_id)
+    await AsyncLevelService.delete_level(db, level)
+    return None
+
+
+@router.post("/levels/bulk-approve", response_model=LevelBulkResult)
+async def bulk_approve_levels(
+    data: LevelBulkApprove,
+    current_user: User = Depends(require_superuser_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """批次審核通過（單一 UPDATE，官方序號一次分配）
+
+    非 PENDING 或不存在的關卡不會中斷整批，於結果中標示 not_pending / not_found。
+    """
+    return await AsyncModerationService.bulk_approve(db, data.level_ids, data.as_official)
+
+
+@router.post("/levels/bulk-reject", response_model=LevelBulkResult)
+async def bulk_reject_levels(
+    data: LevelBulkReject,
+    current_user: User = Depends(require_superuser_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """批次駁回（單一 UPDATE，同一理由）"""
+    return await AsyncModerationService.bulk_reject(db, data.level_ids, data.reason)
+
+
+@router.post("/levels/{level_id}/approve", response_model=LevelDetail)
+async def approve_level(
+    level_id: str,
+    data: LevelApprove,
+    current_user: User = Depends(require_superuser_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """審核通過"""
+    level = await _get_level(db, level_id)
+    return await AsyncModerationService.approve_level(db, level, data.as_official, data.official_order)
+
+
+@router.post("/levels/{level_id}/reject", response_model=LevelDetail)
+async def reject_level(
+    level_id: str,
+    data: LevelReject,
+    current_user: User = Depends(require_superuser_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """駁回關卡"""
+    level = await _get_level(db, level_id)
+    return await AsyncModerationService.reject_level(db, level, data.reason)
+
+
+@router.post("/levels/{level_id}/evaluate", response_model=LevelEvaluationReport)
+async def evaluate_level_programs(
+    level_id: str,
+    data: LevelEvaluationRequest | None = None,
+    current_user: User = Depends(require_superuser_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """批次評估多個程式（例如課堂批改）"""
+    level = await _get_level(db, level_id)
+
+    data = data or LevelEvaluationRequest()
+    if data.programs is not None:
+        entries, programs = EvaluationService.from_request(data)
+    else:
+        rows = (await db.execute(EvaluationService.saved_programs(level_id))).all()
+        entries, programs = EvaluationService.from_saved(rows)
+
+    results = await EvaluationService.evaluate_async(level, programs, data.max_steps)
+    return EvaluationService.build_report(level.id, entries, results)
@@ -0,0 +1,106 @@
+"""Designer API（非同步版本）- 需認證
+
+settings.db_async 開啟時由 main.use_async_routes 原地取代同路徑同方法的同步端點，
+保留同步路由的註冊順序；每個端點都必須有對應的同步版本。
+"""
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import get_async_db
+from app.models.user import User
+from app.models.level import Level, LevelStatus
+from app.schemas.level import (
+    LevelCreate,
+    LevelUpdate,
+    LevelPublish,
+    LevelDetail,
+    LevelListItem,
+)
+from app.core.deps import get_current_user_async
+from app.services import (
+    AsyncLevelService,
+    LevelQueryService,
+    get_publish_strategy,
+    VerificationService,
+    DifficultyService,
+)
+
+router = APIRouter(prefix="/designer", tags=["designer"])
+
+
+async def _get_own_level(db: AsyncSession, level_id: str, user: User, action: str) -> Level:
+    """讀取關卡並確認為作者本人"""
+    level = await db.get(Level, level_id)
+    if not level:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="關卡不存在")
+    if level.author_id != user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"無權{action}此關卡")
+    return level
+
+
+@router.get("/levels", response_model=list[LevelListItem])
+async def list_my_levels(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """列出當前使用者的所有關卡"""
+    return (await db.execute(LevelQueryService.author_levels(current_user.id))).all()
+
+
+@router.post("/levels", response_model=LevelDetail, status_code=status.HTTP_201_CREATED)
+async def create_level(
+    data: LevelCreate,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """建立新關卡（狀態 = draft）"""
+    return await AsyncLevelService.create_level(db, current_user.id, data)
+
+
+@router.put("/levels/{level_id}", response_model=LevelDetail)
+async def update_level(
+    level_id: str,
+    data: LevelUpdate,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """更新關卡（強制回到 draft）"""
+    level = await _get_own_level(db, level_id, current_user, "修改")
+    return await AsyncLevelService.update_level(db, level, data)
+
+
+@router.post("/levels/{level_id}/publish", response_model=LevelDetail)
+async def publish_level(
+    level_id: str,
+    data: LevelPublish,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """發布關卡（提交 solution）；難度估計在背景執行（async，等待程序池時不佔用執行緒）"""
+    level = await _get_own_level(db, level_id, current_user, "發布")
+    if level.status != LevelStatus.DRAFT:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"當前狀態為 {level.status}，只能從 draft 發布。請先更新回草稿後再送審。",
+        )
+
+    solution = VerificationService.checked_solution(level, data.solution.model_dump())
+    strategy = get_publish_strategy(current_user, data.as_official, data.official_order)
+    level = await strategy.execute_async(db, level, solution)
+    if settings.solver_on_publish:
+        background_tasks.add_task(DifficultyService.estimate, level.id)
+    return level
+
+
+@router.delete("/levels/{level_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_level(
+    level_id: str,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """刪除關卡（只能刪自己的）"""
+    level = await _get_own_level(db, level_id, current_user, "刪除")
+    await AsyncLevelService.delete_level(db, level)
+    return None
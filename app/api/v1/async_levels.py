@@ -0,0 +1,166 @@
+"""Public API（非同步版本）- 無需認證
+
+settings.db_async 開啟時由 main.use_async_routes 原地取代同路徑同方法的同步端點，
+保留同步路由的註冊順序；每個端點都必須有對應的同步版本。
+"""
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.database import get_async_db
+from app.models.level import Level, LevelStatus
+from app.schemas.level import LevelOut, LevelPackedOut, LevelListPage
+from app.schemas.progress import LevelStatsOut
+from app.core.deps import LazyPrincipalAsync, get_lazy_principal_async
+from app.core.etag import etag_matches, not_modified, set_etag, make_etag
+from app.core.map_codec import PACKED_MAP_MEDIA_TYPE, wants_packed_map
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.search import MIN_TRGM_QUERY_LENGTH
+from app.services import LevelQueryService, StatsService
+from app.services.level_cache import level_list_cache, OFFICIAL, COMMUNITY
+from app.services.level_query_service import DEFERRED_PAYLOAD, detail_options, payload_attributes
+
+router = APIRouter(prefix="/levels", tags=["public"])
+
+
+@router.get("/official", response_model=LevelListPage)
+async def list_official_levels(
+    response: Response,
+    cursor: str | None = Query(default=None, description="上一頁回傳的 next_cursor"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """列出官方關卡（keyset 分頁）"""
+    version = level_list_cache.page_version(OFFICIAL)
+    entry = level_list_cache.get_page(OFFICIAL, version, cursor, limit)
+    if entry is None:
+        rows = (await db.execute(LevelQueryService.official_page(cursor, limit))).all()
+        entry = level_list_cache.set_page(
+            OFFICIAL, version, cursor, limit,
+            LevelQueryService.build_page(rows, limit, LevelQueryService.official_cursor_key),
+        )
+
+    if etag_matches(if_none_match, entry["etag"]):
+        return not_modified(entry["etag"])
+    set_etag(response, entry["etag"])
+    return entry["page"]
+
+
+@router.get("/community", response_model=LevelListPage)
+async def list_community_levels(
+    response: Response,
+    cursor: str | None = Query(default=None, description="上一頁回傳的 next_cursor"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """列出社群關卡（keyset 分頁）"""
+    version = level_list_cache.page_version(COMMUNITY)
+    entry = level_list_cache.get_page(COMMUNITY, version, cursor, limit)
+    if entry is None:
+        rows = (await db.execute(LevelQueryService.community_page(cursor, limit))).all()
+        entry = level_list_cache.set_page(
+            COMMUNITY, version, cursor, limit,
+            LevelQueryService.build_page(rows, limit, LevelQueryService.community_cursor_key),
+        )
+
+    if etag_matches(if_none_match, entry["etag"]):
+        return not_modified(entry["etag"])
+    set_etag(response, entry["etag"])
+    return entry["page"]
+
+
+@router.get("/search", response_model=LevelListPage)
+async def search_levels(
+    q: str = Query(
+        ...,
+        min_length=MIN_TRGM_QUERY_LENGTH,
+        max_length=100,
+        description="搜尋字串（比對標題與作者名稱，容許拼字差異）",
+    ),
+    cursor: str | None = Query(default=None, description="上一頁回傳的 next_cursor"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """搜尋已發布關卡（標題或作者名稱，pg_trgm 相似度排序，keyset 分頁）"""
+    rows = (await db.execute(LevelQueryService.search_page(q, cursor, limit))).all()
+    return LevelQueryService.build_page(rows, limit, LevelQueryService.search_cursor_key)
+
+
+@router.get("/{level_id}/stats", response_model=LevelStatsOut)
+async def get_level_stats(level_id: str, db: AsyncSession = Depends(get_async_db)):
+    """取得已發布關卡的遊玩統計（讀取 level_stats 一列）"""
+    row = (await db.execute(StatsService.stats_query(level_id))).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="關卡不存在",
+        )
+    return StatsService.as_out(row)
+
+
+@router.get("/{level_id}", response_model=LevelOut | LevelPackedOut)
+async def get_level(
+    level_id: str,
+    response: Response,
+    map_format: Literal["json", "packed"] | None = Query(
+        default=None,
+        description=f"地圖格式；packed 回傳 base64 packed grid（亦可用 Accept: {PACKED_MAP_MEDIA_TYPE}）",
+    ),
+    accept: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+    principal: LazyPrincipalAsync = Depends(get_lazy_principal_async),
+):
+    """獲取單個關卡詳情（不含 solution）"""
+    packed = wants_packed_map(map_format, accept)
+    # 沒有 If-None-Match 就不可能回 304，內容欄位在同一個查詢載入
+    conditional = bool(if_none_match)
+    payload = DEFERRED_PAYLOAD if conditional else detail_options(packed)
+    level = await db.scalar(
+        select(Level)
+        .options(joinedload(Level.author), *payload)
+        .where(Level.id == level_id)
+    )
+    if not level:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="關卡不存在"
+        )
+
+    if level.status != LevelStatus.PUBLISHED:
+        current_user = await principal.resolve()
+        if not current_user:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="需要登入才能查看未發布的關卡"
+            )
+        if current_user.id != level.author_id and not current_user.is_superuser:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="無權查看此關卡"
+            )
+
+    etag = make_etag(level.id, level.updated_at, level.author_name, "packed" if packed else "json")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, vary="Accept")
+
+    set_etag(response, etag)
+    response.headers["Vary"] = "Accept"
+    if conditional:
+        try:
+            await db.refresh(level, attribute_names=payload_attributes(packed))
+        except InvalidRequestError:
+            # 兩次查詢之間關卡被刪除
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="關卡不存在"
+            )
+    if packed:
+        return LevelPackedOut.model_validate(level)
+    return LevelOut.model_validate(level)
@@ -1,12 +1,20 @@
 """認證 API - 註冊、登入"""
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.user import User
-from app.schemas.user import UserRegister, UserLogin, UserOut, Token
-from app.core.security import verify_password, get_password_hash, create_access_token
-from app.core.deps import get_current_user
+from app.schemas.user import UserRegister, UserLogin, UserOut, Token, Principal
+from app.core.security import (
+    create_access_token,
+    get_password_hash,
+    get_password_hash_async,
+    needs_rehash,
+    verify_password_async,
+)
+from app.core.deps import get_current_principal
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -46,9 +54,13 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: Session = Depends(get_db)):
     """登入取得 token
 
+    async 端點：bcrypt 在專用執行緒池執行，登入尖峰不會佔滿其他同步路由的 threadpool；
+    只有短暫的查詢與寫入進 threadpool。雜湊 cost 與 settings.bcrypt_rounds 不同時，
+    驗證成功後以新 cost 重新雜湊（佇列已滿時略過，下次登入再試）。
+
     Args:
         user_data: 登入資料（username, password）
         db: 資料庫 session
@@ -58,22 +70,47 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
 
     Raises:
         HTTPException 401: 帳號或密碼錯誤
+        HTTPException 503: 密碼雜湊佇列已滿
     """
-    user = db.query(User).filter(User.username == user_data.username).first()
-    if not user or not verify_password(user_data.password, user.hashed_password):
+    # 只取需要的欄位（Row 不受 commit 後的 expire 影響，之後不會在 event loop 上觸發查詢）
+    user = await run_in_threadpool(
+        lambda: db.execute(
+            select(User.id, User.hashed_password, User.is_superuser)
+            .where(User.username == user_data.username)
+        ).first()
+    )
+    if not user or not await verify_password_async(user_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="帳號或密碼錯誤",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if needs_rehash(user.hashed_password):
+        try:
+            new_hash = await get_password_hash_async(user_data.password)
+        except HTTPException:
+            new_hash = None
+        if new_hash is not None:
+            await run_in_threadpool(_store_rehash, db, user.id, user.hashed_password, new_hash)
+
     access_token = create_access_token(data={"sub": user.id, "is_superuser": user.is_superuser})
     return {"access_token": access_token, "token_type": "bearer"}
 
 
+def _store_rehash(db: Session, user_id: int, old_hash: str, new_hash: str) -> None:
+    """寫入重新雜湊的密碼（期間密碼已被變更則不覆寫）"""
+    db.execute(
+        update(User)
+        .where(User.id == user_id, User.hashed_password == old_hash)
+        .values(hashed_password=new_hash)
+    )
+    db.commit()
+
+
 @router.get("/users/me", response_model=UserOut)
 def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """獲取當前登入用戶資訊
 
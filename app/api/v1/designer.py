@@ -1,7 +1,8 @@
 """Designer API - 需認證"""
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
 from app.models.level import Level, LevelStatus
@@ -13,7 +14,13 @@ from app.schemas.level import (
     LevelListItem,
 )
 from app.core.deps import get_current_user
-from app.services import LevelService, get_publish_strategy
+from app.services import (
+    LevelService,
+    LevelQueryService,
+    get_publish_strategy,
+    VerificationService,
+    DifficultyService,
+)
 
 router = APIRouter(prefix="/designer", tags=["designer"])
 
@@ -32,14 +39,7 @@ def list_my_levels(
     Returns:
         list[LevelListItem]: 使用者的關卡列表（含所有狀態）
     """
-    levels = (
-        db.query(Level)
-        .options(joinedload(Level.author))
-        .filter(Level.author_id == current_user.id)
-        .order_by(Level.updated_at.desc())
-        .all()
-    )
-    return levels
+    return db.execute(LevelQueryService.author_levels(current_user.id)).all()
 
 
 @router.post("/levels", response_model=LevelDetail, status_code=status.HTTP_201_CREATED)
@@ -100,6 +100,7 @@ def update_level(
 def publish_level(
     level_id: str,
     data: LevelPublish,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -110,9 +111,12 @@ def publish_level(
     - 管理員 + as_official=True → status='published', is_official=True
     - 管理員 + as_official=False → status='published', is_official=False
 
+    回應送出後於背景搜尋最短解，寫入 metadata.difficulty（settings.solver_on_publish）。
+
     Args:
         level_id: 關卡 ID
         data: 發布資料（含 solution）
+        background_tasks: 背景工作（難度估計）
         current_user: 當前使用者（自動注入）
         db: 資料庫 session
 
@@ -122,6 +126,7 @@ def publish_level(
     Raises:
         HTTPException 404: 關卡不存在
         HTTPException 403: 無權發布此關卡
+        HTTPException 400: solution 未能完成關卡（settings.verify_solutions）
     """
     level = db.query(Level).filter(Level.id == level_id).first()
     if not level:
@@ -135,8 +140,11 @@ def publish_level(
         )
 
     # 使用策略模式 - 消除所有 if/elif 分支
+    solution = VerificationService.checked_solution(level, data.solution.model_dump())
     strategy = get_publish_strategy(current_user, data.as_official, data.official_order)
-    level = strategy.execute(db, level, data.solution.model_dump())
+    level = strategy.execute(db, level, solution)
+    if settings.solver_on_publish:
+        background_tasks.add_task(DifficultyService.estimate, level.id)
     return level
 
 
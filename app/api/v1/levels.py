@@ -1,63 +1,144 @@
 """Public API - 無需認證"""
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.orm import Session, joinedload
 
+from app.config import settings
 from app.database import get_db
 from app.models.level import Level, LevelStatus
 from app.models.progress import LevelProgress
 from app.models.program import LevelProgram
-from app.schemas.progress import LevelProgressOut, LevelProgressUpdate
+from app.schemas.progress import (
+    LevelProgressOut,
+    LevelProgressUpdate,
+    LevelProgressEntry,
+    LevelProgressBatch,
+    LevelProgressBatchResult,
+    LevelStatsOut,
+)
 from app.schemas.program import LevelProgramOut, LevelProgramUpdate
-from app.schemas.level import LevelOut, LevelListItem
-from app.core.deps import get_current_user, get_current_user_optional
-from app.models.user import User
+from app.schemas.level import LevelOut, LevelPackedOut, LevelListPage
+from app.schemas.user import Principal
+from app.core.deps import LazyPrincipal, get_current_principal, get_lazy_principal
+from app.core.etag import etag_matches, not_modified, set_etag, make_etag
+from app.core.map_codec import PACKED_MAP_MEDIA_TYPE, wants_packed_map
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.search import MIN_TRGM_QUERY_LENGTH
+from app.services import LevelQueryService, ProgressService, ProgramService, StatsService
+from app.services.level_cache import level_list_cache, OFFICIAL, COMMUNITY
+from app.services.level_query_service import DEFERRED_PAYLOAD, detail_options, payload_attributes
 
 router = APIRouter(prefix="/levels", tags=["public"])
 
 
-@router.get("/official", response_model=list[LevelListItem])
-def list_official_levels(db: Session = Depends(get_db)):
-    """列出官方關卡
+@router.get("/official", response_model=LevelListPage)
+def list_official_levels(
+    response: Response,
+    cursor: str | None = Query(default=None, description="上一頁回傳的 next_cursor"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    """列出官方關卡（keyset 分頁）
+
+    分頁結果會快取，發布/審核/更新/刪除已發布關卡時失效；
+    帶 If-None-Match 且分頁未變時回 304，不重送內容。
 
     Args:
+        response: 用於設定 ETag
+        cursor: 分頁游標，鍵為 (official_order, id)
+        limit: 每頁筆數
+        if_none_match: 客戶端持有的 ETag
         db: 資料庫 session
 
     Returns:
-        list[LevelListItem]: 官方關卡列表（按 official_order 排序）
+        LevelListPage: 官方關卡（按 official_order 排序）與下一頁游標
     """
-    levels = (
-        db.query(Level)
-        .options(joinedload(Level.author))
-        .filter(Level.is_official == True, Level.status == LevelStatus.PUBLISHED)
-        .order_by(Level.official_order)
-        .all()
-    )
-    return levels
+    version = level_list_cache.page_version(OFFICIAL)
+    entry = level_list_cache.get_page(OFFICIAL, version, cursor, limit)
+    if entry is None:
+        rows = db.execute(LevelQueryService.official_page(cursor, limit)).all()
+        entry = level_list_cache.set_page(
+            OFFICIAL, version, cursor, limit,
+            LevelQueryService.build_page(rows, limit, LevelQueryService.official_cursor_key),
+        )
+
+    if etag_matches(if_none_match, entry["etag"]):
+        return not_modified(entry["etag"])
+    set_etag(response, entry["etag"])
+    return entry["page"]
 
 
-@router.get("/community", response_model=list[LevelListItem])
-def list_community_levels(db: Session = Depends(get_db)):
-    """列出社群關卡
+@router.get("/community", response_model=LevelListPage)
+def list_community_levels(
+    response: Response,
+    cursor: str | None = Query(default=None, description="上一頁回傳的 next_cursor"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    """列出社群關卡（keyset 分頁）
+
+    分頁結果會快取，發布/審核/更新/刪除已發布關卡時失效；
+    帶 If-None-Match 且分頁未變時回 304，不重送內容。
 
     Args:
+        response: 用於設定 ETag
+        cursor: 分頁游標，鍵為 (created_at, id)
+        limit: 每頁筆數
+        if_none_match: 客戶端持有的 ETag
         db: 資料庫 session
 
     Returns:
-        list[LevelListItem]: 社群關卡列表（按建立時間倒序）
+        LevelListPage: 社群關卡（按建立時間倒序）與下一頁游標
     """
-    levels = (
-        db.query(Level)
-        .options(joinedload(Level.author))
-        .filter(Level.is_official == False, Level.status == LevelStatus.PUBLISHED)
-        .order_by(Level.created_at.desc())
-        .all()
-    )
-    return levels
+    version = level_list_cache.page_version(COMMUNITY)
+    entry = level_list_cache.get_page(COMMUNITY, version, cursor, limit)
+    if entry is None:
+        rows = db.execute(LevelQueryService.community_page(cursor, limit)).all()
+        entry = level_list_cache.set_page(
+            COMMUNITY, version, cursor, limit,
+            LevelQueryService.build_page(rows, limit, LevelQueryService.community_cursor_key),
+        )
+
+    if etag_matches(if_none_match, entry["etag"]):
+        return not_modified(entry["etag"])
+    set_etag(response, entry["etag"])
+    return entry["page"]
+
+
+@router.get("/search", response_model=LevelListPage)
+def search_levels(
+    q: str = Query(
+        ...,
+        min_length=MIN_TRGM_QUERY_LENGTH,
+        max_length=100,
+        description="搜尋字串（比對標題與作者名稱，容許拼字差異）",
+    ),
+    cursor: str | None = Query(default=None, description="上一頁回傳的 next_cursor"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    """搜尋已發布關卡（標題或作者名稱，pg_trgm 相似度排序，keyset 分頁）
+
+    Args:
+        q: 搜尋字串
+        cursor: 分頁游標，鍵為 (相似度, id)
+        limit: 每頁筆數
+        db: 資料庫 session
+
+    Returns:
+        LevelListPage: 依相似度由高到低排序的關卡與下一頁游標
+    """
+    rows = db.execute(LevelQueryService.search_page(q, cursor, limit)).all()
+    return LevelQueryService.build_page(rows, limit, LevelQueryService.search_cursor_key)
 
 
 @router.get("/progress", response_model=list[LevelProgressOut])
 def list_level_progress(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """列出目前使用者的關卡進度"""
@@ -69,67 +150,91 @@ def list_level_progress(
     return progress
 
 
+@router.put("/progress/batch", response_model=LevelProgressBatchResult)
+def sync_level_progress(
+    data: LevelProgressBatch,
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+):
+    """批次同步關卡進度（離線遊玩、換裝置）
+
+    同一關卡的多筆先合併，再以單一 INSERT ... ON CONFLICT 寫入：關卡存在檢查、
+    與既有進度合併（完成 OR、步數取小、星星取大）都在同一個 statement 內完成。
+    不存在的關卡略過並列於 missing_level_ids。
+    """
+    entries = ProgressService.merge_entries(data.entries)
+    if settings.verify_progress:
+        entries = ProgressService.verified_entries(db, current_user.id, entries)
+
+    rows = db.execute(ProgressService.upsert_statement(current_user.id, entries)).all()
+    db.commit()
+
+    written = {row.level_id for row in rows}
+    return {
+        "items": rows,
+        "missing_level_ids": [entry.level_id for entry in entries if entry.level_id not in written],
+    }
+
+
 @router.put("/{level_id}/progress", response_model=LevelProgressOut)
 def upsert_level_progress(
     level_id: str,
     data: LevelProgressUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
-    """更新或建立關卡進度"""
-    level = db.query(Level).filter(Level.id == level_id).first()
-    if not level:
+    """更新或建立關卡進度
+
+    單一 INSERT ... ON CONFLICT DO UPDATE ... RETURNING：關卡存在檢查與既有進度合併
+    （完成 OR、步數取小、星星取大）都在 SQL 內完成，同一使用者並行儲存也不會
+    撞上唯一鍵。
+
+    settings.verify_progress 開啟時，以使用者儲存的程式（PUT /{level_id}/program）
+    在伺服器端重新執行，只採用執行結果的步數與星星數。
+    """
+    entry = LevelProgressEntry(level_id=level_id, **data.model_dump())
+    if settings.verify_progress:
+        (entry,) = ProgressService.verified_entries(db, current_user.id, [entry])
+
+    progress = db.execute(ProgressService.upsert_statement(current_user.id, [entry])).first()
+    db.commit()
+    if progress is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="關卡不存在",
         )
+    return progress
 
-    progress = (
-        db.query(LevelProgress)
-        .filter(
-            LevelProgress.user_id == current_user.id,
-            LevelProgress.level_id == level_id,
-        )
-        .first()
-    )
 
-    if not progress:
-        progress = LevelProgress(
-            user_id=current_user.id,
-            level_id=level_id,
-            is_completed=data.is_completed,
-            best_steps=data.best_steps,
-            stars_collected=data.stars_collected,
-        )
-        db.add(progress)
-        db.commit()
-        db.refresh(progress)
-        return progress
-
-    if data.is_completed:
-        progress.is_completed = True
-    if data.best_steps is not None:
-        progress.best_steps = (
-            data.best_steps
-            if progress.best_steps is None
-            else min(progress.best_steps, data.best_steps)
-        )
-    if data.stars_collected is not None:
-        progress.stars_collected = (
-            data.stars_collected
-            if progress.stars_collected is None
-            else max(progress.stars_collected, data.stars_collected)
-        )
+@router.get("/{level_id}/stats", response_model=LevelStatsOut)
+def get_level_stats(level_id: str, db: Session = Depends(get_db)):
+    """取得已發布關卡的遊玩統計
 
-    db.commit()
-    db.refresh(progress)
-    return progress
+    讀取觸發器維護的 level_stats（主鍵查詢一列），不掃描 level_progress。
+
+    Args:
+        level_id: 關卡 ID
+        db: 資料庫 session
+
+    Returns:
+        LevelStatsOut: 遊玩人數、完成數、最佳/中位數步數、星星分布；尚無人遊玩時皆為 0/空
+
+    Raises:
+        HTTPException: 404 - 關卡不存在或未發布
+    """
+    row = db.execute(StatsService.stats_query(level_id)).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="關卡不存在",
+        )
+    return StatsService.as_out(row)
 
 
 @router.get("/{level_id}/program", response_model=LevelProgramOut)
 def get_level_program(
     level_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """取得關卡程式碼"""
@@ -153,71 +258,66 @@ def get_level_program(
 def upsert_level_program(
     level_id: str,
     data: LevelProgramUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
-    """更新或建立關卡程式碼"""
-    level = db.query(Level).filter(Level.id == level_id).first()
-    if not level:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="關卡不存在",
-        )
-
-    program = (
-        db.query(LevelProgram)
-        .filter(
-            LevelProgram.user_id == current_user.id,
-            LevelProgram.level_id == level_id,
-        )
-        .first()
-    )
-
+    """更新或建立關卡程式碼（單一 INSERT ... ON CONFLICT DO UPDATE ... RETURNING）"""
     payload = {
         "commands_f0": data.commands_f0,
         "commands_f1": data.commands_f1,
         "commands_f2": data.commands_f2,
     }
-
-    if not program:
-        program = LevelProgram(
-            user_id=current_user.id,
-            level_id=level_id,
-            commands=payload,
-        )
-        db.add(program)
-        db.commit()
-        db.refresh(program)
-        return program
-
-    program.commands = payload
+    program = db.execute(ProgramService.upsert_statement(current_user.id, level_id, payload)).first()
     db.commit()
-    db.refresh(program)
-    return program
+    if program is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="關卡不存在",
+        )
+    return ProgramService.as_out(program)
 
 
-@router.get("/{level_id}", response_model=LevelOut)
+@router.get("/{level_id}", response_model=LevelOut | LevelPackedOut)
 def get_level(
     level_id: str,
+    response: Response,
+    map_format: Literal["json", "packed"] | None = Query(
+        default=None,
+        description=f"地圖格式；packed 回傳 base64 packed grid（亦可用 Accept: {PACKED_MAP_MEDIA_TYPE}）",
+    ),
+    accept: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
     db: Session = Depends(get_db),
-    current_user: User | None = Depends(get_current_user_optional),
+    principal: LazyPrincipal = Depends(get_lazy_principal),
 ):
     """獲取單個關卡詳情（不含 solution）
 
+    ETag 由 id + updated_at（+ 作者名稱、地圖格式）產生。沒有 If-None-Match 時
+    一次查詢載入回應所需欄位；帶 If-None-Match 時先以不含 JSONB 的查詢完成權限檢查
+    與版本比對，命中時直接回 304，不載入 map/config，未命中才補載。
+
     Args:
         level_id: 關卡 ID（NanoID）
+        response: 用於設定 ETag
+        map_format: 地圖格式（json / packed）
+        accept: Accept 標頭（map_format 未指定時用於選擇格式）
+        if_none_match: 客戶端持有的 ETag
         db: 資料庫 session
-        current_user: 可選的當前使用者（公開端點）
+        principal: 可選的當前使用者（僅在關卡未發布時解析）
 
     Returns:
-        LevelOut: 關卡詳情（僅公開已發布關卡；草稿需作者或管理員）
+        LevelOut | LevelPackedOut: 關卡詳情（僅公開已發布關卡；草稿需作者或管理員）
 
     Raises:
         HTTPException 404/403: 關卡不存在或無權存取
     """
+    packed = wants_packed_map(map_format, accept)
+    # 沒有 If-None-Match 就不可能回 304，內容欄位在同一個查詢載入
+    conditional = bool(if_none_match)
+    payload = DEFERRED_PAYLOAD if conditional else detail_options(packed)
     level = (
         db.query(Level)
-        .options(joinedload(Level.author))
+        .options(joinedload(Level.author), *payload)
         .filter(Level.id == level_id)
         .first()
     )
@@ -228,6 +328,7 @@ def get_level(
         )
 
     if level.status != LevelStatus.PUBLISHED:
+        current_user = principal.resolve()
         if not current_user:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -239,4 +340,21 @@ def get_level(
                 detail="無權查看此關卡"
             )
 
-    return level
+    etag = make_etag(level.id, level.updated_at, level.author_name, "packed" if packed else "json")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, vary="Accept")
+
+    set_etag(response, etag)
+    response.headers["Vary"] = "Accept"
+    if conditional:
+        try:
+            db.refresh(level, attribute_names=payload_attributes(packed))
+        except InvalidRequestError:
+            # 兩次查詢之間關卡被刪除
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="關卡不存在"
+            )
+    if packed:
+        return LevelPackedOut.model_validate(level)
+    return LevelOut.model_validate(level)
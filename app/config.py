@@ -1,4 +1,6 @@
 """配置管理 - 用 pydantic-settings 讀取環境變數"""
+from typing import Literal
+
 from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -27,6 +29,81 @@ class Settings(BaseSettings):
         description="JWT 簽名金鑰，必須透過環境變數提供",
     )
     cors_origins: list[str] = ["http://localhost:3000"]  # CORS 允許的來源
+    db_async: bool = Field(
+        default=False,
+        description="啟用 AsyncEngine 與非同步路由（psycopg async driver）",
+    )
+
+    # ===== 連線池 =====
+    db_pool_size: int = Field(default=5, ge=1, description="常駐連線數")
+    db_max_overflow: int = Field(default=10, ge=0, description="尖峰時可額外建立的連線數")
+    db_pool_timeout: float = Field(default=30.0, gt=0, description="等待可用連線的秒數上限")
+    db_pool_recycle: int = Field(default=-1, description="連線存活秒數上限，-1 表示不回收")
+    db_pool_pre_ping: bool = Field(default=True, description="每次 checkout 前先 ping 連線")
+    db_pgbouncer_transaction_mode: bool = Field(
+        default=False,
+        description="PgBouncer transaction mode 預設組合：停用 prepared statements 與 pre-ping",
+    )
+    threadpool_size: int | None = Field(
+        default=None,
+        ge=1,
+        description="同步路由 threadpool 大小（AnyIO 預設 40），應與連線池一起調整",
+    )
+
+    # ===== 密碼雜湊 =====
+    bcrypt_rounds: int = Field(
+        default=12,
+        ge=4,
+        le=31,
+        description="bcrypt cost factor；變更後舊雜湊會在使用者下次登入時重新雜湊",
+    )
+    password_hash_workers: int | None = Field(
+        default=None,
+        ge=1,
+        description="bcrypt 專用執行緒數（bcrypt 執行時釋放 GIL），預設為 CPU 核心數",
+    )
+    password_hash_queue: int = Field(
+        default=64,
+        ge=1,
+        description="bcrypt 執行中加排隊的工作上限，超過時直接回 503",
+    )
+
+    # ===== 快取 =====
+    cache_backend: Literal["memory", "redis", "none"] = Field(
+        default="memory",
+        description="已發布關卡列表快取後端；多 worker 部署建議 redis 以共享失效",
+    )
+    cache_ttl_seconds: float = Field(default=30.0, gt=0, description="快取存活秒數")
+    cache_max_entries: int = Field(default=1024, ge=1, description="記憶體快取筆數上限（LRU）")
+    redis_url: str | None = Field(default=None, description="cache_backend=redis 時的連線字串")
+    auth_cache_ttl_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        description="已驗證 token 與使用者身分快取秒數（0 停用）；多 worker 時其他程序的失效最多延遲此秒數",
+    )
+    auth_cache_max_entries: int = Field(default=10_000, ge=1, description="身分快取筆數上限（LRU）")
+
+    # ===== 遊戲引擎 =====
+    verify_solutions: bool = Field(
+        default=False,
+        description="發布時以伺服器端引擎執行 solution，未完成關卡則拒絕",
+    )
+    engine_max_steps: int = Field(default=10_000, ge=1, description="伺服器端執行程式的步數上限")
+    engine_workers: int | None = Field(
+        default=None,
+        ge=1,
+        description="批次評估程序池大小，預設為 CPU 核心數",
+    )
+    verify_progress: bool = Field(
+        default=False,
+        description="更新進度時以使用者儲存的程式重新執行，只採用伺服器端算出的步數與星星數",
+    )
+    progress_memo_entries: int = Field(default=4096, ge=1, description="進度驗證結果 LRU 筆數")
+    solver_on_publish: bool = Field(
+        default=True,
+        description="發布後在背景搜尋最短解，寫入 metadata.difficulty 供審核排序",
+    )
+    solver_time_budget: float = Field(default=5.0, gt=0, description="最短解搜尋的時間預算（秒）")
 
 
 settings = Settings()
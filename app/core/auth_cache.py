@@ -0,0 +1,100 @@
+"""認證快取
+
+每個認證請求原本都要 jwt.decode 並 SELECT users。這裡快取兩件事：
+
+- token → claims：key 為 token 的 SHA-256（不把 token 原文放進快取），
+  存活時間不超過 token 的 exp，過期 token 不會因快取而繼續有效
+- user id → Principal（id, username, is_superuser）：不需要 ORM User 的端點
+  （進度、程式自動儲存）命中時完全不碰資料庫
+
+使用者失效採版本號（同 level_cache）：admin 更新/刪除使用者時遞增該使用者的版本號，
+查詢途中讀到舊資料的請求只會寫入舊版本的 key，不會蓋掉失效。
+記憶體後端的失效只作用於單一程序，其他 worker 最多延遲 auth_cache_ttl_seconds。
+"""
+import hashlib
+import time
+from typing import Any, Optional
+
+from app.config import settings
+from app.core.cache import CacheBackend, build_cache
+from app.schemas.user import Principal, TokenData
+
+
+class AuthCache:
+    """token claims 與使用者身分快取
+
+    Args:
+        backend: 快取後端，None 表示停用（get 永遠 miss）
+        ttl: 存活秒數，0 表示停用
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: float):
+        self.backend = backend if ttl > 0 else None
+        self.ttl = ttl
+
+    @staticmethod
+    def _token_key(token: str) -> str:
+        return "auth:token:" + hashlib.sha256(token.encode()).hexdigest()
+
+    def _principal_key(self, user_id: int, version: int) -> str:
+        return f"auth:user:{user_id}:v{version}"
+
+    def _version(self, user_id: int) -> int:
+        return self.backend.get(f"auth:user:{user_id}:version") or 0
+
+    def get_claims(self, token: str) -> Optional[TokenData]:
+        """取得已驗證過的 token claims（未快取回傳 None）"""
+        if self.backend is None:
+            return None
+        cached = self.backend.get(self._token_key(token))
+        return None if cached is None else TokenData(**cached)
+
+    def set_claims(self, token: str, claims: TokenData, expires_at: Any = None) -> None:
+        """快取驗證通過的 claims
+
+        Args:
+            token: JWT token
+            claims: 解碼結果
+            expires_at: payload 的 exp（UNIX 秒），存活時間不超過此時間
+        """
+        if self.backend is None:
+            return
+        ttl = self.ttl
+        if isinstance(expires_at, (int, float)):
+            ttl = min(ttl, expires_at - time.time())
+        if ttl > 0:
+            self.backend.set(self._token_key(token), claims.model_dump(), ttl=ttl)
+
+    def principal_version(self, user_id: int) -> int:
+        """查詢資料庫前先讀版本號，之後交給 set_principal"""
+        return 0 if self.backend is None else self._version(user_id)
+
+    def get_principal(self, user_id: int) -> Optional[Principal]:
+        """取得快取的使用者身分（未快取回傳 None）"""
+        if self.backend is None:
+            return None
+        cached = self.backend.get(self._principal_key(user_id, self._version(user_id)))
+        return None if cached is None else Principal(**cached)
+
+    def set_principal(self, principal: Principal, version: int) -> None:
+        """寫入使用者身分
+
+        Args:
+            principal: 從資料庫讀出的身分
+            version: 查詢前由 principal_version 取得的版本號
+        """
+        if self.backend is None:
+            return
+        self.backend.set(self._principal_key(principal.id, version), principal.model_dump(), ttl=self.ttl)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """使用者資料變更或刪除後呼叫（commit 之後）"""
+        if self.backend is None:
+            return
+        self.backend.incr(f"auth:user:{user_id}:version")
+
+
+auth_cache = AuthCache(
+    build_cache(max_entries=settings.auth_cache_max_entries),
+    ttl=settings.auth_cache_ttl_seconds,
+)
@@ -0,0 +1,143 @@
+"""快取後端
+
+- MemoryCache：程序內 TTL + LRU（預設）
+- RedisCache：任何 Redis 相容 client（get/set/delete/incr），測試時可換成本地替身
+
+值必須可 JSON 序列化，兩種後端行為才一致。
+incr 計數器（用於版本號失效）不受 TTL 與 LRU 淘汰影響。
+"""
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.config import settings
+
+
+class CacheBackend(ABC):
+    """快取後端介面"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """取得值，不存在或過期回傳 None"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """寫入值，ttl 為秒數（None 表示使用後端預設）"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """刪除值"""
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """原子遞增計數器並回傳新值"""
+
+
+class MemoryCache(CacheBackend):
+    """程序內快取：TTL + 容量上限 LRU 淘汰（執行緒安全）
+
+    Args:
+        max_entries: 最多保留筆數，超過時淘汰最久未使用者
+        default_ttl: 預設存活秒數
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return self._counters.get(key)
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._counters.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+    def clear(self) -> None:
+        """清空所有資料（含計數器）"""
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+
+class RedisCache(CacheBackend):
+    """Redis 相容後端（多 worker 共享快取與失效）
+
+    Args:
+        client: 具備 get/set(px=)/delete/incr 的 client，例如 redis.Redis
+        default_ttl: 預設存活秒數
+        prefix: key 前綴
+    """
+
+    def __init__(self, client: Any, default_ttl: float = 30.0, prefix: str = "block42:"):
+        self.client = client
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl_ms = int((self.default_ttl if ttl is None else ttl) * 1000)
+        self.client.set(self.prefix + key, json.dumps(value, separators=(",", ":")), px=ttl_ms)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(self.prefix + key))
+
+
+def build_cache(max_entries: Optional[int] = None) -> Optional[CacheBackend]:
+    """依 settings.cache_backend 建立快取後端
+
+    Args:
+        max_entries: 覆寫記憶體快取容量（不同用途的快取可各自調整）
+
+    Returns:
+        CacheBackend | None: cache_backend="none" 時回傳 None（停用快取）
+    """
+    if settings.cache_backend == "none":
+        return None
+    if settings.cache_backend == "redis":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis 需要安裝 redis 套件: pip install redis") from e
+        if not settings.redis_url:
+            raise RuntimeError("CACHE_BACKEND=redis 需要設定 REDIS_URL")
+        return RedisCache(redis.Redis.from_url(settings.redis_url), default_ttl=settings.cache_ttl_seconds)
+    return MemoryCache(
+        max_entries=max_entries or settings.cache_max_entries,
+        default_ttl=settings.cache_ttl_seconds,
+    )
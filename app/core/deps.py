@@ -2,13 +2,16 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.user import User
+from app.core.auth_cache import auth_cache
 from app.core.security import SECRET_KEY, ALGORITHM
-from app.schemas.user import TokenData
+from app.schemas.user import Principal, TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 oauth2_scheme_optional = OAuth2PasswordBearer(
@@ -17,6 +20,88 @@ oauth2_scheme_optional = OAuth2PasswordBearer(
 )
 
 
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="無效的認證憑證",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def decode_token(token: str) -> Optional[TokenData]:
+    """解碼 JWT token（驗證結果快取於 auth_cache，存活不超過 exp）
+
+    Args:
+        token: JWT token
+
+    Returns:
+        TokenData | None: 解碼成功回傳 payload，簽名/格式錯誤回傳 None
+    """
+    cached = auth_cache.get_claims(token)
+    if cached is not None:
+        return cached
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+
+    user_id_raw = payload.get("sub")
+    if user_id_raw is None:
+        return None
+    try:
+        user_id = int(user_id_raw)
+    except (TypeError, ValueError):
+        return None
+
+    is_superuser: bool = payload.get("is_superuser", False)
+    token_data = TokenData(user_id=user_id, is_superuser=is_superuser)
+    auth_cache.set_claims(token, token_data, payload.get("exp"))
+    return token_data
+
+
+def _principal_query(user_id: int):
+    return select(User.id, User.username, User.is_superuser).where(User.id == user_id)
+
+
+def load_principal(db: Session, user_id: int) -> Optional[Principal]:
+    """取得使用者身分，先查 auth_cache，未命中才查詢資料庫
+
+    Args:
+        db: 資料庫 session
+        user_id: 使用者 ID
+
+    Returns:
+        Principal | None: 使用者不存在回傳 None
+    """
+    principal = auth_cache.get_principal(user_id)
+    if principal is not None:
+        return principal
+
+    version = auth_cache.principal_version(user_id)
+    row = db.execute(_principal_query(user_id)).first()
+    if row is None:
+        return None
+    principal = Principal.model_validate(row)
+    auth_cache.set_principal(principal, version)
+    return principal
+
+
+async def load_principal_async(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    """load_principal 的非同步版本"""
+    principal = auth_cache.get_principal(user_id)
+    if principal is not None:
+        return principal
+
+    version = auth_cache.principal_version(user_id)
+    row = (await db.execute(_principal_query(user_id))).first()
+    if row is None:
+        return None
+    principal = Principal.model_validate(row)
+    auth_cache.set_principal(principal, version)
+    return principal
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
@@ -33,35 +118,47 @@ def get_current_user(
     Raises:
         HTTPException 401: Token 無效或使用者不存在
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="無效的認證憑證",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id_raw = payload.get("sub")
-        is_superuser: bool = payload.get("is_superuser", False)
-
-        if user_id_raw is None:
-            raise credentials_exception
-        try:
-            user_id = int(user_id_raw)
-        except (TypeError, ValueError):
-            raise credentials_exception
-
-        token_data = TokenData(user_id=user_id, is_superuser=is_superuser)
-    except JWTError:
-        raise credentials_exception
+    token_data = decode_token(token)
+    if token_data is None:
+        raise _credentials_exception()
 
+    version = auth_cache.principal_version(token_data.user_id)
     user = db.query(User).filter(User.id == token_data.user_id).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
+    auth_cache.set_principal(Principal.model_validate(user), version)
     return user
 
 
+def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """從 JWT token 取得當前使用者身分（不需 ORM User 的端點使用）
+
+    token 與身分都命中快取時不查詢資料庫。
+
+    Args:
+        token: JWT token (自動從 Authorization header 提取)
+        db: 資料庫 session（只在快取未命中時使用）
+
+    Returns:
+        Principal: 使用者 id、username、is_superuser
+
+    Raises:
+        HTTPException 401: Token 無效或使用者不存在
+    """
+    token_data = decode_token(token)
+    if token_data is None:
+        raise _credentials_exception()
+
+    principal = load_principal(db, token_data.user_id)
+    if principal is None:
+        raise _credentials_exception()
+    return principal
+
+
 def require_superuser(current_user: User = Depends(get_current_user)) -> User:
     """要求 superuser 權限
 
@@ -92,22 +189,140 @@ def get_current_user_optional(
     """
     if not token:
         return None
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id_raw = payload.get("sub")
-        is_superuser: bool = payload.get("is_superuser", False)
-        if user_id_raw is None:
-            return None
-        try:
-            user_id = int(user_id_raw)
-        except (TypeError, ValueError):
-            return None
-    except JWTError:
+    token_data = decode_token(token)
+    if token_data is None:
         return None
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).filter(User.id == token_data.user_id).first()
     if not user:
         return None
     # 同步 superuser 資訊
-    user.is_superuser = bool(is_superuser)
+    user.is_superuser = bool(token_data.is_superuser)
+    return user
+
+
+class LazyPrincipal:
+    """延遲解析的可選身分（公開端點使用）
+
+    依賴注入時只取出 Authorization header，不解碼也不查詢；端點確實需要身分時
+    （例如未發布關卡的權限檢查）才呼叫 resolve()。結果只解析一次。
+
+    Args:
+        token: JWT token，未提供時為 None
+        db: 資料庫 session（只在 resolve 且快取未命中時使用）
+    """
+
+    _UNRESOLVED = object()
+
+    def __init__(self, token: Optional[str], db: Session):
+        self.token = token
+        self.db = db
+        self._principal = self._UNRESOLVED
+
+    def resolve(self) -> Optional[Principal]:
+        """解析身分，未提供 token、token 無效或使用者不存在時回傳 None"""
+        if self._principal is self._UNRESOLVED:
+            token_data = decode_token(self.token) if self.token else None
+            self._principal = (
+                None if token_data is None else load_principal(self.db, token_data.user_id)
+            )
+        return self._principal
+
+
+def get_lazy_principal(
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+    db: Session = Depends(get_db)
+) -> LazyPrincipal:
+    """可選身分的延遲版本，見 LazyPrincipal"""
+    return LazyPrincipal(token, db)
+
+
+# ===== 非同步版本（settings.db_async）=====
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """get_current_user 的非同步版本"""
+    token_data = decode_token(token)
+    if token_data is None:
+        raise _credentials_exception()
+
+    version = auth_cache.principal_version(token_data.user_id)
+    user = await db.scalar(select(User).where(User.id == token_data.user_id))
+    if user is None:
+        raise _credentials_exception()
+
+    auth_cache.set_principal(Principal.model_validate(user), version)
     return user
+
+
+async def get_current_principal_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """get_current_principal 的非同步版本"""
+    token_data = decode_token(token)
+    if token_data is None:
+        raise _credentials_exception()
+
+    principal = await load_principal_async(db, token_data.user_id)
+    if principal is None:
+        raise _credentials_exception()
+    return principal
+
+
+async def require_superuser_async(current_user: User = Depends(get_current_user_async)) -> User:
+    """require_superuser 的非同步版本"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="需要管理員權限"
+        )
+    return current_user
+
+
+async def get_current_user_optional_async(
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[User]:
+    """get_current_user_optional 的非同步版本"""
+    if not token:
+        return None
+    token_data = decode_token(token)
+    if token_data is None:
+        return None
+
+    user = await db.scalar(select(User).where(User.id == token_data.user_id))
+    if not user:
+        return None
+    user.is_superuser = bool(token_data.is_superuser)
+    return user
+
+
+class LazyPrincipalAsync:
+    """LazyPrincipal 的非同步版本（await resolve()）"""
+
+    _UNRESOLVED = object()
+
+    def __init__(self, token: Optional[str], db: AsyncSession):
+        self.token = token
+        self.db = db
+        self._principal = self._UNRESOLVED
+
+    async def resolve(self) -> Optional[Principal]:
+        """解析身分，未提供 token、token 無效或使用者不存在時回傳 None"""
+        if self._principal is self._UNRESOLVED:
+            token_data = decode_token(self.token) if self.token else None
+            self._principal = (
+                None if token_data is None else await load_principal_async(self.db, token_data.user_id)
+            )
+        return self._principal
+
+
+async def get_lazy_principal_async(
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+    db: AsyncSession = Depends(get_async_db)
+) -> LazyPrincipalAsync:
+    """get_lazy_principal 的非同步版本"""
+    return LazyPrincipalAsync(token, db)
@@ -0,0 +1,64 @@
+"""ETag / If-None-Match 條件式 GET 工具"""
+import hashlib
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import Response, status
+
+# 回應一律要求客戶端重新驗證，ETag 才能發揮作用
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """由版本資訊產生強 ETag
+
+    Args:
+        parts: 足以代表回應內容版本的值（例如 id + updated_at）
+
+    Returns:
+        str: 帶雙引號的強 ETag
+    """
+    raw = "\x1f".join(p.isoformat() if isinstance(p, datetime) else str(p) for p in parts)
+    return '"' + hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 比對（RFC 9110 弱比較：忽略 W/ 前綴）
+
+    Args:
+        if_none_match: 請求標頭原始值
+        etag: 目前版本的 ETag
+
+    Returns:
+        bool: 客戶端持有的版本仍然有效
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str, vary: Optional[str] = None) -> Response:
+    """304 回應（不含 body）
+
+    Args:
+        etag: 目前版本的 ETag
+        vary: 回應內容依請求標頭而異時帶上 Vary（需與 200 回應一致）
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if vary:
+        headers["Vary"] = vary
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """於 200 回應加上 ETag"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,128 @@
+"""地圖壓縮編碼（packed grid）
+
+正規化後的地圖座標落在 0..MAX_DIMENSION-1，且地板只有三種顏色，
+因此可以用每格 2 bits 的 row-major 網格表示（0=空, 1=R, 2=G, 3=B）。
+
+格式（big-endian）：
+    header  B version | B width | B height | B padding
+            B start_x | B start_y | B start_dir | H star_count
+    stars   star_count * (B x, B y)
+    grid    ceil(width * height / 4) bytes，每 byte 由高位開始存 4 格
+
+width/height 為含 padding 的渲染範圍（bounds），gridSize/bounds 可由此還原。
+128x128 地圖約 4 KB，JSON 表示則有數百 KB。
+"""
+import struct
+from typing import Any
+
+FORMAT_VERSION = 1
+
+# 要求 packed 地圖的 Accept 媒體類型（也可用 ?map_format=packed）
+PACKED_MAP_MEDIA_TYPE = "application/vnd.block42.packed-map+json"
+
+_HEADER = struct.Struct(">BBBBBBBH")
+_COLOR_CODES = {"R": 1, "G": 2, "B": 3}
+_CODE_COLORS = (None, "R", "G", "B")
+
+
+class MapCodecError(ValueError):
+    """無法編碼/解碼的地圖資料"""
+
+
+def wants_packed_map(map_format: str | None, accept: str | None) -> bool:
+    """判斷回應是否使用 packed 地圖；明確的 map_format 優先於 Accept"""
+    if map_format is not None:
+        return map_format == "packed"
+    return bool(accept) and PACKED_MAP_MEDIA_TYPE in accept
+
+
+def encode_map(map_data: dict[str, Any]) -> bytes:
+    """將正規化後的 map_data 編碼為 packed grid
+
+    Args:
+        map_data: MapData.model_dump() 的結果（座標已平移、bounds 已計算）
+
+    Returns:
+        bytes: packed grid
+
+    Raises:
+        MapCodecError: 地圖未正規化或超出格式範圍
+    """
+    bounds = map_data.get("bounds")
+    if not bounds:
+        raise MapCodecError("地圖缺少 bounds，請先經過 MapData 正規化")
+    width = bounds["maxX"] - bounds["minX"] + 1
+    height = bounds["maxY"] - bounds["minY"] + 1
+    stars = map_data["stars"]
+    start = map_data["start"]
+
+    try:
+        out = bytearray(_HEADER.pack(
+            FORMAT_VERSION, width, height, map_data.get("padding", 0),
+            start["x"], start["y"], start["dir"], len(stars),
+        ))
+        for star in stars:
+            out += bytes((star["x"], star["y"]))
+    except (struct.error, ValueError) as e:
+        raise MapCodecError(f"地圖超出 packed 格式範圍: {e}") from e
+
+    grid = bytearray((width * height + 3) // 4)
+    for tile in map_data["tiles"]:
+        x, y = tile["x"], tile["y"]
+        if not (0 <= x < width and 0 <= y < height):
+            raise MapCodecError(f"地板座標超出 bounds: ({x}, {y})")
+        index = y * width + x
+        shift = 6 - (index & 3) * 2
+        byte = index >> 2
+        # 同座標重複時以最後一筆為準（與 MapData 去重規則一致）
+        grid[byte] = (grid[byte] & ~(3 << shift)) | (_COLOR_CODES[tile["color"]] << shift)
+    out += grid
+    return bytes(out)
+
+
+def decode_map(packed: bytes) -> dict[str, Any]:
+    """將 packed grid 還原為 map_data 結構
+
+    地板依 row-major 順序輸出（與原始 tiles 順序可能不同，內容相同）。
+
+    Args:
+        packed: encode_map 的結果
+
+    Returns:
+        dict: 與 MapData.model_dump() 相同結構的地圖
+
+    Raises:
+        MapCodecError: 格式版本不符或資料截斷
+    """
+    if len(packed) < _HEADER.size:
+        raise MapCodecError("packed 地圖資料截斷")
+    version, width, height, padding, start_x, start_y, start_dir, star_count = (
+        _HEADER.unpack_from(packed)
+    )
+    if version != FORMAT_VERSION:
+        raise MapCodecError(f"不支援的 packed 地圖版本: {version}")
+
+    offset = _HEADER.size
+    grid_offset = offset + star_count * 2
+    if len(packed) < grid_offset + (width * height + 3) // 4:
+        raise MapCodecError("packed 地圖資料截斷")
+
+    stars = [
+        {"x": packed[i], "y": packed[i + 1]}
+        for i in range(offset, grid_offset, 2)
+    ]
+    tiles = []
+    for index in range(width * height):
+        code = (packed[grid_offset + (index >> 2)] >> (6 - (index & 3) * 2)) & 3
+        if code:
+            y, x = divmod(index, width)
+            tiles.append({"x": x, "y": y, "color": _CODE_COLORS[code]})
+
+    return {
+        "gridSize": max(width, height),
+        "padding": padding,
+        "bounds": {"minX": 0, "minY": 0, "maxX": width - 1, "maxY": height - 1},
+        "start": {"x": start_x, "y": start_y, "dir": start_dir},
+        "stars": stars,
+        "tiles": tiles,
+    }
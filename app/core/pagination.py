@@ -0,0 +1,58 @@
+"""Keyset (cursor) 分頁工具
+
+游標是不透明的 base64url 字串，內容為排序鍵 + id 的 JSON。
+客戶端只需原樣帶回 `next_cursor`，不應解析其內容。
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(*values: Any) -> str:
+    """將排序鍵編碼為不透明游標
+
+    Args:
+        values: 排序鍵（最後一個通常是 id，用於打破平手）
+
+    Returns:
+        str: base64url 游標（去除 padding）
+    """
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """解碼游標並依序轉換型別
+
+    Args:
+        cursor: encode_cursor 產生的字串
+        types: 每個排序鍵的型別（datetime 會以 ISO 格式解析）
+
+    Returns:
+        tuple: 轉換後的排序鍵
+
+    Raises:
+        HTTPException 400: 游標格式錯誤
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor arity mismatch")
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for v, t in zip(values, types)
+        )
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="無效的分頁游標",
+        )
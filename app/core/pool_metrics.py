@@ -0,0 +1,129 @@
+"""連線池監控
+
+透過 pool event 統計 connect/checkout/checkin/invalidate 次數，並以
+Instrumented pool 量測「等待可用連線」的時間分佈（SQLAlchemy 沒有
+checkout 開始前的事件，只能包住 _do_get）。
+"""
+import math
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# 等待時間 histogram 上界（秒），最後一格為 +Inf
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+
+class PoolMetrics:
+    """單一連線池的累計指標（執行緒安全）"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_counts = [0] * len(WAIT_BUCKETS)
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def observe_wait(self, seconds: float) -> None:
+        """記錄一次 checkout 等待時間"""
+        with self._lock:
+            for i, upper in enumerate(WAIT_BUCKETS):
+                if seconds <= upper:
+                    self.wait_counts[i] += 1
+                    break
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self, pool: Pool) -> dict:
+        """目前連線狀態 + 累計指標
+
+        Args:
+            pool: 要讀取即時狀態的連線池
+
+        Returns:
+            dict: 可直接交給 PoolStats schema
+        """
+        with self._lock:
+            cumulative = 0
+            histogram = []
+            for upper, count in zip(WAIT_BUCKETS, self.wait_counts):
+                cumulative += count
+                histogram.append({"le": "+Inf" if math.isinf(upper) else upper, "count": cumulative})
+            return {
+                "pool_class": type(pool).__name__,
+                "size": pool.size() if hasattr(pool, "size") else 0,
+                "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else 0,
+                "idle": pool.checkedin() if hasattr(pool, "checkedin") else 0,
+                "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0,
+                "max_overflow": getattr(pool, "_max_overflow", 0),
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_count": cumulative,
+                "wait_sum_seconds": self.wait_sum,
+                "wait_max_seconds": self.wait_max,
+                "wait_histogram": histogram,
+            }
+
+
+class _WaitTimingMixin:
+    """量測 _do_get（取得連線，含排隊等待）的耗時"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        # engine.dispose() 會以 recreate() 換新池，指標需延續
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.incr("timeouts")
+            raise
+        finally:
+            self.metrics.observe_wait(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    """同步 engine 用"""
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    """非同步 engine 用"""
+
+
+def instrument_pool(pool: Pool) -> PoolMetrics:
+    """掛上 pool event 並回傳該池的 PoolMetrics
+
+    Args:
+        pool: engine.pool（非同步 engine 請傳 async_engine.sync_engine.pool）
+
+    Returns:
+        PoolMetrics: 指標物件（存放於 pool.metrics）
+    """
+    metrics = getattr(pool, "metrics", None) or PoolMetrics()
+    pool.metrics = metrics
+
+    event.listen(pool, "connect", lambda *_: metrics.incr("connects"))
+    event.listen(pool, "checkout", lambda *_: metrics.incr("checkouts"))
+    event.listen(pool, "checkin", lambda *_: metrics.incr("checkins"))
+    event.listen(pool, "invalidate", lambda *_: metrics.incr("invalidations"))
+    return metrics
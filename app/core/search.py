@@ -0,0 +1,20 @@
+"""文字搜尋工具
+
+標題、使用者名稱的子字串搜尋以 ILIKE '%q%' 實作，由 pg_trgm GIN 索引
+（gin_trgm_ops）支援；查詢字串少於 3 個字元時 trigram 索引無法過濾，
+會退回掃描，呼叫端可自行要求最小長度。
+"""
+MIN_TRGM_QUERY_LENGTH = 3
+
+
+def contains_pattern(query: str) -> str:
+    """將使用者輸入轉為 ILIKE 子字串 pattern（跳脫 %、_ 與 \\）
+
+    Args:
+        query: 搜尋字串
+
+    Returns:
+        str: 例如 "100%" → "%100\\%%"
+    """
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
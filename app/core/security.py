@@ -1,10 +1,19 @@
-"""安全工具：密碼雜湊、JWT token"""
+"""安全工具：密碼雜湊、JWT token
+
+bcrypt 在專用、有上限的執行緒池執行（app.core.workers.get_password_pool），
+不佔用同步路由的 threadpool；佇列已滿時回 503。async 端點使用 *_async 版本，
+等待期間不佔用任何 threadpool 執行緒。
+"""
+import asyncio
+from concurrent.futures import Future
 from datetime import datetime, timedelta, UTC
-from typing import Any
+from typing import Any, Callable
 import bcrypt
+from fastapi import HTTPException, status
 from jose import jwt
 
 from app.config import settings
+from app.core.workers import PoolSaturated, get_password_pool
 
 # JWT 設定（從環境變數讀取）
 SECRET_KEY = getattr(settings, "secret_key", "INSECURE_DEFAULT_SECRET_CHANGE_ME")
@@ -12,6 +21,30 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 小時
 
 
+def _checkpw(plain_password: str, hashed_password: str) -> bool:
+    # Bcrypt hash 是 ASCII-compatible binary data，必須用 latin-1 編碼
+    # 絕對不能用 utf-8，否則會破壞 hash 的二進制結構
+    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("latin-1"))
+
+
+def _hashpw(password: str) -> str:
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
+    hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
+    return hashed.decode("utf-8")
+
+
+def _submit(fn: Callable[..., Any], *args: Any) -> Future:
+    """送進密碼雜湊執行緒池，佇列已滿時回 503"""
+    try:
+        return get_password_pool().submit(fn, *args)
+    except PoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="登入人數過多，請稍後再試",
+            headers={"Retry-After": "1"},
+        )
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """驗證密碼
 
@@ -21,24 +54,45 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
     Returns:
         bool: 密碼是否正確
+
+    Raises:
+        HTTPException 503: 密碼雜湊佇列已滿
     """
-    # Bcrypt hash 是 ASCII-compatible binary data，必須用 latin-1 編碼
-    # 絕對不能用 utf-8，否則會破壞 hash 的二進制結構
-    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("latin-1"))
+    return _submit(_checkpw, plain_password, hashed_password).result()
 
 
 def get_password_hash(password: str) -> str:
-    """雜湊密碼
+    """雜湊密碼（cost 為 settings.bcrypt_rounds）
 
     Args:
         password: 明文密碼（無長度限制）
 
     Returns:
         str: Bcrypt 雜湊後的密碼
+
+    Raises:
+        HTTPException 503: 密碼雜湊佇列已滿
     """
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
-    return hashed.decode("utf-8")
+    return _submit(_hashpw, password).result()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password 的非同步版本"""
+    return await asyncio.wrap_future(_submit(_checkpw, plain_password, hashed_password))
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash 的非同步版本"""
+    return await asyncio.wrap_future(_submit(_hashpw, password))
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """雜湊的 cost 是否與 settings.bcrypt_rounds 不同（格式 $2b$<cost>$...）"""
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != settings.bcrypt_rounds
 
 
 def create_access_token(data: dict[str, Any]) -> str:
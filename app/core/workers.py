@@ -0,0 +1,112 @@
+"""CPU 密集工作的執行器
+
+- 程序池：遊戲引擎批次評估、難度估計等純 Python 計算
+- 密碼雜湊執行緒池：bcrypt 執行時釋放 GIL，用獨立、有上限的執行緒池，
+  登入尖峰不會佔滿同步路由的 threadpool
+
+都在第一次使用時建立，應用關閉時由 lifespan 關閉。
+程序池使用 spawn 啟動 worker：伺服器程序有多個執行緒，fork 可能複製到被鎖住的鎖。
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.config import settings
+
+_pool: Optional[ProcessPoolExecutor] = None
+_password_pool: Optional["BoundedThreadPool"] = None
+_lock = threading.Lock()
+
+
+class PoolSaturated(RuntimeError):
+    """執行器已達佇列上限"""
+
+
+class BoundedThreadPool:
+    """有佇列深度上限的執行緒池
+
+    執行中加排隊的工作數達 max_pending 時 submit 直接拋出 PoolSaturated，
+    呼叫端可立即回 503，不必排在長佇列後面逾時。
+
+    Args:
+        max_workers: 執行緒數
+        max_pending: 執行中加排隊的工作上限
+        thread_name_prefix: 執行緒名稱前綴
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, thread_name_prefix: str = ""):
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """送出工作
+
+        Raises:
+            PoolSaturated: 佇列已滿
+        """
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturated(f"已有 {self.max_pending} 個工作在執行或排隊")
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+
+
+def worker_count() -> int:
+    """程序池大小（settings.engine_workers，預設為 CPU 核心數）"""
+    return settings.engine_workers or os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """取得共用程序池（lazy 建立）"""
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=worker_count(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def shutdown_process_pool() -> None:
+    """關閉程序池（應用關閉時呼叫）"""
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def get_password_pool() -> BoundedThreadPool:
+    """取得密碼雜湊執行緒池（lazy 建立）"""
+    global _password_pool
+    if _password_pool is None:
+        with _lock:
+            if _password_pool is None:
+                _password_pool = BoundedThreadPool(
+                    max_workers=settings.password_hash_workers or os.cpu_count() or 1,
+                    max_pending=settings.password_hash_queue,
+                    thread_name_prefix="bcrypt",
+                )
+    return _password_pool
+
+
+def shutdown_password_pool() -> None:
+    """關閉密碼雜湊執行緒池（應用關閉時呼叫）"""
+    global _password_pool
+    with _lock:
+        if _password_pool is not None:
+            _password_pool.shutdown()
+            _password_pool = None
@@ -1,20 +1,38 @@
 """資料庫連線管理"""
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 from app.config import settings
+from app.core.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_pool
 
 # 確保使用 psycopg3 驅動
 database_url = settings.database_url
 if database_url.startswith("postgresql://"):
     database_url = database_url.replace("postgresql://", "postgresql+psycopg://", 1)
 
+
+def engine_options() -> dict:
+    """依設定組出 create_engine / create_async_engine 共用參數"""
+    options = {
+        "echo": settings.debug,  # SQL 日誌
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,  # 連線健康檢查
+    }
+    if settings.db_pgbouncer_transaction_mode:
+        # transaction mode 下同一 session 的語句可能落在不同 server 連線：
+        # server-side prepared statement 不可用；PgBouncer 自己檢查後端連線，pre-ping 只是多一趟來回
+        options["connect_args"] = {"prepare_threshold": None}
+        options["pool_pre_ping"] = False
+    return options
+
+
 # 同步 engine
-engine = create_engine(
-    database_url,
-    echo=settings.debug,  # SQL 日誌
-    pool_pre_ping=True,   # 連線健康檢查
-)
+engine = create_engine(database_url, poolclass=InstrumentedQueuePool, **engine_options())
+instrument_pool(engine.pool)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -22,6 +40,23 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# 非同步 engine（settings.db_async 開啟時才建立，避免多開一組連線池）
+# psycopg3 同一個 URL 在 create_async_engine 下會使用其 async driver
+async_engine = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+if settings.db_async:
+    async_engine = create_async_engine(
+        database_url,
+        poolclass=InstrumentedAsyncQueuePool,
+        **engine_options(),
+    )
+    instrument_pool(async_engine.sync_engine.pool)
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,  # commit 後不可隱式 lazy load，保留已載入的屬性
+    )
+
 
 class Base(DeclarativeBase):
     """所有 model 的基類"""
@@ -35,3 +70,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """FastAPI 依賴注入用（非同步模式）"""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("非同步資料庫未啟用，請設定 DB_ASYNC=true")
+    async with AsyncSessionLocal() as db:
+        yield db
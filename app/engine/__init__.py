@@ -0,0 +1,35 @@
+"""遊戲引擎 - 伺服器端執行 Block42 程式
+
+用於驗證提交的 solution / 進度，不依賴資料庫。
+"""
+from app.engine.board import Board, BoardError
+from app.engine.program import COMMAND_KEYS, Program, ProgramError, format_command, parse_command
+from app.engine.compiler import CompiledProgram, compile_program
+from app.engine.interpreter import (
+    DEFAULT_MAX_STEPS,
+    ExecutionResult,
+    Outcome,
+    execute,
+    run_program,
+)
+from app.engine.solver import SolveResult, solve, solve_map
+
+__all__ = [
+    "Board",
+    "BoardError",
+    "COMMAND_KEYS",
+    "Program",
+    "ProgramError",
+    "parse_command",
+    "format_command",
+    "CompiledProgram",
+    "compile_program",
+    "DEFAULT_MAX_STEPS",
+    "ExecutionResult",
+    "Outcome",
+    "execute",
+    "run_program",
+    "SolveResult",
+    "solve",
+    "solve_map",
+]
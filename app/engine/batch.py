@@ -0,0 +1,52 @@
+"""批次評估 - 同一關卡執行多個程式（於 worker 程序中執行）
+
+參數與回傳值只使用基本型別，方便跨程序傳遞。
+"""
+from typing import Any
+
+from app.engine.board import Board
+from app.engine.compiler import compile_program
+from app.engine.interpreter import execute
+from app.engine.program import Program, ProgramError
+
+
+def evaluate_programs(
+    map_data: dict[str, Any],
+    config: dict[str, Any],
+    programs: list[dict[str, Any]],
+    max_steps: int,
+) -> list[dict[str, Any]]:
+    """在同一張地圖上執行多個程式，棋盤只建立一次
+
+    Args:
+        map_data: 正規化後的地圖
+        config: 關卡 config
+        programs: {commands_f0, commands_f1, commands_f2} 列表
+        max_steps: 每個程式的步數上限
+
+    Returns:
+        list[dict]: 與 programs 對應的結果 {outcome, steps, stars_collected, total_stars, error}
+    """
+    board = Board.from_map(map_data)
+    results = []
+    for commands in programs:
+        try:
+            program = compile_program(Program.from_commands(commands, config=config))
+        except ProgramError as e:
+            results.append({
+                "outcome": "invalid",
+                "steps": 0,
+                "stars_collected": 0,
+                "total_stars": board.star_count,
+                "error": str(e),
+            })
+            continue
+        result = execute(board, program, max_steps=max_steps)
+        results.append({
+            "outcome": result.outcome.value,
+            "steps": result.steps,
+            "stars_collected": result.stars_collected,
+            "total_stars": result.total_stars,
+            "error": None,
+        })
+    return results
@@ -0,0 +1,98 @@
+"""棋盤 - 由正規化地圖建立的密集網格
+
+網格外圍多留一圈空格，移動時只需檢查目的格是否為 0 就能判斷掉落，
+不必另外做邊界比較。
+"""
+from dataclasses import dataclass
+from typing import Any
+
+from app.schemas.level import MAX_DIMENSION
+
+# 格子顏色編碼（與 app.core.map_codec 一致）
+EMPTY = 0
+COLOR_CODES = {"R": 1, "G": 2, "B": 3}
+
+# 方向：0=上, 1=右, 2=下, 3=左（y 向下遞增）
+DIRECTIONS = 4
+
+# 含外圍空格的最大格數
+MAX_CELLS = (MAX_DIMENSION + 2) ** 2
+
+
+class BoardError(ValueError):
+    """地圖無法建立棋盤"""
+
+
+@dataclass(frozen=True, slots=True)
+class Board:
+    """不可變的初始棋盤，每次執行複製 grid/stars 後修改
+
+    Attributes:
+        stride: 每列格數（含外圍空格）
+        grid: 每格顏色編碼（0=空, 1=R, 2=G, 3=B）
+        stars: 每格是否有星星（1/0）
+        star_count: 星星總數
+        start: 起點格索引
+        start_dir: 起點方向
+    """
+    stride: int
+    grid: bytes
+    stars: bytes
+    star_count: int
+    start: int
+    start_dir: int
+
+    @property
+    def deltas(self) -> tuple[int, int, int, int]:
+        """各方向前進一格的索引位移"""
+        return (-self.stride, 1, self.stride, -1)
+
+    def index(self, x: int, y: int) -> int:
+        """地圖座標轉為網格索引"""
+        return (y + 1) * self.stride + (x + 1)
+
+    @classmethod
+    def from_map(cls, map_data: dict[str, Any]) -> "Board":
+        """由正規化後的 map_data 建立棋盤
+
+        Args:
+            map_data: MapData.model_dump() 結構（座標已平移、bounds 已計算）
+
+        Returns:
+            Board: 初始棋盤
+
+        Raises:
+            BoardError: 地圖未正規化或座標超出 bounds
+        """
+        bounds = map_data.get("bounds")
+        if not bounds:
+            raise BoardError("地圖缺少 bounds，請先經過 MapData 正規化")
+        width = bounds["maxX"] - bounds["minX"] + 1
+        height = bounds["maxY"] - bounds["minY"] + 1
+        if not (0 < width <= MAX_DIMENSION and 0 < height <= MAX_DIMENSION):
+            raise BoardError(f"地圖尺寸超出範圍: {width}x{height}")
+        stride = width + 2
+
+        def index(point: dict) -> int:
+            x, y = point["x"], point["y"]
+            if not (0 <= x < width and 0 <= y < height):
+                raise BoardError(f"座標超出 bounds: ({x}, {y})")
+            return (y + 1) * stride + (x + 1)
+
+        grid = bytearray(stride * (height + 2))
+        for tile in map_data["tiles"]:
+            grid[index(tile)] = COLOR_CODES[tile["color"]]
+
+        stars = bytearray(len(grid))
+        for star in map_data["stars"]:
+            stars[index(star)] = 1
+
+        start = map_data["start"]
+        return cls(
+            stride=stride,
+            grid=bytes(grid),
+            stars=bytes(stars),
+            star_count=sum(stars),
+            start=index(start),
+            start_dir=start["dir"],
+        )
@@ -0,0 +1,55 @@
+"""編譯器 - 將 f0/f1/f2 攤平為單一指令陣列
+
+- 三個函數依序排列，各以 RETURN 結尾
+- 呼叫目標在編譯時解析為絕對位址
+- 位於函數最後一個指令的呼叫編譯為 JUMP（tail call，不保留返回位址）
+
+直譯器因此只需要一個 pc 與一個整數返回位址堆疊。
+"""
+from dataclasses import dataclass
+
+from app.engine.program import OP_CALL, Instruction, Program
+
+OP_JUMP = 5
+OP_RETURN = 6
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledProgram:
+    """已編譯的程式
+
+    Attributes:
+        code: 攤平的指令陣列 (條件, 運算碼, 參數)，CALL/JUMP 的參數為絕對位址
+        entries: 各函數的起始位址（f0 固定為 0）
+    """
+    code: tuple[Instruction, ...]
+    entries: tuple[int, ...]
+
+
+def compile_program(program: Program) -> CompiledProgram:
+    """編譯程式
+
+    Args:
+        program: 已解析的程式
+
+    Returns:
+        CompiledProgram: 攤平後的指令陣列
+    """
+    entries = []
+    address = 0
+    for body in program.functions:
+        entries.append(address)
+        address += len(body) + 1  # + RETURN
+
+    code: list[Instruction] = []
+    for body in program.functions:
+        last = len(body) - 1
+        for i, (condition, op, arg) in enumerate(body):
+            if op == OP_CALL:
+                # 最後一個指令的呼叫：返回位址只會是 RETURN，直接跳轉即可
+                code.append((condition, OP_JUMP if i == last else OP_CALL, entries[arg]))
+            else:
+                code.append((condition, op, arg))
+        code.append((0, OP_RETURN, 0))
+
+    return CompiledProgram(code=tuple(code), entries=tuple(entries))
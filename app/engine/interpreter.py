@@ -0,0 +1,190 @@
+"""直譯器 - 在棋盤上執行已編譯的程式
+
+規則：
+- 起點格若有星星，開始時即收集
+- 條件不符的指令直接略過，不計步數；其餘每個執行的指令（含函數呼叫）計 1 步
+- 前進到空格或地圖外即掉落，程式結束
+- 收集完所有星星立即結束（solved）
+- f0 執行完且呼叫堆疊為空則停止（halted）
+
+迴圈偵測：
+任何不會結束的執行都必須無限次經過 CALL/JUMP。每次跳轉時記錄
+(pc, 位置, 方向, 剩餘星星數, 塗色後的棋盤雜湊, 呼叫堆疊)，狀態重複即代表
+之後會完全重演，立即回傳 loop，不必耗盡步數上限。呼叫堆疊持續增長的遞迴
+則由堆疊深度上限截斷。棋盤以 Zobrist hashing 增量維護，塗色為 O(1)。
+"""
+import enum
+import random
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+from app.engine.board import MAX_CELLS, Board
+from app.engine.compiler import OP_JUMP, OP_RETURN, CompiledProgram, compile_program
+from app.engine.program import OP_CALL, OP_FORWARD, OP_LEFT, OP_PAINT, OP_RIGHT, Program
+
+DEFAULT_MAX_STEPS = 10_000
+DEFAULT_MAX_DEPTH = 256
+
+
+class Outcome(str, enum.Enum):
+    """執行結果類型"""
+    SOLVED = "solved"
+    HALTED = "halted"
+    FELL = "fell"
+    LOOP = "loop"
+    STEP_LIMIT = "step_limit"
+    STACK_OVERFLOW = "stack_overflow"
+
+
+@dataclass(frozen=True, slots=True)
+class ExecutionResult:
+    """程式執行結果
+
+    Attributes:
+        outcome: 結束原因
+        steps: 執行的指令數
+        stars_collected: 收集到的星星數
+        total_stars: 地圖星星總數
+    """
+    outcome: Outcome
+    steps: int
+    stars_collected: int
+    total_stars: int
+
+    @property
+    def solved(self) -> bool:
+        return self.outcome is Outcome.SOLVED
+
+
+@cache
+def _zobrist_keys() -> tuple[int, ...]:
+    """每個 (格子, 顏色) 的 64-bit 隨機鍵（固定種子，所有棋盤共用）"""
+    rng = random.Random(0xB10C42)
+    return tuple(rng.getrandbits(64) for _ in range(MAX_CELLS * 4))
+
+
+def execute(
+    board: Board,
+    program: CompiledProgram | Program,
+    max_steps: int = DEFAULT_MAX_STEPS,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    detect_loops: bool = True,
+) -> ExecutionResult:
+    """在棋盤上執行程式
+
+    Args:
+        board: 初始棋盤（不會被修改）
+        program: 已編譯的程式（傳入 Program 時自動編譯）
+        max_steps: 步數上限
+        max_depth: 呼叫堆疊深度上限
+        detect_loops: 狀態重複時提早結束（關閉僅供比較）
+
+    Returns:
+        ExecutionResult: 執行結果
+    """
+    if isinstance(program, Program):
+        program = compile_program(program)
+    code = program.code
+
+    grid = bytearray(board.grid)
+    stars = bytearray(board.stars)
+    deltas = board.deltas
+    total = board.star_count
+    zobrist = _zobrist_keys()
+
+    pos = board.start
+    direction = board.start_dir
+    remaining = total
+    if stars[pos]:
+        stars[pos] = 0
+        remaining -= 1
+
+    stack: list[int] = []
+    seen: set[tuple] = set()
+    grid_hash = 0
+    pc = 0
+    steps = 0
+    outcome = Outcome.HALTED
+
+    while remaining:
+        condition, op, arg = code[pc]
+        pc += 1
+        if op == OP_RETURN:
+            if not stack:
+                outcome = Outcome.HALTED
+                break
+            pc = stack.pop()
+            continue
+        if condition and grid[pos] != condition:
+            continue
+        if steps >= max_steps:
+            outcome = Outcome.STEP_LIMIT
+            break
+        steps += 1
+
+        if op == OP_FORWARD:
+            pos += deltas[direction]
+            if not grid[pos]:
+                outcome = Outcome.FELL
+                break
+            if stars[pos]:
+                stars[pos] = 0
+                remaining -= 1
+        elif op == OP_LEFT:
+            direction = (direction + 3) & 3
+        elif op == OP_RIGHT:
+            direction = (direction + 1) & 3
+        elif op == OP_PAINT:
+            old = grid[pos]
+            if old != arg:
+                grid_hash ^= zobrist[pos * 4 + old] ^ zobrist[pos * 4 + arg]
+                grid[pos] = arg
+        else:  # OP_CALL / OP_JUMP
+            if op == OP_CALL:
+                if len(stack) >= max_depth:
+                    outcome = Outcome.STACK_OVERFLOW
+                    break
+                stack.append(pc)
+            pc = arg
+            if detect_loops:
+                state = (pc, pos, direction, remaining, grid_hash, tuple(stack))
+                if state in seen:
+                    outcome = Outcome.LOOP
+                    break
+                seen.add(state)
+    else:
+        outcome = Outcome.SOLVED
+
+    return ExecutionResult(
+        outcome=outcome,
+        steps=steps,
+        stars_collected=total - remaining,
+        total_stars=total,
+    )
+
+
+def run_program(
+    map_data: dict[str, Any],
+    config: dict[str, Any],
+    commands: dict[str, Any],
+    max_steps: int = DEFAULT_MAX_STEPS,
+) -> ExecutionResult:
+    """解析、編譯並執行 {commands_f0, commands_f1, commands_f2}（Solution / LevelProgram.commands）
+
+    Args:
+        map_data: 正規化後的地圖
+        config: 關卡 config（檢查槽位數與塗色工具）
+        commands: 程式指令
+        max_steps: 步數上限
+
+    Returns:
+        ExecutionResult: 執行結果
+
+    Raises:
+        BoardError: 地圖無法建立棋盤
+        ProgramError: 程式格式錯誤或違反關卡設定
+    """
+    board = Board.from_map(map_data)
+    program = compile_program(Program.from_commands(commands, config=config))
+    return execute(board, program, max_steps=max_steps)
@@ -0,0 +1,141 @@
+"""程式解析 - commands_f0/f1/f2 轉為指令序列
+
+指令格式：`[條件:]動作`，不分大小寫，空字串代表空格位（略過）
+
+    動作  F        前進一格
+          L / R    左轉 / 右轉
+          F0-F2    呼叫函數
+          PR/PG/PB 將腳下地板塗成紅/綠/藍（需 config.tools 開啟對應工具）
+    條件  R/G/B    只在腳下地板為該顏色時執行，例如 "R:L"、"G:F1"
+"""
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+from app.engine.board import COLOR_CODES
+
+# 指令運算碼
+OP_FORWARD = 0
+OP_LEFT = 1
+OP_RIGHT = 2
+OP_CALL = 3
+OP_PAINT = 4
+
+FUNCTION_COUNT = 3
+
+# 儲存格式（Solution / LevelProgram.commands）中 F0-F2 的鍵
+COMMAND_KEYS = ("commands_f0", "commands_f1", "commands_f2")
+
+_ACTIONS: dict[str, tuple[int, int]] = {
+    "F": (OP_FORWARD, 0),
+    "L": (OP_LEFT, 0),
+    "R": (OP_RIGHT, 0),
+    "F0": (OP_CALL, 0),
+    "F1": (OP_CALL, 1),
+    "F2": (OP_CALL, 2),
+    "PR": (OP_PAINT, COLOR_CODES["R"]),
+    "PG": (OP_PAINT, COLOR_CODES["G"]),
+    "PB": (OP_PAINT, COLOR_CODES["B"]),
+}
+_PAINT_TOOLS = {
+    COLOR_CODES["R"]: "paint_red",
+    COLOR_CODES["G"]: "paint_green",
+    COLOR_CODES["B"]: "paint_blue",
+}
+
+# (條件顏色, 運算碼, 參數)；條件 0 表示無條件
+Instruction = tuple[int, int, int]
+
+
+class ProgramError(ValueError):
+    """程式格式錯誤或違反關卡設定"""
+
+
+_TOKENS = {action: token for token, action in _ACTIONS.items()}
+_COLOR_NAMES = {code: name for name, code in COLOR_CODES.items()}
+
+
+def format_command(instruction: Instruction) -> str:
+    """parse_command 的反向：指令轉回字串，例如 (1, OP_LEFT, 0) 轉為 R:L"""
+    condition, op, arg = instruction
+    token = _TOKENS[(op, arg)]
+    return f"{_COLOR_NAMES[condition]}:{token}" if condition else token
+
+
+def parse_command(token: str) -> Optional[Instruction]:
+    """解析單一指令
+
+    Args:
+        token: 指令字串，例如 "F"、"R:L"、"PB"
+
+    Returns:
+        Instruction | None: 指令；空字串回傳 None
+
+    Raises:
+        ProgramError: 無法辨識的指令
+    """
+    token = token.strip().upper()
+    if not token:
+        return None
+    condition = 0
+    if ":" in token:
+        color, _, token = token.partition(":")
+        if color not in COLOR_CODES:
+            raise ProgramError(f"無法辨識的條件顏色: {color}")
+        condition = COLOR_CODES[color]
+    action = _ACTIONS.get(token)
+    if action is None:
+        raise ProgramError(f"無法辨識的指令: {token}")
+    return (condition, *action)
+
+
+@dataclass(frozen=True, slots=True)
+class Program:
+    """已解析的程式（f0/f1/f2 三個函數）"""
+    functions: tuple[tuple[Instruction, ...], ...]
+
+    @classmethod
+    def parse(
+        cls,
+        commands_f0: Sequence[str],
+        commands_f1: Sequence[str] = (),
+        commands_f2: Sequence[str] = (),
+        config: Optional[dict[str, Any]] = None,
+    ) -> "Program":
+        """解析三個函數的指令
+
+        Args:
+            commands_f0/f1/f2: 各函數的指令字串
+            config: 關卡 config；提供時檢查槽位數與塗色工具是否允許
+
+        Returns:
+            Program: 已解析的程式
+
+        Raises:
+            ProgramError: 指令格式錯誤或違反關卡設定
+        """
+        functions = []
+        for slot, commands in enumerate((commands_f0, commands_f1, commands_f2)):
+            body = tuple(
+                instruction
+                for instruction in (parse_command(token) for token in commands)
+                if instruction is not None
+            )
+            if config is not None and len(body) > config.get(f"f{slot}", 0):
+                raise ProgramError(f"f{slot} 最多 {config.get(f'f{slot}', 0)} 個指令，收到 {len(body)}")
+            functions.append(body)
+
+        if config is not None:
+            tools = config.get("tools", {})
+            for body in functions:
+                for _, op, arg in body:
+                    if op == OP_CALL and config.get(f"f{arg}", 0) == 0:
+                        raise ProgramError(f"此關卡未開放 f{arg}")
+                    if op == OP_PAINT and not tools.get(_PAINT_TOOLS[arg], False):
+                        raise ProgramError(f"此關卡未開放 {_PAINT_TOOLS[arg]} 工具")
+
+        return cls(functions=tuple(functions))
+
+    @classmethod
+    def from_commands(cls, commands: dict[str, Any], config: Optional[dict[str, Any]] = None) -> "Program":
+        """由 {commands_f0, commands_f1, commands_f2} 結構解析（Solution / LevelProgram.commands）"""
+        return cls.parse(*(commands.get(key) or () for key in COMMAND_KEYS), config=config)
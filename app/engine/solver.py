@@ -0,0 +1,379 @@
+"""解題器 - 在槽位限制內搜尋最短程式，用於估計關卡難度
+
+搜尋方式：
+- 迭代加深（IDDFS），深度為程式總指令數，第一個找到的解即為最短程式
+- 惰性合成：不預先列舉整個程式，而是直接執行部分程式，執行到尚未決定的
+  槽位（hole）時才分支——填入一個指令，或讓該函數在此結束。從未被執行的
+  槽位永遠不會被列舉，失敗得早的前綴會一次剪掉整棵子樹
+- 每個 hole 保存執行狀態，分支後從該狀態繼續，不必從頭重跑
+
+剪枝：
+- 對稱：f1/f2 槽位數相同時兩者可互換，只允許先使用 f1；
+  相鄰的無條件 L/R 互相抵消、三次同向轉彎（等於一次反向）、R R（等於 L L）、
+  連續塗色（前者被覆蓋）、轉彎後塗色（與先塗色後轉彎等價）都只保留一種寫法
+- 無效指令：條件與塗色同色的塗色、地圖上不存在也塗不出來的條件顏色、
+  呼叫未開放或空的函數
+- 置換表：部分程式的子樹若完整搜尋過且未受深度上限截斷，記為已否證，
+  之後的迭代不再展開（IDDFS 每一輪都會重走較淺的節點）
+
+找到的解會再交給 execute() 確認，結果與正式驗證一致。
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.engine.board import Board
+from app.engine.compiler import compile_program
+from app.engine.interpreter import DEFAULT_MAX_DEPTH, _zobrist_keys, execute
+from app.engine.program import (
+    _PAINT_TOOLS,
+    FUNCTION_COUNT,
+    OP_CALL,
+    OP_FORWARD,
+    OP_LEFT,
+    OP_PAINT,
+    OP_RIGHT,
+    Instruction,
+    Program,
+    format_command,
+)
+
+DEFAULT_TIME_BUDGET = 5.0
+DEFAULT_SOLVER_MAX_STEPS = 2_000
+# 置換表上限（超過後不再記錄，搜尋結果不受影響，只是重複子樹不再被剪枝）
+# 每筆約 350-400 bytes（函數內容 tuple + set 槽位），上限約 40 MB / worker；
+# 程序池每個 worker 各有一份，尖峰時總量約 ENGINE_WORKERS × 40 MB。
+# 預設 5 秒預算約展開 20 萬節點，置換表通常遠小於此上限。
+MAX_TABLE_SIZE = 100_000
+# 每展開多少節點檢查一次時間
+_CLOCK_INTERVAL = 512
+
+# 搜尋結果狀態
+SOLVED = "solved"
+EXHAUSTED = "exhausted"  # 槽位內搜尋完畢，無解
+TIMEOUT = "timeout"
+
+# run 的回傳：遇到 hole，或執行結束（SOLVED/FAILED）
+_HOLE = 0
+_DONE_SOLVED = 1
+_DONE_FAILED = 2
+
+
+@dataclass(frozen=True, slots=True)
+class SolveResult:
+    """搜尋結果
+
+    Attributes:
+        status: solved / exhausted / timeout
+        length: 最短程式的指令數（未找到為 None）
+        steps: 最短程式中最少的執行步數（未找到為 None）
+        program: 最短程式 {commands_f0, commands_f1, commands_f2}
+        nodes: 展開的節點數
+        elapsed: 耗時（秒）
+    """
+    status: str
+    length: Optional[int]
+    steps: Optional[int]
+    program: Optional[dict[str, list[str]]]
+    nodes: int
+    elapsed: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "status": self.status,
+            "shortest_length": self.length,
+            "shortest_steps": self.steps,
+            "program": self.program,
+            "nodes": self.nodes,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+class _Timeout(Exception):
+    pass
+
+
+class _Search:
+    """單次搜尋的狀態；部分程式存在 bodies/closed，DFS 時原地修改後還原"""
+
+    def __init__(self, board: Board, config: dict[str, Any], max_steps: int, deadline: float):
+        self.board = board
+        self.deltas = board.deltas
+        self.zobrist = _zobrist_keys()
+        self.max_steps = max_steps
+        self.deadline = deadline
+        self.slots = [config.get(f"f{i}", 0) for i in range(FUNCTION_COUNT)]
+
+        tools = config.get("tools", {})
+        paints = [color for color, tool in _PAINT_TOOLS.items() if tools.get(tool, False)]
+        colors = {code for code in board.grid if code} | set(paints)
+        # 只有一種可能的顏色時條件毫無作用
+        conditions = [0] + (sorted(colors) if len(colors) > 1 else [])
+        actions = [(OP_FORWARD, 0), (OP_LEFT, 0), (OP_RIGHT, 0)]
+        actions += [(OP_PAINT, color) for color in paints]
+        actions += [(OP_CALL, i) for i in range(FUNCTION_COUNT) if self.slots[i] > 0]
+        self.alphabet: list[Instruction] = [
+            (condition, op, arg)
+            for condition in conditions
+            for op, arg in actions
+            if not (op == OP_PAINT and condition == arg)
+        ]
+        # f1/f2 可互換時，只允許在 f1 已被呼叫後使用 f2
+        self.symmetric = self.slots[1] == self.slots[2]
+
+        self.bodies: list[list[Instruction]] = [[] for _ in range(FUNCTION_COUNT)]
+        self.closed = [False] * FUNCTION_COUNT
+        self.calls = [0] * FUNCTION_COUNT
+        self.table: set[tuple] = set()
+        self.nodes = 0
+        self.best: Optional[tuple[int, int, dict[str, list[str]]]] = None
+
+    # ----- 執行 -----
+
+    def initial_state(self) -> list:
+        board = self.board
+        stars = bytearray(board.stars)
+        remaining = board.star_count
+        if stars[board.start]:
+            stars[board.start] = 0
+            remaining -= 1
+        # [函數, 槽位, 位置, 方向, 網格, 星星, 剩餘星星, 堆疊, 步數, 網格雜湊, 已見狀態,
+        #  待執行的呼叫, 上次有效指令後進入過的函數（bitmask）]
+        return [0, 0, board.start, board.start_dir, bytearray(board.grid), stars,
+                remaining, [], 0, 0, set(), -1, 0]
+
+    def run(self, state: list) -> int:
+        """執行部分程式直到結束或遇到 hole；遇到 hole 時把狀態寫回 state
+
+        呼叫位於尚未結束的函數目前最後一個指令時，是否為 tail call 取決於之後
+        的槽位，因此先停在該 hole 讓搜尋決定，再執行這個呼叫（pending）。
+
+        兩次進入同一函數之間若只有呼叫（沒有移動、轉彎、塗色或返回），狀態完全
+        相同而堆疊只增不減，必定堆疊溢位，直接判定失敗而不必遞迴到深度上限。
+        """
+        (fn, idx, pos, direction, grid, stars, remaining, stack, steps, grid_hash, seen,
+         pending, entered) = state
+        bodies, closed = self.bodies, self.closed
+        deltas, zobrist, max_steps = self.deltas, self.zobrist, self.max_steps
+
+        if not remaining:
+            return _DONE_SOLVED
+        while True:
+            if pending >= 0:
+                # 函數最後一個指令的呼叫視為 tail call，與 compile_program 一致
+                if not (closed[fn] and idx == len(bodies[fn])):
+                    if len(stack) >= DEFAULT_MAX_DEPTH:
+                        return _DONE_FAILED
+                    # 每個 frame 帶整個堆疊的雜湊鏈，狀態鍵不必複製堆疊
+                    chain = hash((stack[-1][2] if stack else 0, fn, idx))
+                    stack.append((fn, idx, chain))
+                fn, idx, pending = pending, 0, -1
+                if entered >> fn & 1:
+                    return _DONE_FAILED
+                entered |= 1 << fn
+                # 兩次經過相同狀態之間沒有遇到 hole，路徑只用到已決定的槽位，必然無限重演
+                key = (fn, pos, direction, remaining, grid_hash, len(stack), stack[-1][2] if stack else 0)
+                if key in seen:
+                    return _DONE_FAILED
+                seen.add(key)
+
+            body = bodies[fn]
+            if idx >= len(body):
+                if not closed[fn]:
+                    state[:] = (fn, idx, pos, direction, grid, stars, remaining,
+                                stack, steps, grid_hash, seen, -1, entered)
+                    return _HOLE
+                if not stack:
+                    return _DONE_FAILED
+                fn, idx, _ = stack.pop()
+                entered = 0
+                continue
+            condition, op, arg = body[idx]
+            idx += 1
+            if condition and grid[pos] != condition:
+                continue
+            if steps >= max_steps:
+                return _DONE_FAILED
+            steps += 1
+
+            if op != OP_CALL:
+                entered = 0
+            if op == OP_FORWARD:
+                pos += deltas[direction]
+                if not grid[pos]:
+                    return _DONE_FAILED
+                if stars[pos]:
+                    stars[pos] = 0
+                    remaining -= 1
+                    if not remaining:
+                        return _DONE_SOLVED
+            elif op == OP_LEFT:
+                direction = (direction + 3) & 3
+            elif op == OP_RIGHT:
+                direction = (direction + 1) & 3
+            elif op == OP_PAINT:
+                old = grid[pos]
+                if old != arg:
+                    grid_hash ^= zobrist[pos * 4 + old] ^ zobrist[pos * 4 + arg]
+                    grid[pos] = arg
+            else:
+                pending = arg
+                if idx == len(body) and not closed[fn]:
+                    state[:] = (fn, idx, pos, direction, grid, stars, remaining,
+                                stack, steps, grid_hash, seen, pending, entered)
+                    return _HOLE
+
+    @staticmethod
+    def fork(state: list) -> list:
+        (fn, idx, pos, direction, grid, stars, remaining, stack, steps, grid_hash, seen,
+         pending, entered) = state
+        return [fn, idx, pos, direction, bytearray(grid), bytearray(stars),
+                remaining, list(stack), steps, grid_hash, set(seen), pending, entered]
+
+    # ----- 搜尋 -----
+
+    def allowed(self, fn: int, instruction: Instruction) -> bool:
+        """對稱與冗餘剪枝：instruction 能否接在 bodies[fn] 之後"""
+        condition, op, arg = instruction
+        if op == OP_CALL:
+            if self.closed[arg] and not self.bodies[arg]:
+                return False
+            if arg == 2 and self.symmetric and not self.calls[1]:
+                return False
+        body = self.bodies[fn]
+        if condition or not body:
+            return True
+        prev_condition, prev_op, _ = body[-1]
+        if prev_condition:
+            return True
+        if op == OP_LEFT or op == OP_RIGHT:
+            if prev_op == OP_LEFT or prev_op == OP_RIGHT:
+                if prev_op != op or op == OP_RIGHT:
+                    return False  # L R / R L 抵消；R R 等於 L L
+                if len(body) >= 2 and body[-2] == body[-1]:
+                    return False  # L L L 等於 R
+        elif op == OP_PAINT:
+            if prev_op == OP_PAINT or prev_op == OP_LEFT or prev_op == OP_RIGHT:
+                return False
+        return True
+
+    def solution(self) -> dict[str, list[str]]:
+        return {
+            f"commands_f{i}": [format_command(instruction) for instruction in body]
+            for i, body in enumerate(self.bodies)
+        }
+
+    def record(self, filled: int) -> None:
+        """確認找到的程式並保留步數最少者"""
+        commands = self.solution()
+        program = compile_program(Program.from_commands(commands))
+        result = execute(self.board, program, max_steps=self.max_steps)
+        if not result.solved:
+            return
+        if self.best is None or result.steps < self.best[1]:
+            self.best = (filled, result.steps, commands)
+
+    def dfs(self, state: list, filled: int, limit: int) -> bool:
+        """展開一個節點；回傳子樹是否受深度上限截斷"""
+        self.nodes += 1
+        if not self.nodes % _CLOCK_INTERVAL and time.perf_counter() > self.deadline:
+            raise _Timeout
+
+        signature = (tuple(map(tuple, self.bodies)), tuple(self.closed))
+        if signature in self.table:
+            return False
+
+        fn, idx = state[0], state[1]
+        truncated = False
+        bodies, closed = self.bodies, self.closed
+
+        # 讓函數在此結束（f0 至少一個指令；呼叫空函數沒有意義）
+        if idx > 0:
+            closed[fn] = True
+            truncated |= self.branch(state, filled, limit)
+            closed[fn] = False
+
+        if idx < self.slots[fn]:
+            if filled >= limit:
+                truncated = True
+            else:
+                body = bodies[fn]
+                for instruction in self.alphabet:
+                    if not self.allowed(fn, instruction):
+                        continue
+                    body.append(instruction)
+                    if instruction[1] == OP_CALL:
+                        self.calls[instruction[2]] += 1
+                    truncated |= self.branch(state, filled + 1, limit)
+                    if instruction[1] == OP_CALL:
+                        self.calls[instruction[2]] -= 1
+                    body.pop()
+
+        if not truncated and len(self.table) < MAX_TABLE_SIZE:
+            self.table.add(signature)
+        return truncated
+
+    def branch(self, state: list, filled: int, limit: int) -> bool:
+        child = self.fork(state)
+        status = self.run(child)
+        if status == _HOLE:
+            return self.dfs(child, filled, limit)
+        if status == _DONE_SOLVED:
+            self.record(filled)
+        return False
+
+
+def solve(
+    board: Board,
+    config: dict[str, Any],
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    max_steps: int = DEFAULT_SOLVER_MAX_STEPS,
+) -> SolveResult:
+    """搜尋最短程式
+
+    找到最短長度後會把同長度的程式搜尋完，取步數最少者；時間用完時回傳目前最佳解。
+
+    Args:
+        board: 初始棋盤
+        config: 關卡 config（f0/f1/f2 槽位數與塗色工具）
+        time_budget: 時間預算（秒）
+        max_steps: 單一程式的步數上限
+
+    Returns:
+        SolveResult: 搜尋結果
+    """
+    started = time.perf_counter()
+    search = _Search(board, config, max_steps, deadline=started + time_budget)
+    status = EXHAUSTED
+
+    try:
+        root = search.initial_state()
+        if search.run(root) == _DONE_SOLVED:
+            search.best = (0, 0, search.solution())
+        else:
+            for limit in range(1, sum(search.slots) + 1):
+                truncated = search.dfs(search.fork(root), 0, limit)
+                if search.best is not None or not truncated:
+                    break
+    except _Timeout:
+        status = TIMEOUT
+
+    elapsed = time.perf_counter() - started
+    if search.best is None:
+        return SolveResult(status, None, None, None, search.nodes, elapsed)
+    length, steps, program = search.best
+    return SolveResult(SOLVED, length, steps, program, search.nodes, elapsed)
+
+
+def solve_map(
+    map_data: dict[str, Any],
+    config: dict[str, Any],
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    max_steps: int = DEFAULT_SOLVER_MAX_STEPS,
+) -> dict[str, Any]:
+    """在 worker process 中執行的入口（參數與回傳值皆可 pickle）
+
+    Raises:
+        BoardError: 地圖無法建立棋盤
+    """
+    return solve(Board.from_map(map_data), config, time_budget, max_steps).to_dict()
@@ -1,22 +1,32 @@
 """FastAPI 應用入口"""
-from fastapi import FastAPI, Request, Response
+from anyio import to_thread
+from fastapi import APIRouter, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from app.database import engine
+from app.database import engine, async_engine
 from app.config import settings
+from app.core.workers import shutdown_password_pool, shutdown_process_pool
 
 # 導入路由
 from app.api.v1 import auth, levels, designer, admin
+from app.api.v1 import async_levels, async_designer, async_admin
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """應用啟動/關閉時的生命週期管理"""
+    # 啟動時：依設定調整同步路由 threadpool（應與連線池大小一起調整）
+    if settings.threadpool_size is not None:
+        to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+
     # 啟動時：檢查資料庫連線
     try:
         with engine.connect() as conn:
             print("✅ Database connected")
+        if async_engine is not None:
+            async with async_engine.connect() as conn:
+                print("✅ Async database connected")
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
         raise
@@ -24,7 +34,11 @@ async def lifespan(app: FastAPI):
     yield
 
     # 關閉時：清理資源
+    shutdown_process_pool()
+    shutdown_password_pool()
     engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 app = FastAPI(
@@ -43,7 +57,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+def use_async_routes(sync_router: APIRouter, async_router: APIRouter) -> None:
+    """以 async 端點原地取代同路徑同方法的同步端點
+
+    保留同步路由的註冊順序（例如 /levels/progress 必須先於 /levels/{level_id}），
+    沒有 async 版本的端點維持同步實作。
+    """
+    overrides = {(route.path, frozenset(route.methods)): route for route in async_router.routes}
+    sync_router.routes[:] = [
+        overrides.pop((route.path, frozenset(route.methods)), route)
+        for route in sync_router.routes
+    ]
+    if overrides:
+        raise RuntimeError(f"找不到對應的同步端點: {sorted(path for path, _ in overrides)}")
+
+
 # 註冊路由
+if settings.db_async:
+    use_async_routes(levels.router, async_levels.router)
+    use_async_routes(designer.router, async_designer.router)
+    use_async_routes(admin.router, async_admin.router)
+
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(levels.router, prefix="/api/v1")
 app.include_router(designer.router, prefix="/api/v1")
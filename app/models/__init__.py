@@ -2,5 +2,6 @@ from app.models.user import User
 from app.models.level import Level
 from app.models.progress import LevelProgress
 from app.models.program import LevelProgram
+from app.models.stats import LevelStats
 
-__all__ = ["User", "Level", "LevelProgress", "LevelProgram"]
+__all__ = ["User", "Level", "LevelProgress", "LevelProgram", "LevelStats"]
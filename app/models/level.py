@@ -1,12 +1,13 @@
 """Level 模型 - 重構版"""
 from datetime import datetime, UTC
-from sqlalchemy import String, Integer, Boolean, Enum, ForeignKey, DateTime
+from sqlalchemy import String, Integer, Boolean, Enum, ForeignKey, DateTime, Index, LargeBinary, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING
 import enum
 
 from app.database import Base
+from app.core.map_codec import encode_map
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -46,16 +47,42 @@ class Level(Base):
     - Reject (管理員) → status='rejected'
     """
     __tablename__ = "levels"
+    __table_args__ = (
+        # Keyset 分頁索引：部分索引只涵蓋已發布關卡，排序鍵與游標鍵一致
+        Index(
+            "ix_levels_official_keyset",
+            "official_order",
+            "id",
+            postgresql_where=text("status = 'PUBLISHED' AND is_official = true"),
+        ),
+        Index(
+            "ix_levels_community_keyset",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'PUBLISHED' AND is_official = false"),
+        ),
+        # 設計者列表、審核佇列：篩選欄 + 排序欄（取代 author_id、status 單欄索引）
+        Index("ix_levels_author_updated", "author_id", "updated_at"),
+        Index("ix_levels_status_updated", "status", "updated_at"),
+        # 下一個官方序號 max(official_order)
+        Index("ix_levels_official_order", "official_order"),
+        # 標題子字串搜尋（ILIKE '%q%'，需 pg_trgm）
+        Index(
+            "ix_levels_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     # ===== 業務欄位 =====
     id: Mapped[str] = mapped_column(String(12), primary_key=True)  # NanoID 12碼
-    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     status: Mapped[LevelStatus] = mapped_column(
         Enum(LevelStatus),
         default=LevelStatus.DRAFT,
         nullable=False,
-        index=True
     )
     is_official: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, index=True)
     official_order: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -65,6 +92,10 @@ class Level(Base):
     # {gridSize, padding, bounds:{minX,minY,maxX,maxY}, start:{x,y,dir}, stars:[{x,y}], tiles:[{x,y,color}]}
     map_data: Mapped[dict] = mapped_column(JSONB, nullable=False)
 
+    # map_data 的 packed grid 編碼（見 app.core.map_codec），供 ?map_format=packed 回應使用
+    # 由 set_map 與 map_data 同步寫入；舊資料由 migration 回填。預設延遲載入
+    map_packed: Mapped[bytes] = mapped_column(LargeBinary, nullable=False, deferred=True)
+
     # config 結構: {f0: int, f1: int, f2: int, tools: {paint_red, paint_green, paint_blue}}
     config: Mapped[dict] = mapped_column(JSONB, nullable=False)
 
@@ -100,6 +131,11 @@ class Level(Base):
         "LevelProgram", back_populates="level"
     )
 
+    def set_map(self, map_data: dict) -> None:
+        """寫入正規化後的地圖，並同步更新 packed 編碼"""
+        self.map_data = map_data
+        self.map_packed = encode_map(map_data)
+
     @property
     def map(self) -> dict:
         """Expose map_data as `map` for response schemas."""
@@ -0,0 +1,37 @@
+"""關卡遊玩統計模型"""
+from datetime import datetime, UTC
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class LevelStats(Base):
+    """level_progress 的每關彙總（每關一列）
+
+    由 level_progress 的觸發器維護（見 alembic f7c2d4e8b1a6），單筆/批次 upsert 與
+    連帶刪除都在同一交易內反映。直方圖以值（JSON 字串鍵）對應人數：
+    steps_histogram 為完成者的 best_steps，stars_histogram 為所有玩家的 stars_collected。
+    """
+
+    __tablename__ = "level_stats"
+
+    level_id: Mapped[str] = mapped_column(
+        String(12), ForeignKey("levels.id", ondelete="CASCADE"), primary_key=True
+    )
+    players: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    completions: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    steps_histogram: Mapped[dict] = mapped_column(
+        JSONB, nullable=False, server_default=text("'{}'::jsonb")
+    )
+    stars_histogram: Mapped[dict] = mapped_column(
+        JSONB, nullable=False, server_default=text("'{}'::jsonb")
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        server_default=text("now()"),
+        nullable=False,
+    )
@@ -1,5 +1,5 @@
 """User 模型"""
-from sqlalchemy import String, Boolean, Integer
+from sqlalchemy import String, Boolean, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING
 
@@ -21,6 +21,15 @@ class User(Base):
     - is_superuser: 是否為管理員
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # 管理員列表的使用者名稱子字串搜尋（ILIKE '%q%'）
+        Index(
+            "ix_users_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     username: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
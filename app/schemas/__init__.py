@@ -6,12 +6,14 @@ from app.schemas.level import (
     LevelApprove,
     LevelReject,
     LevelOut,
+    LevelPackedOut,
     LevelDetail,
     LevelListItem,
+    LevelListPage,
 )
 
 __all__ = [
     "UserRegister", "UserLogin", "UserOut", "Token", "TokenData",
     "LevelCreate", "LevelUpdate", "LevelPublish", "LevelApprove", "LevelReject",
-    "LevelOut", "LevelDetail", "LevelListItem",
+    "LevelOut", "LevelPackedOut", "LevelDetail", "LevelListItem", "LevelListPage",
 ]
@@ -19,3 +19,84 @@ class LevelTransferResult(BaseModel):
     """Batch transfer result."""
 
     transferred: int
+
+
+class WaitBucket(BaseModel):
+    """等待時間 histogram 桶（累計計數，le 為上界秒數）"""
+
+    le: float | str
+    count: int
+
+
+class PoolStats(BaseModel):
+    """單一連線池狀態"""
+
+    pool_class: str
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+    connects: int
+    checkouts: int
+    checkins: int
+    invalidations: int
+    timeouts: int
+    wait_count: int
+    wait_sum_seconds: float
+    wait_max_seconds: float
+    wait_histogram: list[WaitBucket]
+
+
+class ThreadpoolStats(BaseModel):
+    """同步路由 threadpool 狀態"""
+
+    total: int
+    in_use: int
+
+
+class DatabasePoolReport(BaseModel):
+    """連線池與 threadpool 報告"""
+
+    sync_pool: PoolStats
+    async_pool: PoolStats | None = None
+    threadpool: ThreadpoolStats
+
+
+class EvaluationProgram(BaseModel):
+    """待評估的程式"""
+
+    key: str | None = Field(default=None, max_length=100, description="呼叫端自訂標籤（例如學號）")
+    commands_f0: list[str] = Field(default_factory=list)
+    commands_f1: list[str] = Field(default_factory=list)
+    commands_f2: list[str] = Field(default_factory=list)
+
+
+class LevelEvaluationRequest(BaseModel):
+    """批次評估請求；未提供 programs 時評估此關卡所有已儲存的 level_programs"""
+
+    programs: list[EvaluationProgram] | None = Field(default=None, max_length=5000)
+    max_steps: int | None = Field(default=None, ge=1, le=1_000_000, description="預設為 ENGINE_MAX_STEPS")
+
+
+class ProgramEvaluation(BaseModel):
+    """單一程式評估結果"""
+
+    key: str | None = None
+    user_id: int | None = None
+    username: str | None = None
+    solved: bool
+    outcome: str
+    steps: int
+    stars_collected: int
+    total_stars: int
+    error: str | None = None
+
+
+class LevelEvaluationReport(BaseModel):
+    """批次評估結果"""
+
+    level_id: str
+    total: int
+    solved: int
+    results: list[ProgramEvaluation]
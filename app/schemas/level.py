@@ -1,13 +1,20 @@
 """Level Pydantic Schemas - 重構版"""
-from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Literal
+import base64
+
+from pydantic import BaseModel, Field, PlainSerializer, WithJsonSchema, field_validator, model_validator
+from typing import Annotated, Any, Literal
 from datetime import datetime
 
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
 # --- 地圖限制常數 ---
 COORD_MIN = -512
 COORD_MAX = 512
 MAX_DIMENSION = 128
 
+# --- 批次審核上限 ---
+MAX_MODERATION_BATCH = 500
+
 # --- 遊戲資料結構 (保持原樣) ---
 class Coordinate(BaseModel):
     """座標"""
@@ -97,17 +104,43 @@ class MapData(BaseModel):
 
     @model_validator(mode="after")
     def validate_bounds(self) -> "MapData":
-        """自動平移原點並計算邊界，保留 padding 以便動態渲染"""
-        all_points = [(self.start.x, self.start.y)] + [
-            (coord.x, coord.y) for coord in (self.stars + self.tiles)
-        ]
-        if not all_points:
-            raise ValueError("地圖必須至少包含起點或一個地板")
-
-        min_x = min(x for x, _ in all_points)
-        min_y = min(y for _, y in all_points)
-        max_x = max(x for x, _ in all_points)
-        max_y = max(y for _, y in all_points)
+        """自動平移原點並計算邊界，保留 padding 以便動態渲染
+
+        線性時間：
+        - 一次走訪同時計算邊界，並以座標 dict 去重
+          （同一座標的地板以最後一筆為準，重複的星星只保留一個）
+        - 平移時以 model_copy 複製（不重新驗證），不修改傳入的物件
+        - 起點是否有地板以 dict 查詢，O(1)
+        """
+        start = self.start
+        min_x = max_x = start.x
+        min_y = max_y = start.y
+
+        tiles_by_pos: dict[tuple[int, int], Tile] = {}
+        for tile in self.tiles:
+            x, y = tile.x, tile.y
+            if x < min_x:
+                min_x = x
+            elif x > max_x:
+                max_x = x
+            if y < min_y:
+                min_y = y
+            elif y > max_y:
+                max_y = y
+            tiles_by_pos[(x, y)] = tile
+
+        stars_by_pos: dict[tuple[int, int], Coordinate] = {}
+        for star in self.stars:
+            x, y = star.x, star.y
+            if x < min_x:
+                min_x = x
+            elif x > max_x:
+                max_x = x
+            if y < min_y:
+                min_y = y
+            elif y > max_y:
+                max_y = y
+            stars_by_pos.setdefault((x, y), star)
 
         width_with_padding = (max_x - min_x + 1) + self.padding * 2
         height_with_padding = (max_y - min_y + 1) + self.padding * 2
@@ -117,37 +150,27 @@ class MapData(BaseModel):
                 f"地圖尺寸過大，最多 {MAX_DIMENSION}x{MAX_DIMENSION} (含預留空氣)"
             )
 
-        # 平移座標，確保最左/上邊界落在 padding 之後
+        # 確保起點有地板（以平移前座標查詢）
+        if (start.x, start.y) not in tiles_by_pos:
+            tiles_by_pos[(start.x, start.y)] = Tile(x=start.x, y=start.y, color="R")
+
+        tiles = list(tiles_by_pos.values())
+        stars = list(stars_by_pos.values())
+
+        # 平移座標，確保最左/上邊界落在 padding 之後；
+        # 以 model_copy 建立新物件，不修改呼叫端傳入的 Tile/Coordinate/StartPoint
         shift_x = self.padding - min_x
         shift_y = self.padding - min_y
+        if shift_x or shift_y:
+            def shifted(point):
+                return point.model_copy(update={"x": point.x + shift_x, "y": point.y + shift_y})
 
-        normalized_tiles = [
-            Tile(x=tile.x + shift_x, y=tile.y + shift_y, color=tile.color)
-            for tile in self.tiles
-        ]
-        normalized_stars = [
-            Coordinate(x=star.x + shift_x, y=star.y + shift_y)
-            for star in self.stars
-        ]
-        normalized_start = StartPoint(
-            x=self.start.x + shift_x,
-            y=self.start.y + shift_y,
-            dir=self.start.dir
-        )
-
-        # 確保起點有地板
-        has_start_tile = any(
-            tile.x == normalized_start.x and tile.y == normalized_start.y
-            for tile in normalized_tiles
-        )
-        if not has_start_tile:
-            normalized_tiles.append(
-                Tile(x=normalized_start.x, y=normalized_start.y, color="R")
-            )
+            self.start = shifted(start)
+            tiles = [shifted(tile) for tile in tiles]
+            stars = [shifted(star) for star in stars]
 
-        self.tiles = normalized_tiles
-        self.stars = normalized_stars
-        self.start = normalized_start
+        self.tiles = tiles
+        self.stars = stars
         self.bounds = MapBounds(
             minX=0,
             minY=0,
@@ -158,6 +181,39 @@ class MapData(BaseModel):
         return self
 
 
+def _inline_refs(schema: Any, defs: dict) -> Any:
+    """展開 JSON schema 中的 $ref（MapData 結構無循環）"""
+    if isinstance(schema, dict):
+        if "$ref" in schema:
+            return _inline_refs(defs[schema["$ref"].rsplit("/", 1)[-1]], defs)
+        return {k: _inline_refs(v, defs) for k, v in schema.items() if k != "$defs"}
+    if isinstance(schema, list):
+        return [_inline_refs(item, defs) for item in schema]
+    return schema
+
+
+def _stored_map_json_schema() -> dict:
+    schema = MapData.model_json_schema(mode="serialization")
+    return _inline_refs(schema, schema.get("$defs", {}))
+
+
+# 已儲存的地圖（寫入時已經 MapData 正規化）
+# 回應時直接輸出 dict，不再重建 Tile/Coordinate 物件、不再重算 bounds；
+# OpenAPI 文件仍沿用 MapData 的結構
+StoredMapData = Annotated[dict[str, Any], WithJsonSchema(_stored_map_json_schema())]
+
+# packed grid 編碼的地圖（格式見 app.core.map_codec），回應時輸出 base64 字串
+PackedMap = Annotated[
+    bytes,
+    PlainSerializer(lambda v: base64.b64encode(v).decode("ascii"), return_type=str),
+    WithJsonSchema({
+        "type": "string",
+        "contentEncoding": "base64",
+        "description": "packed grid 地圖：header + stars + 每格 2 bits 的 row-major 網格",
+    }),
+]
+
+
 # --- Solution Schema ---
 class Solution(BaseModel):
     """解題資料（提交時驗證格式）"""
@@ -200,6 +256,18 @@ class LevelReject(BaseModel):
     reason: str = Field(..., min_length=1)
 
 
+class LevelBulkApprove(BaseModel):
+    """批次審核通過（官方序號依 level_ids 順序接續目前最大值分配）"""
+    level_ids: list[str] = Field(..., min_length=1, max_length=MAX_MODERATION_BATCH)
+    as_official: bool = False
+
+
+class LevelBulkReject(BaseModel):
+    """批次駁回（同一理由）"""
+    level_ids: list[str] = Field(..., min_length=1, max_length=MAX_MODERATION_BATCH)
+    reason: str = Field(..., min_length=1)
+
+
 class AdminLevelUpdate(BaseModel):
     """管理員更新關卡（允許部分更新）"""
     title: str | None = Field(default=None, min_length=1, max_length=200)
@@ -212,7 +280,10 @@ class AdminLevelUpdate(BaseModel):
 
 # --- Response Schemas ---
 class LevelOut(BaseModel):
-    """公開回傳（含遊戲資料）"""
+    """公開回傳（含遊戲資料）
+
+    map 使用 StoredMapData：資料庫內容已在寫入時正規化，讀取時信任既有資料。
+    """
     id: str
     title: str
     author_id: int
@@ -221,7 +292,28 @@ class LevelOut(BaseModel):
     is_official: bool
     official_order: int
     config: LevelConfig
-    map: MapData
+    map: StoredMapData
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class LevelPackedOut(BaseModel):
+    """公開回傳（packed 地圖）
+
+    與 LevelOut 相同，但以 map_packed（base64）取代 map。
+    以 ?map_format=packed 或 Accept: application/vnd.block42.packed-map+json 請求。
+    """
+    id: str
+    title: str
+    author_id: int
+    author_name: str | None = None
+    status: str
+    is_official: bool
+    official_order: int
+    config: LevelConfig
+    map_packed: PackedMap
     created_at: datetime
     updated_at: datetime
 
@@ -242,10 +334,44 @@ class LevelListItem(BaseModel):
     status: str
     is_official: bool
     created_at: datetime
+    completions: int = 0
 
     model_config = {"from_attributes": True}
 
 
+class LevelBulkOutcome(BaseModel):
+    """批次審核單筆結果
+
+    outcome: approved / rejected = 已處理；not_pending = 狀態不是 PENDING（status 為目前狀態）；
+    not_found = 關卡不存在
+    """
+    level_id: str
+    outcome: Literal["approved", "rejected", "not_pending", "not_found"]
+    status: str | None = None
+    official_order: int | None = None
+
+
+class LevelBulkResult(BaseModel):
+    """批次審核結果（順序同請求，重複的 ID 只列一次）"""
+    items: list[LevelBulkOutcome]
+
+
+class PendingLevelItem(LevelListItem):
+    """待審核列表項目（含發布時估計的難度，尚未估計為 null）"""
+    updated_at: datetime
+    shortest_length: int | None = Field(default=None, description="最短解的指令數")
+    shortest_steps: int | None = Field(default=None, description="最短解的執行步數")
+
+
+class LevelListPage(BaseModel):
+    """分頁列表（keyset 游標）"""
+    items: list[LevelListItem]
+    next_cursor: str | None = Field(
+        default=None,
+        description="下一頁游標；為 null 表示已無更多資料",
+    )
+
+
 class AdminLevelListItem(BaseModel):
     """管理員列表項目（含官方排序與更新時間）"""
     id: str
@@ -257,5 +383,46 @@ class AdminLevelListItem(BaseModel):
     official_order: int
     created_at: datetime
     updated_at: datetime
+    completions: int = 0
 
     model_config = {"from_attributes": True}
+
+
+class AdminLevelPage(BaseModel):
+    """管理員關卡分頁（keyset 游標）"""
+    items: list[AdminLevelListItem]
+    next_cursor: str | None = Field(
+        default=None,
+        description="下一頁游標；為 null 表示已無更多資料",
+    )
+
+
+class AdminLevelQuery(BaseModel):
+    """管理員關卡列表查詢參數（GET /admin/levels 的 query string）"""
+    cursor: str | None = Field(default=None, description="上一頁回傳的 next_cursor（需相同 sort）")
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    sort: Literal["updated", "created", "title"] = Field(
+        default="updated",
+        description="updated / created = 時間倒序；title = 標題正序",
+    )
+    status: Literal["draft", "pending", "published", "rejected"] | None = None
+    is_official: bool | None = None
+    author_id: int | None = None
+    updated_from: datetime | None = Field(default=None, description="更新時間下限（含）")
+    updated_to: datetime | None = Field(default=None, description="更新時間上限（不含）")
+    q: str | None = Field(default=None, min_length=1, max_length=100, description="標題子字串")
+    format: Literal["page", "ndjson"] | None = Field(
+        default=None,
+        description="ndjson = 串流全部符合的關卡（忽略 cursor/limit；亦可用 Accept: application/x-ndjson）",
+    )
+
+    def filters(self) -> dict[str, Any]:
+        """LevelQueryService.admin_levels 的篩選參數"""
+        return {
+            "status": self.status,
+            "is_official": self.is_official,
+            "author_id": self.author_id,
+            "updated_from": self.updated_from,
+            "updated_to": self.updated_to,
+            "q": self.q,
+        }
@@ -2,6 +2,8 @@
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+MAX_PROGRESS_BATCH = 500
+
 
 class LevelProgressUpdate(BaseModel):
     """Upsert payload for progress."""
@@ -11,6 +13,18 @@ class LevelProgressUpdate(BaseModel):
     stars_collected: int | None = Field(default=None, ge=0)
 
 
+class LevelProgressEntry(LevelProgressUpdate):
+    """One entry of a batch progress sync."""
+
+    level_id: str = Field(min_length=1, max_length=12)
+
+
+class LevelProgressBatch(BaseModel):
+    """Batch progress sync payload (offline play / device switch)."""
+
+    entries: list[LevelProgressEntry] = Field(min_length=1, max_length=MAX_PROGRESS_BATCH)
+
+
 class LevelProgressOut(BaseModel):
     """Progress response for a level."""
 
@@ -22,3 +36,27 @@ class LevelProgressOut(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class LevelProgressBatchResult(BaseModel):
+    """Batch progress sync result."""
+
+    items: list[LevelProgressOut]
+    missing_level_ids: list[str] = Field(
+        default_factory=list,
+        description="Entries skipped because the level does not exist",
+    )
+
+
+class LevelStatsOut(BaseModel):
+    """Aggregate play statistics for a published level."""
+
+    level_id: str
+    players: int = Field(description="Players with a progress record (attempts)")
+    completions: int
+    best_steps: int | None = Field(default=None, description="Fewest steps among completions")
+    median_steps: float | None = Field(default=None, description="Median best_steps among completions")
+    stars_distribution: dict[int, int] = Field(
+        default_factory=dict,
+        description="stars_collected -> number of players",
+    )
@@ -1,6 +1,10 @@
 """User Pydantic Schemas"""
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
 
 # --- Request Schemas ---
 class UserRegister(BaseModel):
@@ -25,6 +29,24 @@ class UserOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class UserPage(BaseModel):
+    """使用者分頁（keyset 游標）"""
+    items: list[UserOut]
+    next_cursor: str | None = Field(
+        default=None,
+        description="下一頁游標；為 null 表示已無更多資料",
+    )
+
+
+class AdminUserQuery(BaseModel):
+    """管理員使用者列表查詢參數（GET /admin/users 的 query string）"""
+    cursor: str | None = Field(default=None, description="上一頁回傳的 next_cursor（需相同 sort）")
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    sort: Literal["id", "username"] = "id"
+    is_superuser: bool | None = None
+    q: str | None = Field(default=None, min_length=1, max_length=50, description="使用者名稱子字串")
+
+
 class AdminUserCreate(BaseModel):
     """管理員建立使用者"""
     username: str = Field(..., min_length=3, max_length=50, description="使用者名稱（3-50字）")
@@ -49,3 +71,12 @@ class TokenData(BaseModel):
     """JWT Token Payload（內部使用）"""
     user_id: int
     is_superuser: bool
+
+
+class Principal(BaseModel):
+    """已認證的使用者身分（不需 ORM User 的端點使用，可快取）"""
+    id: int
+    username: str
+    is_superuser: bool
+
+    model_config = {"from_attributes": True}
@@ -5,9 +5,31 @@
 from app.services.level_service import LevelService
 from app.services.publish_service import get_publish_strategy
 from app.services.moderation_service import ModerationService
+from app.services.level_query_service import LevelQueryService
+from app.services.user_query_service import UserQueryService
+from app.services.async_level_service import AsyncLevelService
+from app.services.async_moderation_service import AsyncModerationService
+from app.services.verification_service import VerificationService
+from app.services.evaluation_service import EvaluationService
+from app.services.difficulty_service import DifficultyService
+from app.services.progress_service import ProgressService
+from app.services.program_service import ProgramService
+from app.services.export_service import ExportService
+from app.services.stats_service import StatsService
 
 __all__ = [
     "LevelService",
     "get_publish_strategy",
     "ModerationService",
+    "LevelQueryService",
+    "UserQueryService",
+    "AsyncLevelService",
+    "AsyncModerationService",
+    "VerificationService",
+    "EvaluationService",
+    "DifficultyService",
+    "ProgressService",
+    "ProgramService",
+    "ExportService",
+    "StatsService",
 ]
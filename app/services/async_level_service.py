@@ -0,0 +1,99 @@
+"""關卡服務層（非同步版本）- CRUD 操作
+
+與 LevelService 行為一致，供 settings.db_async 模式下的路由使用。
+AsyncSession 不允許隱式 lazy load，因此回傳前會一併載入 author 關聯。
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from nanoid import generate
+
+from app.models.level import Level, LevelStatus
+from app.schemas.level import LevelCreate, LevelUpdate, AdminLevelUpdate
+from app.services.level_cache import level_list_cache, visible_list
+from app.services.level_service import LevelService
+
+
+async def refresh_level(db: AsyncSession, level: Level) -> Level:
+    """重新載入關卡欄位與 author 關聯（供 response schema 的 author_name 使用）"""
+    await db.refresh(level)
+    await db.refresh(level, attribute_names=["author"])
+    return level
+
+
+class AsyncLevelService:
+    """關卡業務邏輯服務（非同步）"""
+
+    @staticmethod
+    async def create_level(db: AsyncSession, author_id: int, data: LevelCreate) -> Level:
+        """建立新關卡
+
+        Args:
+            db: 非同步資料庫 session
+            author_id: 作者 ID
+            data: 關卡資料
+
+        Returns:
+            Level: 新建立的關卡（status=DRAFT）
+        """
+        level = Level(
+            id=generate(size=12),  # NanoID 12碼
+            author_id=author_id,
+            title=data.title,
+            status=LevelStatus.DRAFT,
+            is_official=False,
+            official_order=0,
+            config=data.config.model_dump(),
+            solution=None
+        )
+        level.set_map(data.map.model_dump())
+        db.add(level)
+        await db.commit()
+        return await refresh_level(db, level)
+
+    @staticmethod
+    async def update_level(db: AsyncSession, level: Level, data: LevelUpdate) -> Level:
+        """更新關卡（強制回到 DRAFT 狀態）
+
+        Args:
+            db: 非同步資料庫 session
+            level: 要更新的關卡
+            data: 更新資料
+
+        Returns:
+            Level: 更新後的關卡（status=DRAFT, solution=NULL）
+        """
+        before = visible_list(level)
+        LevelService.apply_update(level, data)
+        await db.commit()
+        level_list_cache.invalidate_for(before, level)
+        return await refresh_level(db, level)
+
+    @staticmethod
+    async def delete_level(db: AsyncSession, level: Level) -> None:
+        """刪除關卡
+
+        Args:
+            db: 非同步資料庫 session
+            level: 要刪除的關卡
+        """
+        before = visible_list(level)
+        await db.delete(level)
+        await db.commit()
+        level_list_cache.invalidate_for(before, None)
+
+    @staticmethod
+    async def admin_update_level(db: AsyncSession, level: Level, data: AdminLevelUpdate) -> Level:
+        """管理員更新關卡（可部分更新）
+
+        Args:
+            db: 非同步資料庫 session
+            level: 要更新的關卡
+            data: 更新資料
+
+        Returns:
+            Level: 更新後的關卡
+        """
+        before = visible_list(level)
+        LevelService.apply_admin_update(level, data)
+        await db.commit()
+        level_list_cache.invalidate_for(before, level)
+        return await refresh_level(db, level)
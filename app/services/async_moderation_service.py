@@ -0,0 +1,97 @@
+"""審核服務層（非同步版本）- 管理員審核操作"""
+from typing import Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.level import Level, LevelStatus
+from app.services.async_level_service import refresh_level
+from app.services.level_cache import level_list_cache, visible_list, OFFICIAL, COMMUNITY
+from app.services.level_query_service import LevelQueryService
+from app.services.moderation_service import ModerationService
+
+
+class AsyncModerationService:
+    """審核業務邏輯服務（非同步）"""
+
+    @staticmethod
+    async def approve_level(
+        db: AsyncSession,
+        level: Level,
+        as_official: bool = False,
+        official_order: Optional[int] = None
+    ) -> Level:
+        """審核通過
+
+        Args:
+            db: 非同步資料庫 session
+            level: 待審核的關卡
+            as_official: 是否設為官方關卡
+            official_order: 官方關卡序號（可選）
+
+        Returns:
+            Level: 審核通過的關卡（status=PUBLISHED）
+
+        Raises:
+            HTTPException 409: 關卡狀態不是 PENDING
+        """
+        if level.status != LevelStatus.PENDING:
+            await db.rollback()
+            raise ModerationService.not_pending_error("審核", level)
+
+        if as_official and official_order is None:
+            official_order = (await db.execute(LevelQueryService.next_official_order())).scalar_one()
+        before = visible_list(level)
+        ModerationService.apply_approval(level, as_official, official_order)
+
+        await db.commit()
+        level_list_cache.invalidate_for(before, level)
+        return await refresh_level(db, level)
+
+    @staticmethod
+    async def reject_level(db: AsyncSession, level: Level, reason: str) -> Level:
+        """駁回關卡
+
+        Args:
+            db: 非同步資料庫 session
+            level: 待審核的關卡
+            reason: 駁回理由
+
+        Returns:
+            Level: 駁回的關卡（status=REJECTED）
+
+        Raises:
+            HTTPException 409: 關卡狀態不是 PENDING
+        """
+        if level.status != LevelStatus.PENDING:
+            await db.rollback()
+            raise ModerationService.not_pending_error("駁回", level)
+
+        before = visible_list(level)
+        ModerationService.apply_rejection(level, reason)
+
+        await db.commit()
+        level_list_cache.invalidate_for(before, level)
+        return await refresh_level(db, level)
+
+    @staticmethod
+    async def bulk_approve(db: AsyncSession, level_ids: Sequence[str], as_official: bool = False) -> dict:
+        """ModerationService.bulk_approve 的非同步版本"""
+        level_ids = list(dict.fromkeys(level_ids))
+        updated = (await db.execute(ModerationService.bulk_approve_statement(level_ids, as_official))).all()
+        await db.commit()
+        if updated:
+            level_list_cache.invalidate(OFFICIAL if as_official else COMMUNITY)
+
+        skipped = ModerationService.skipped_ids(level_ids, updated)
+        current = (await db.execute(ModerationService.status_query(skipped))).all() if skipped else []
+        return ModerationService.bulk_result(level_ids, "approved", updated, current)
+
+    @staticmethod
+    async def bulk_reject(db: AsyncSession, level_ids: Sequence[str], reason: str) -> dict:
+        """ModerationService.bulk_reject 的非同步版本"""
+        level_ids = list(dict.fromkeys(level_ids))
+        updated = (await db.execute(ModerationService.bulk_reject_statement(level_ids, reason))).all()
+        await db.commit()
+
+        skipped = ModerationService.skipped_ids(level_ids, updated)
+        current = (await db.execute(ModerationService.status_query(skipped))).all() if skipped else []
+        return ModerationService.bulk_result(level_ids, "rejected", updated, current)
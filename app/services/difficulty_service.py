@@ -0,0 +1,107 @@
+"""難度估計服務 - 發布後在背景搜尋最短解
+
+搜尋在共用程序池中執行（CPU 密集，不佔用 threadpool 的 GIL），
+背景工作以 async 等待結果，不會為了等待搜尋佔住 threadpool 的執行緒。
+結果寫入 metadata.difficulty：
+
+    {status, shortest_length, shortest_steps, program, nodes, elapsed, level_updated_at}
+
+寫入時不更新 updated_at（不影響 ETag），且只在關卡自搜尋開始後未被修改時寫入。
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, func, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.config import settings
+from app.core.workers import get_process_pool
+from app.database import SessionLocal
+from app.engine import BoardError
+from app.engine.solver import solve_map
+from app.models.level import Level
+
+# 等待程序池排隊的寬限時間（秒），超過即放棄本次估計
+QUEUE_GRACE_SECONDS = 30.0
+
+
+class DifficultyService:
+    """最短解搜尋與難度寫入"""
+
+    @staticmethod
+    async def solve(map_data: dict[str, Any], config: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """在程序池中搜尋最短解
+
+        Args:
+            map_data: 正規化後的地圖
+            config: 關卡 config
+
+        Returns:
+            dict | None: solve_map 的結果；排隊逾時或地圖無法建立棋盤時回傳 None
+        """
+        budget = settings.solver_time_budget
+        future = get_process_pool().submit(solve_map, map_data, config, budget)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=budget + QUEUE_GRACE_SECONDS
+            )
+        except asyncio.TimeoutError:
+            future.cancel()
+            return None
+        except BoardError:
+            return None
+
+    @staticmethod
+    def store(level_id: str, updated_at: datetime, difficulty: dict[str, Any]) -> bool:
+        """寫入 metadata.difficulty
+
+        Args:
+            level_id: 關卡 ID
+            updated_at: 搜尋時的關卡版本；之後被修改過則不寫入
+            difficulty: 搜尋結果
+
+        Returns:
+            bool: 是否寫入
+        """
+        levels = Level.__table__
+        stmt = (
+            update(levels)
+            .where(levels.c.id == level_id, levels.c.updated_at == updated_at)
+            .values(
+                metadata=func.coalesce(levels.c.metadata, text("'{}'::jsonb"))
+                .op("||")(bindparam("difficulty", type_=JSONB)),
+                updated_at=levels.c.updated_at,
+            )
+        )
+        payload = {**difficulty, "level_updated_at": updated_at.isoformat()}
+        with SessionLocal() as db:
+            result = db.execute(stmt, {"difficulty": {"difficulty": payload}})
+            db.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    def load(level_id: str) -> Optional[Any]:
+        """讀取搜尋需要的欄位（map_data, config, updated_at）"""
+        with SessionLocal() as db:
+            return db.execute(
+                select(Level.map_data, Level.config, Level.updated_at).where(Level.id == level_id)
+            ).first()
+
+    @staticmethod
+    async def estimate(level_id: str) -> None:
+        """背景工作：讀取關卡、搜尋最短解並寫回（由 BackgroundTasks 在回應送出後執行）
+
+        資料庫讀寫在 threadpool 執行，等待搜尋時不佔用任何執行緒。
+
+        Args:
+            level_id: 剛發布的關卡 ID
+        """
+        row = await run_in_threadpool(DifficultyService.load, level_id)
+        if row is None:
+            return
+
+        difficulty = await DifficultyService.solve(row.map_data, row.config)
+        if difficulty is not None:
+            await run_in_threadpool(DifficultyService.store, level_id, row.updated_at, difficulty)
@@ -0,0 +1,131 @@
+"""批次評估服務 - 同一關卡的多個程式一起執行
+
+小批次直接在目前程序執行（非同步版本送到執行緒）；大批次切塊送進程序池，吞吐量隨核心數擴展。
+"""
+import asyncio
+import math
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, select
+
+from app.config import settings
+from app.core.workers import get_process_pool, worker_count
+from app.engine import COMMAND_KEYS, BoardError
+from app.engine.batch import evaluate_programs
+from app.models.level import Level
+from app.models.program import LevelProgram
+from app.models.user import User
+from app.schemas.admin import LevelEvaluationRequest
+
+# 少於此數量時直接執行（程序間傳輸地圖的成本高於執行本身）
+PARALLEL_THRESHOLD = 64
+MIN_CHUNK_SIZE = 32
+
+
+class EvaluationService:
+    """批次評估"""
+
+    @staticmethod
+    def saved_programs(level_id: str) -> Select:
+        """此關卡所有已儲存程式（含使用者名稱）"""
+        return (
+            select(LevelProgram.user_id, User.username, LevelProgram.commands)
+            .join(User, User.id == LevelProgram.user_id)
+            .where(LevelProgram.level_id == level_id)
+            .order_by(LevelProgram.user_id)
+        )
+
+    @staticmethod
+    def from_request(data: LevelEvaluationRequest) -> tuple[list[dict], list[dict]]:
+        """請求中的程式 → (結果標籤, 指令)"""
+        entries = [{"key": p.key} for p in data.programs]
+        programs = [p.model_dump(include=set(COMMAND_KEYS)) for p in data.programs]
+        return entries, programs
+
+    @staticmethod
+    def from_saved(rows: list[Any]) -> tuple[list[dict], list[dict]]:
+        """level_programs 查詢結果 → (結果標籤, 指令)"""
+        entries = [{"user_id": row.user_id, "username": row.username} for row in rows]
+        programs = [row.commands for row in rows]
+        return entries, programs
+
+    @staticmethod
+    def _chunks(programs: list[dict]) -> list[list[dict]]:
+        """切塊：每個 worker 約兩塊，兼顧負載平衡與傳輸次數"""
+        size = max(MIN_CHUNK_SIZE, math.ceil(len(programs) / (worker_count() * 2)))
+        return [programs[i:i + size] for i in range(0, len(programs), size)]
+
+    @staticmethod
+    def _board_error(e: BoardError) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"關卡地圖無法執行: {e}",
+        )
+
+    @staticmethod
+    def evaluate(level: Level, programs: list[dict], max_steps: Optional[int] = None) -> list[dict]:
+        """執行所有程式
+
+        Args:
+            level: 關卡（需已載入 map_data/config）
+            programs: {commands_f0, commands_f1, commands_f2} 列表
+            max_steps: 每個程式的步數上限（預設 settings.engine_max_steps）
+
+        Returns:
+            list[dict]: 與 programs 對應的執行結果
+
+        Raises:
+            HTTPException 422: 關卡地圖無法建立棋盤
+        """
+        max_steps = max_steps or settings.engine_max_steps
+        try:
+            if len(programs) < PARALLEL_THRESHOLD:
+                return evaluate_programs(level.map_data, level.config, programs, max_steps)
+            pool = get_process_pool()
+            futures = [
+                pool.submit(evaluate_programs, level.map_data, level.config, chunk, max_steps)
+                for chunk in EvaluationService._chunks(programs)
+            ]
+            return [result for future in futures for result in future.result()]
+        except BoardError as e:
+            raise EvaluationService._board_error(e)
+
+    @staticmethod
+    async def evaluate_async(
+        level: Level, programs: list[dict], max_steps: Optional[int] = None
+    ) -> list[dict]:
+        """evaluate 的非同步版本（執行程式時不佔用 event loop）
+
+        小批次在執行緒中執行：即使數量少，步數上限高時仍可能執行數秒。
+        """
+        max_steps = max_steps or settings.engine_max_steps
+        try:
+            if len(programs) < PARALLEL_THRESHOLD:
+                return await asyncio.to_thread(
+                    evaluate_programs, level.map_data, level.config, programs, max_steps
+                )
+            pool = get_process_pool()
+            chunks = await asyncio.gather(*[
+                asyncio.wrap_future(
+                    pool.submit(evaluate_programs, level.map_data, level.config, chunk, max_steps)
+                )
+                for chunk in EvaluationService._chunks(programs)
+            ])
+            return [result for chunk in chunks for result in chunk]
+        except BoardError as e:
+            raise EvaluationService._board_error(e)
+
+    @staticmethod
+    def build_report(level_id: str, entries: list[dict], results: list[dict]) -> dict:
+        """合併標籤與執行結果"""
+        rows = [
+            {**entry, **result, "solved": result["outcome"] == "solved"}
+            for entry, result in zip(entries, results)
+        ]
+        return {
+            "level_id": level_id,
+            "total": len(rows),
+            "solved": sum(row["solved"] for row in rows),
+            "results": rows,
+        }
@@ -0,0 +1,47 @@
+"""匯出服務 - 以 NDJSON 串流大量列表
+
+StreamingResponse 在端點回傳後才開始迭代，此時請求的 db 依賴可能已關閉，
+因此產生器自行開啟 session，並以 server-side cursor（yield_per）分批讀取，
+記憶體用量與總筆數無關。
+"""
+from typing import Iterator
+
+from pydantic import BaseModel
+from sqlalchemy import Select
+
+from app.database import SessionLocal
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportService:
+    """NDJSON 匯出"""
+
+    @staticmethod
+    def ndjson(stmt: Select, schema: type[BaseModel]) -> Iterator[bytes]:
+        """逐列輸出 JSON（每行一筆）
+
+        同步產生器：Starlette 會在 threadpool 中迭代，同步與非同步路由皆可使用。
+
+        Args:
+            stmt: 投影查詢（不分頁）
+            schema: 每列的輸出 schema（from_attributes）
+
+        Yields:
+            bytes: 一行 JSON（含換行）
+        """
+        with SessionLocal() as db:
+            result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            for partition in result.partitions():
+                yield b"".join(
+                    schema.model_validate(row).model_dump_json().encode() + b"\n"
+                    for row in partition
+                )
+
+    @staticmethod
+    def wants_ndjson(format: str | None, accept: str | None) -> bool:
+        """判斷是否改用 NDJSON 串流；明確的 format 優先於 Accept"""
+        if format is not None:
+            return format == "ndjson"
+        return bool(accept) and NDJSON_MEDIA_TYPE in accept
@@ -0,0 +1,114 @@
+"""已發布關卡列表快取
+
+官方/社群列表讀多寫少，分頁結果以 (列表, 版本號, cursor, limit) 為 key 快取。
+失效採版本號：改變列表可見內容的寫入路徑呼叫 invalidate_for，遞增受影響列表的
+版本號，舊 key 不再被命中，之後由 TTL/LRU 自然淘汰。
+
+只有「寫入前或寫入後為已發布」的關卡會影響列表，其餘寫入（草稿、送審、駁回）
+不會觸發失效。
+
+讀取端先以 page_version 取得版本號，查詢與寫入快取都使用同一個版本：
+查詢期間若有寫入遞增版本，舊資料只會寫到已失效的舊 key，不會被新版本命中。
+
+快取內容為 {"etag", "page"}：ETag 於寫入快取時由分頁內容計算一次，
+If-None-Match 命中時可直接回 304，不必再序列化分頁。
+"""
+import json
+from typing import Optional
+
+from app.core.cache import CacheBackend, build_cache
+from app.core.etag import make_etag
+from app.models.level import Level, LevelStatus
+from app.schemas.level import LevelListPage
+
+OFFICIAL = "official"
+COMMUNITY = "community"
+
+
+def visible_list(level: Level) -> Optional[str]:
+    """關卡目前出現在哪個公開列表（未發布回傳 None）
+
+    寫入路徑應在修改前後各呼叫一次，把結果交給 invalidate_for。
+    """
+    if level.status != LevelStatus.PUBLISHED:
+        return None
+    return OFFICIAL if level.is_official else COMMUNITY
+
+
+class LevelListCache:
+    """官方/社群列表分頁快取
+
+    Args:
+        backend: 快取後端，None 表示停用（get 永遠 miss，invalidate 無作用）
+    """
+
+    def __init__(self, backend: Optional[CacheBackend]):
+        self.backend = backend
+
+    def _version(self, list_name: str) -> int:
+        return self.backend.get(f"levels:{list_name}:version") or 0
+
+    @staticmethod
+    def _key(list_name: str, version: int, cursor: Optional[str], limit: int) -> str:
+        return f"levels:{list_name}:v{version}:{cursor or ''}:{limit}"
+
+    def page_version(self, list_name: str) -> int:
+        """目前的列表版本號（查詢資料庫前取得，傳給 get_page / set_page）"""
+        return 0 if self.backend is None else self._version(list_name)
+
+    def get_page(self, list_name: str, version: int, cursor: Optional[str], limit: int) -> Optional[dict]:
+        """取得快取的分頁
+
+        Args:
+            list_name: OFFICIAL 或 COMMUNITY
+            version: page_version 取得的版本號
+            cursor: 請求的游標
+            limit: 每頁筆數
+
+        Returns:
+            dict | None: {"etag": str, "page": JSON 形式的 LevelListPage}
+        """
+        if self.backend is None:
+            return None
+        return self.backend.get(self._key(list_name, version, cursor, limit))
+
+    def set_page(self, list_name: str, version: int, cursor: Optional[str], limit: int, page: dict) -> dict:
+        """寫入分頁
+
+        Args:
+            list_name: OFFICIAL 或 COMMUNITY
+            version: 查詢前由 page_version 取得的版本號（不可在寫入時重新讀取）
+            cursor: 請求的游標
+            limit: 每頁筆數
+            page: LevelQueryService.build_page 的結果
+
+        Returns:
+            dict: {"etag", "page"}（與快取內容一致）
+        """
+        data = LevelListPage.model_validate(page).model_dump(mode="json")
+        entry = {
+            "etag": make_etag(list_name, json.dumps(data, sort_keys=True, separators=(",", ":"))),
+            "page": data,
+        }
+        if self.backend is not None:
+            self.backend.set(self._key(list_name, version, cursor, limit), entry)
+        return entry
+
+    def invalidate(self, *list_names: Optional[str]) -> None:
+        """使指定列表的所有快取分頁失效（None 會被忽略）"""
+        if self.backend is None:
+            return
+        for list_name in {name for name in list_names if name}:
+            self.backend.incr(f"levels:{list_name}:version")
+
+    def invalidate_for(self, before: Optional[str], level: Optional[Level]) -> None:
+        """依關卡寫入前後的可見列表精準失效
+
+        Args:
+            before: 寫入前的 visible_list(level)
+            level: 寫入後的關卡（刪除時傳 None）
+        """
+        self.invalidate(before, visible_list(level) if level is not None else None)
+
+
+level_list_cache = LevelListCache(build_cache())
@@ -0,0 +1,321 @@
+"""關卡列表查詢層 - 投影查詢
+
+列表端點只需要少數欄位，若載入完整 ORM 物件會連帶讀出 map_data/config/
+solution/metadata 等 JSONB 欄位，以及 joinedload 整列 User（含 hashed_password），
+再全部丟掉。這裡改用 select() 只投影列表欄位 + users.username。
+
+回傳的 Row 具備屬性存取，可直接交給 from_attributes 的 Pydantic schema。
+查詢函數只建立 statement 不執行，同步與非同步 session 皆可共用。
+"""
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence
+
+from sqlalchemy import Integer, Select, String, bindparam, cast, func, literal, or_, and_, select, tuple_, union
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import defer, undefer
+
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.search import contains_pattern
+from app.models.level import Level, LevelStatus
+from app.models.stats import LevelStats
+from app.models.user import User
+
+# 列表欄位：涵蓋 LevelListItem 與 AdminLevelListItem
+# completions 來自 level_stats（觸發器維護），以主鍵 LEFT JOIN 取得，不需逐列子查詢
+LIST_COLUMNS = (
+    Level.id,
+    Level.title,
+    Level.author_id,
+    User.username.label("author_name"),
+    Level.status,
+    Level.is_official,
+    Level.official_order,
+    Level.created_at,
+    Level.updated_at,
+    func.coalesce(LevelStats.completions, 0).label("completions"),
+)
+
+# 條件式 GET（帶 If-None-Match）：先載入不含 JSONB 的欄位，確認需要回傳內容時才補載
+DEFERRED_PAYLOAD = (
+    defer(Level.map_data),
+    defer(Level.config),
+    defer(Level.solution),
+    defer(Level.metadata_),
+)
+
+
+def payload_attributes(packed: bool) -> list[str]:
+    """回應需要的內容欄位（packed 用 map_packed，否則 map_data）"""
+    return ["map_packed" if packed else "map_data", "config"]
+
+
+def detail_options(packed: bool) -> tuple:
+    """非條件式 GET：一次載入回應需要的欄位，不必再補載
+
+    Args:
+        packed: 回傳 packed 地圖（載入 map_packed 而非 map_data）
+    """
+    if packed:
+        return (
+            defer(Level.map_data),
+            undefer(Level.map_packed),
+            defer(Level.solution),
+            defer(Level.metadata_),
+        )
+    return (defer(Level.solution), defer(Level.metadata_))
+
+# 搜尋分數放大為整數，游標比較不受浮點誤差影響
+SEARCH_RANK_SCALE = 1_000_000
+
+# 管理員列表排序：名稱 → (排序欄, 遞減?, 游標鍵型別)
+ADMIN_LEVEL_SORTS = {
+    "updated": (Level.updated_at, True, datetime),
+    "created": (Level.created_at, True, datetime),
+    "title": (Level.title, False, str),
+}
+
+
+def _status_literal(value: LevelStatus):
+    """以字面值渲染狀態條件
+
+    部分索引的 WHERE 條件是常數，若以參數綁定，psycopg 預備語句改用
+    generic plan 後 planner 無法證明條件成立，便不會選用部分索引。
+    """
+    return bindparam(None, value, type_=Level.__table__.c.status.type, literal_execute=True)
+
+
+class LevelQueryService:
+    """列表查詢 statement 建構"""
+
+    @staticmethod
+    def base_list_query() -> Select:
+        """列表投影基礎查詢（levels LEFT JOIN users LEFT JOIN level_stats）"""
+        return (
+            select(*LIST_COLUMNS)
+            .outerjoin(User, User.id == Level.author_id)
+            .outerjoin(LevelStats, LevelStats.level_id == Level.id)
+        )
+
+    @staticmethod
+    def official_page(cursor: str | None, limit: int) -> Select:
+        """官方關卡分頁，鍵為 (official_order, id) 正序
+
+        Args:
+            cursor: 上一頁游標
+            limit: 每頁筆數（會多取一筆用於判斷下一頁）
+        """
+        stmt = LevelQueryService.base_list_query().where(
+            Level.is_official == True,
+            Level.status == _status_literal(LevelStatus.PUBLISHED),
+        )
+        if cursor:
+            order, level_id = decode_cursor(cursor, int, str)
+            stmt = stmt.where(tuple_(Level.official_order, Level.id) > (order, level_id))
+        return stmt.order_by(Level.official_order, Level.id).limit(limit + 1)
+
+    @staticmethod
+    def community_page(cursor: str | None, limit: int) -> Select:
+        """社群關卡分頁，鍵為 (created_at, id) 倒序
+
+        Args:
+            cursor: 上一頁游標
+            limit: 每頁筆數（會多取一筆用於判斷下一頁）
+        """
+        stmt = LevelQueryService.base_list_query().where(
+            Level.is_official == False,
+            Level.status == _status_literal(LevelStatus.PUBLISHED),
+        )
+        if cursor:
+            created_at, level_id = decode_cursor(cursor, datetime, str)
+            stmt = stmt.where(tuple_(Level.created_at, Level.id) < (created_at, level_id))
+        return stmt.order_by(Level.created_at.desc(), Level.id.desc()).limit(limit + 1)
+
+    @staticmethod
+    def search_page(q: str, cursor: str | None, limit: int) -> Select:
+        """已發布關卡搜尋（標題或作者名稱），依相似度排序，鍵為 (rank, id)
+
+        候選集合分兩段取得再 UNION，兩段各自使用 pg_trgm GIN 索引
+        （ix_levels_title_trgm、ix_users_username_trgm）；若寫成 title OR username
+        的單一條件，planner 無法同時用兩張表的索引。匹配使用 word_similarity
+        運算子 `q <% 欄位`（門檻為 pg_trgm.word_similarity_threshold，預設 0.6），
+        標題中的單字近似即可命中，容許拼字差異。
+
+        Args:
+            q: 搜尋字串
+            cursor: 上一頁游標
+            limit: 每頁筆數（會多取一筆用於判斷下一頁）
+        """
+        term = literal(q, String)
+        published = _status_literal(LevelStatus.PUBLISHED)
+        by_title = select(Level.id).where(Level.status == published, term.op("<%")(Level.title))
+        by_author = (
+            select(Level.id)
+            .join(User, User.id == Level.author_id)
+            .where(Level.status == published, term.op("<%")(User.username))
+        )
+        candidates = union(by_title, by_author).subquery("candidates")
+
+        rank = cast(
+            func.greatest(
+                func.word_similarity(term, Level.title),
+                func.coalesce(func.word_similarity(term, User.username), 0),
+            ) * SEARCH_RANK_SCALE,
+            Integer,
+        ).label("rank")
+        ranked = (
+            LevelQueryService.base_list_query()
+            .add_columns(rank)
+            .join(candidates, candidates.c.id == Level.id)
+            .subquery("ranked")
+        )
+
+        stmt = select(ranked)
+        if cursor:
+            last_rank, level_id = decode_cursor(cursor, int, str)
+            stmt = stmt.where(or_(
+                ranked.c.rank < last_rank,
+                and_(ranked.c.rank == last_rank, ranked.c.id > level_id),
+            ))
+        return stmt.order_by(ranked.c.rank.desc(), ranked.c.id).limit(limit + 1)
+
+    @staticmethod
+    def author_levels(author_id: int) -> Select:
+        """作者自己的關卡（含所有狀態），按更新時間倒序"""
+        return (
+            LevelQueryService.base_list_query()
+            .where(Level.author_id == author_id)
+            .order_by(Level.updated_at.desc())
+        )
+
+    @staticmethod
+    def pending_levels(sort: str = "updated") -> Select:
+        """待審核關卡
+
+        Args:
+            sort: updated = 更新時間倒序；difficulty = 最短解由短到長
+                （同長度再比步數，尚未估計或搜尋不到解的排最後）
+        """
+        difficulty = Level.metadata_["difficulty"]
+        shortest_length = difficulty["shortest_length"].as_integer()
+        shortest_steps = difficulty["shortest_steps"].as_integer()
+        stmt = (
+            LevelQueryService.base_list_query()
+            .add_columns(
+                shortest_length.label("shortest_length"),
+                shortest_steps.label("shortest_steps"),
+            )
+            .where(Level.status == _status_literal(LevelStatus.PENDING))
+        )
+        if sort == "difficulty":
+            return stmt.order_by(
+                shortest_length.asc().nulls_last(),
+                shortest_steps.asc().nulls_last(),
+                Level.updated_at.desc(),
+            )
+        return stmt.order_by(Level.updated_at.desc())
+
+    @staticmethod
+    def admin_levels(
+        status: Optional[str] = None,
+        is_official: Optional[bool] = None,
+        author_id: Optional[int] = None,
+        updated_from: Optional[datetime] = None,
+        updated_to: Optional[datetime] = None,
+        q: Optional[str] = None,
+        sort: str = "updated",
+    ) -> Select:
+        """管理員關卡列表（篩選 + 排序，不分頁；NDJSON 匯出直接使用）
+
+        Args:
+            status: 狀態值（draft / pending / published / rejected）
+            is_official: 是否官方
+            author_id: 作者 ID
+            updated_from: 更新時間下限（含）
+            updated_to: 更新時間上限（不含）
+            q: 標題子字串（pg_trgm 索引）
+            sort: updated / created = 時間倒序；title = 標題正序（同值以 id 決定順序）
+        """
+        stmt = LevelQueryService.base_list_query()
+        if status is not None:
+            stmt = stmt.where(Level.status == _status_literal(LevelStatus(status)))
+        if is_official is not None:
+            stmt = stmt.where(Level.is_official == is_official)
+        if author_id is not None:
+            stmt = stmt.where(Level.author_id == author_id)
+        if updated_from is not None:
+            stmt = stmt.where(Level.updated_at >= updated_from)
+        if updated_to is not None:
+            stmt = stmt.where(Level.updated_at < updated_to)
+        if q:
+            stmt = stmt.where(Level.title.ilike(contains_pattern(q)))
+
+        key, descending, _ = ADMIN_LEVEL_SORTS[sort]
+        if descending:
+            return stmt.order_by(key.desc(), Level.id.desc())
+        return stmt.order_by(key, Level.id)
+
+    @staticmethod
+    def admin_levels_page(cursor: str | None, limit: int, sort: str = "updated", **filters: Any) -> Select:
+        """管理員關卡分頁，鍵為 (排序欄, id)
+
+        Args:
+            cursor: 上一頁游標（需與 sort 相同）
+            limit: 每頁筆數（會多取一筆用於判斷下一頁）
+            sort: 見 admin_levels
+            filters: 見 admin_levels
+        """
+        stmt = LevelQueryService.admin_levels(sort=sort, **filters)
+        if cursor:
+            key, descending, key_type = ADMIN_LEVEL_SORTS[sort]
+            value, level_id = decode_cursor(cursor, key_type, str)
+            after = tuple_(key, Level.id)
+            stmt = stmt.where(after < (value, level_id) if descending else after > (value, level_id))
+        return stmt.limit(limit + 1)
+
+    @staticmethod
+    def admin_cursor_key(sort: str) -> Callable[[Row], tuple[Any, ...]]:
+        """管理員列表游標鍵"""
+        name = ADMIN_LEVEL_SORTS[sort][0].key
+        return lambda row: (getattr(row, name), row.id)
+
+    @staticmethod
+    def next_official_order() -> Select:
+        """下一個可用的官方關卡序號（目前最大值 + 1，無資料時為 1）"""
+        return select(func.coalesce(func.max(Level.official_order), 0) + 1)
+
+    @staticmethod
+    def build_page(
+        rows: Sequence[Row],
+        limit: int,
+        cursor_key: Callable[[Row], tuple[Any, ...]],
+    ) -> dict:
+        """將多取一筆的查詢結果組成分頁
+
+        Args:
+            rows: 查詢結果（最多 limit + 1 筆）
+            limit: 每頁筆數
+            cursor_key: 從最後一筆取出游標鍵
+
+        Returns:
+            dict: {items, next_cursor}，可直接交給 LevelListPage
+        """
+        items = list(rows[:limit])
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(*cursor_key(items[-1]))
+        return {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    def official_cursor_key(row: Row) -> tuple[Any, ...]:
+        """官方列表游標鍵"""
+        return (row.official_order, row.id)
+
+    @staticmethod
+    def community_cursor_key(row: Row) -> tuple[Any, ...]:
+        """社群列表游標鍵"""
+        return (row.created_at, row.id)
+
+    @staticmethod
+    def search_cursor_key(row: Row) -> tuple[Any, ...]:
+        """搜尋結果游標鍵"""
+        return (row.rank, row.id)
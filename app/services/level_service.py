@@ -4,6 +4,7 @@ from nanoid import generate
 
 from app.models.level import Level, LevelStatus
 from app.schemas.level import LevelCreate, LevelUpdate, AdminLevelUpdate
+from app.services.level_cache import level_list_cache, visible_list
 
 
 class LevelService:
@@ -28,10 +29,10 @@ class LevelService:
             status=LevelStatus.DRAFT,
             is_official=False,
             official_order=0,
-            map_data=data.map.model_dump(),
             config=data.config.model_dump(),
             solution=None
         )
+        level.set_map(data.map.model_dump())
         db.add(level)
         db.commit()
         db.refresh(level)
@@ -49,12 +50,10 @@ class LevelService:
         Returns:
             Level: 更新後的關卡（status=DRAFT, solution=NULL）
         """
-        level.title = data.title
-        level.map_data = data.map.model_dump()
-        level.config = data.config.model_dump()
-        level.status = LevelStatus.DRAFT
-        level.solution = None
+        before = visible_list(level)
+        LevelService.apply_update(level, data)
         db.commit()
+        level_list_cache.invalidate_for(before, level)
         db.refresh(level)
         return level
 
@@ -66,8 +65,10 @@ class LevelService:
             db: 資料庫 session
             level: 要刪除的關卡
         """
+        before = visible_list(level)
         db.delete(level)
         db.commit()
+        level_list_cache.invalidate_for(before, None)
 
     @staticmethod
     def admin_update_level(db: Session, level: Level, data: AdminLevelUpdate) -> Level:
@@ -81,12 +82,41 @@ class LevelService:
         Returns:
             Level: 更新後的關卡
         """
+        before = visible_list(level)
+        LevelService.apply_admin_update(level, data)
+        db.commit()
+        level_list_cache.invalidate_for(before, level)
+        db.refresh(level)
+        return level
+
+    @staticmethod
+    def apply_update(level: Level, data: LevelUpdate) -> None:
+        """套用一般更新（不 commit），同步/非同步服務共用
+
+        Args:
+            level: 要更新的關卡
+            data: 更新資料
+        """
+        level.title = data.title
+        level.set_map(data.map.model_dump())
+        level.config = data.config.model_dump()
+        level.status = LevelStatus.DRAFT
+        level.solution = None
+
+    @staticmethod
+    def apply_admin_update(level: Level, data: AdminLevelUpdate) -> None:
+        """套用管理員部分更新（不 commit），同步/非同步服務共用
+
+        Args:
+            level: 要更新的關卡
+            data: 更新資料
+        """
         updated_map = False
 
         if data.title is not None:
             level.title = data.title
         if data.map is not None:
-            level.map_data = data.map.model_dump()
+            level.set_map(data.map.model_dump())
             updated_map = True
         if data.config is not None:
             level.config = data.config.model_dump()
@@ -103,6 +133,3 @@ class LevelService:
             if data.status is None:
                 level.status = LevelStatus.DRAFT
 
-        db.commit()
-        db.refresh(level)
-        return level
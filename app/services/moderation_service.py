@@ -1,10 +1,20 @@
-"""審核服務層 - 管理員審核操作"""
-from typing import Optional
+"""審核服務層 - 管理員審核操作
+
+批次審核以單一 UPDATE ... FROM (VALUES ...) RETURNING 完成：PENDING 檢查在 WHERE 內
+（並行審核時由 PostgreSQL 重新檢查鎖定後的列），官方序號以 row_number() 接續
+目前最大值一次分配，不必逐筆查詢 MAX(official_order)。
+"""
+from typing import Optional, Sequence
 from datetime import datetime, UTC
+from sqlalchemy import Integer, String, Update, column, func, literal, select, update, values
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from app.models.level import Level, LevelStatus
+from app.services.level_cache import level_list_cache, visible_list, OFFICIAL, COMMUNITY
+from app.services.level_query_service import LevelQueryService
 
 
 class ModerationService:
@@ -33,24 +43,16 @@ class ModerationService:
         """
         if level.status != LevelStatus.PENDING:
             db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"只能審核 PENDING 狀態的關卡，當前: {level.status}",
-            )
+            raise ModerationService.not_pending_error("審核", level)
 
-        level.status = LevelStatus.PUBLISHED
-        level.is_official = as_official
-
-        if as_official:
-            # 處理官方關卡序號
-            if official_order is not None:
-                level.official_order = official_order
-            else:
-                # 自動分配下一個序號
-                max_order_result = db.query(Level.official_order).order_by(Level.official_order.desc()).first()
-                level.official_order = (max_order_result[0] + 1) if max_order_result else 1
+        if as_official and official_order is None:
+            # 自動分配下一個序號
+            official_order = db.execute(LevelQueryService.next_official_order()).scalar_one()
+        before = visible_list(level)
+        ModerationService.apply_approval(level, as_official, official_order)
 
         db.commit()
+        level_list_cache.invalidate_for(before, level)
         db.refresh(level)
         return level
 
@@ -71,17 +73,206 @@ class ModerationService:
         """
         if level.status != LevelStatus.PENDING:
             db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"只能駁回 PENDING 狀態的關卡，當前: {level.status}",
-            )
+            raise ModerationService.not_pending_error("駁回", level)
+
+        before = visible_list(level)
+        ModerationService.apply_rejection(level, reason)
+
+        db.commit()
+        level_list_cache.invalidate_for(before, level)
+        db.refresh(level)
+        return level
+
+    @staticmethod
+    def not_pending_error(action: str, level: Level) -> HTTPException:
+        """非 PENDING 狀態的 409 錯誤"""
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"只能{action} PENDING 狀態的關卡，當前: {level.status}",
+        )
+
+    @staticmethod
+    def apply_approval(level: Level, as_official: bool, official_order: Optional[int]) -> None:
+        """套用審核通過（不 commit），同步/非同步服務共用
+
+        Args:
+            level: 待審核的關卡
+            as_official: 是否設為官方關卡
+            official_order: 官方關卡序號（as_official 時必須已決定）
+        """
+        level.status = LevelStatus.PUBLISHED
+        level.is_official = as_official
+        if as_official:
+            level.official_order = official_order
+
+    @staticmethod
+    def apply_rejection(level: Level, reason: str) -> None:
+        """套用駁回（不 commit），同步/非同步服務共用
 
+        Args:
+            level: 待審核的關卡
+            reason: 駁回理由
+        """
         level.status = LevelStatus.REJECTED
+        # 與 bulk_reject_statement 相同：合併進既有 metadata（保留 difficulty 等欄位）
         level.metadata_ = {
+            **(level.metadata_ or {}),
             "rejection_reason": reason,
             "rejected_at": datetime.now(UTC).isoformat()
         }
 
+    @staticmethod
+    def bulk_approve(db: Session, level_ids: Sequence[str], as_official: bool = False) -> dict:
+        """批次審核通過（單一 UPDATE）
+
+        Args:
+            db: 資料庫 session
+            level_ids: 關卡 ID（重複者只處理一次）
+            as_official: 是否設為官方關卡
+
+        Returns:
+            dict: LevelBulkResult 結構，每個 ID 一筆結果
+        """
+        level_ids = list(dict.fromkeys(level_ids))
+        updated = db.execute(ModerationService.bulk_approve_statement(level_ids, as_official)).all()
         db.commit()
-        db.refresh(level)
-        return level
+        if updated:
+            level_list_cache.invalidate(OFFICIAL if as_official else COMMUNITY)
+
+        skipped = ModerationService.skipped_ids(level_ids, updated)
+        current = db.execute(ModerationService.status_query(skipped)).all() if skipped else []
+        return ModerationService.bulk_result(level_ids, "approved", updated, current)
+
+    @staticmethod
+    def bulk_reject(db: Session, level_ids: Sequence[str], reason: str) -> dict:
+        """批次駁回（單一 UPDATE）
+
+        Args:
+            db: 資料庫 session
+            level_ids: 關卡 ID（重複者只處理一次）
+            reason: 駁回理由
+
+        Returns:
+            dict: LevelBulkResult 結構，每個 ID 一筆結果
+        """
+        level_ids = list(dict.fromkeys(level_ids))
+        updated = db.execute(ModerationService.bulk_reject_statement(level_ids, reason)).all()
+        db.commit()
+        # PENDING → REJECTED 前後都不在公開列表，不需失效
+
+        skipped = ModerationService.skipped_ids(level_ids, updated)
+        current = db.execute(ModerationService.status_query(skipped)).all() if skipped else []
+        return ModerationService.bulk_result(level_ids, "rejected", updated, current)
+
+    @staticmethod
+    def bulk_approve_statement(level_ids: Sequence[str], as_official: bool) -> Update:
+        """批次審核通過 statement
+
+        官方序號依 level_ids 順序為 MAX(official_order) + 1, + 2, ...；
+        並行審核導致部分列被略過時序號可能不連續（與單筆審核相同，序號只用於排序）。
+
+        Args:
+            level_ids: 不重複的關卡 ID
+            as_official: 是否設為官方關卡
+
+        Returns:
+            Update: RETURNING id, status, official_order
+        """
+        incoming = values(
+            column("level_id", String),
+            column("ord", Integer),
+            name="incoming",
+        ).data([(level_id, index) for index, level_id in enumerate(level_ids)])
+        numbered = (
+            select(
+                incoming.c.level_id,
+                func.row_number().over(order_by=incoming.c.ord).label("rn"),
+            )
+            .select_from(incoming)
+            .join(Level, Level.id == incoming.c.level_id)
+            .where(Level.status == LevelStatus.PENDING)
+            .cte("numbered")
+        )
+
+        table = Level.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == numbered.c.level_id, table.c.status == LevelStatus.PENDING)
+            .values(status=LevelStatus.PUBLISHED, is_official=as_official)
+        )
+        if as_official:
+            base = select(
+                func.coalesce(func.max(table.c.official_order), 0).label("max_order")
+            ).cte("base")
+            stmt = stmt.values(official_order=base.c.max_order + numbered.c.rn)
+        return stmt.returning(table.c.id, table.c.status, table.c.official_order)
+
+    @staticmethod
+    def bulk_reject_statement(level_ids: Sequence[str], reason: str) -> Update:
+        """批次駁回 statement（駁回資訊併入既有 metadata，保留難度估計等欄位）
+
+        Args:
+            level_ids: 不重複的關卡 ID
+            reason: 駁回理由
+
+        Returns:
+            Update: RETURNING id, status, official_order
+        """
+        table = Level.__table__
+        rejection = {"rejection_reason": reason, "rejected_at": datetime.now(UTC).isoformat()}
+        return (
+            update(table)
+            .where(table.c.id.in_(level_ids), table.c.status == LevelStatus.PENDING)
+            .values(
+                status=LevelStatus.REJECTED,
+                metadata=func.coalesce(table.c.metadata, literal({}, JSONB)).op("||")(
+                    literal(rejection, JSONB)
+                ),
+            )
+            .returning(table.c.id, table.c.status, table.c.official_order)
+        )
+
+    @staticmethod
+    def skipped_ids(level_ids: Sequence[str], updated: Sequence[Row]) -> list[str]:
+        """未被更新的 ID（不存在或不是 PENDING）"""
+        done = {row.id for row in updated}
+        return [level_id for level_id in level_ids if level_id not in done]
+
+    @staticmethod
+    def status_query(level_ids: Sequence[str]):
+        """查詢目前狀態（用於區分 not_found 與 not_pending）"""
+        return select(Level.id, Level.status).where(Level.id.in_(level_ids))
+
+    @staticmethod
+    def bulk_result(
+        level_ids: Sequence[str], outcome: str, updated: Sequence[Row], current: Sequence[Row]
+    ) -> dict:
+        """組成 LevelBulkResult，順序同 level_ids
+
+        Args:
+            level_ids: 不重複的關卡 ID
+            outcome: 更新成功的結果名稱（approved / rejected）
+            updated: UPDATE RETURNING 的列
+            current: 未更新者的目前狀態
+        """
+        updated_by_id = {row.id: row for row in updated}
+        status_by_id = {row.id: row.status for row in current}
+        items = []
+        for level_id in level_ids:
+            row = updated_by_id.get(level_id)
+            if row is not None:
+                items.append({
+                    "level_id": level_id,
+                    "outcome": outcome,
+                    "status": row.status.value,
+                    "official_order": row.official_order if outcome == "approved" else None,
+                })
+            elif level_id in status_by_id:
+                items.append({
+                    "level_id": level_id,
+                    "outcome": "not_pending",
+                    "status": status_by_id[level_id].value,
+                })
+            else:
+                items.append({"level_id": level_id, "outcome": "not_found"})
+        return {"items": items}
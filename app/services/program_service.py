@@ -0,0 +1,59 @@
+"""程式儲存服務 - 以單一 INSERT ... ON CONFLICT 儲存使用者程式
+
+關卡存在檢查（INSERT ... SELECT FROM levels）、新增或覆寫、回傳結果都在同一個
+statement；同一使用者同時儲存同一關卡也不會撞上 uq_level_program_user_level。
+"""
+from typing import Any
+
+from sqlalchemy import Insert, Integer, func, literal, select
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.engine import Row
+
+from app.engine import COMMAND_KEYS
+from app.models.level import Level
+from app.models.program import LevelProgram
+
+
+class ProgramService:
+    """使用者程式寫入"""
+
+    @staticmethod
+    def upsert_statement(user_id: int, level_id: str, commands: dict[str, list[str]]) -> Insert:
+        """建立程式 upsert（關卡不存在時不插入、不回傳任何列）
+
+        Args:
+            user_id: 使用者 ID
+            level_id: 關卡 ID
+            commands: {commands_f0, commands_f1, commands_f2}
+
+        Returns:
+            Insert: RETURNING level_programs 各欄位的 statement
+        """
+        now = func.now()
+        source = select(
+            literal(user_id, Integer),
+            Level.id,
+            literal(commands, JSONB),
+            now,
+            now,
+        ).where(Level.id == level_id)
+
+        table = LevelProgram.__table__
+        stmt = insert(LevelProgram).from_select(
+            ["user_id", "level_id", "commands", "created_at", "updated_at"],
+            source,
+        )
+        return stmt.on_conflict_do_update(
+            constraint="uq_level_program_user_level",
+            set_={"commands": stmt.excluded.commands, "updated_at": now},
+        ).returning(*table.c)
+
+    @staticmethod
+    def as_out(row: Row) -> dict[str, Any]:
+        """RETURNING 結果轉為 LevelProgramOut 結構（commands 展開為 f0/f1/f2）"""
+        return {
+            "level_id": row.level_id,
+            **{key: list(row.commands.get(key, [])) for key in COMMAND_KEYS},
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+        }
@@ -0,0 +1,157 @@
+"""進度服務 - 以單一 INSERT ... ON CONFLICT 合併進度
+
+合併規則在 SQL 內完成，不必先讀出既有進度：
+
+    is_completed    = 舊值 OR 新值
+    best_steps      = LEAST(舊值, 新值)      （LEAST/GREATEST 忽略 NULL）
+    stars_collected = GREATEST(舊值, 新值)
+
+輸入以 VALUES 列表示並 JOIN levels，不存在的關卡不會被插入（也不會違反外鍵），
+由 RETURNING 的結果即可得知哪些關卡不存在。
+"""
+from typing import Iterable, Sequence
+
+from sqlalchemy import (
+    Boolean,
+    Insert,
+    Integer,
+    String,
+    and_,
+    cast,
+    column,
+    func,
+    literal,
+    select,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.level import Level
+from app.models.program import LevelProgram
+from app.models.progress import LevelProgress
+from app.schemas.progress import LevelProgressEntry
+from app.services.verification_service import VerificationService
+
+
+class ProgressService:
+    """進度寫入"""
+
+    @staticmethod
+    def merge_entries(entries: Iterable[LevelProgressEntry]) -> list[LevelProgressEntry]:
+        """合併同一關卡的多筆進度（同一 INSERT 不能更新同一列兩次）
+
+        Args:
+            entries: 客戶端回報的進度（可能重複）
+
+        Returns:
+            list[LevelProgressEntry]: 每個關卡一筆，保留首次出現的順序
+        """
+        merged: dict[str, LevelProgressEntry] = {}
+        for entry in entries:
+            current = merged.get(entry.level_id)
+            if current is None:
+                merged[entry.level_id] = entry.model_copy()
+                continue
+            current.is_completed = current.is_completed or entry.is_completed
+            if entry.best_steps is not None:
+                current.best_steps = (
+                    entry.best_steps
+                    if current.best_steps is None
+                    else min(current.best_steps, entry.best_steps)
+                )
+            if entry.stars_collected is not None:
+                current.stars_collected = (
+                    entry.stars_collected
+                    if current.stars_collected is None
+                    else max(current.stars_collected, entry.stars_collected)
+                )
+        return list(merged.values())
+
+    @staticmethod
+    def verified_entries(
+        db: Session, user_id: int, entries: Sequence[LevelProgressEntry]
+    ) -> list[LevelProgressEntry]:
+        """以使用者儲存的程式驗證每筆進度（settings.verify_progress）
+
+        關卡與程式以一次查詢載入；不存在的關卡原樣保留，由 upsert 略過。
+
+        Raises:
+            HTTPException 400: 回報了成績但尚未儲存程式，或程式無效
+        """
+        rows = db.execute(
+            select(Level.id, Level.updated_at, Level.map_data, Level.config, LevelProgram.commands)
+            .outerjoin(
+                LevelProgram,
+                and_(LevelProgram.level_id == Level.id, LevelProgram.user_id == user_id),
+            )
+            .where(Level.id.in_([entry.level_id for entry in entries]))
+        ).all()
+        levels = {row.id: row for row in rows}
+
+        verified = []
+        for entry in entries:
+            level = levels.get(entry.level_id)
+            if level is not None:
+                update = VerificationService.verified_progress(level, level.commands, entry)
+                entry = LevelProgressEntry(level_id=entry.level_id, **update.model_dump())
+            verified.append(entry)
+        return verified
+
+    @staticmethod
+    def upsert_statement(user_id: int, entries: Sequence[LevelProgressEntry]) -> Insert:
+        """建立多列 upsert（levels 存在檢查、合併、回傳皆在同一個 statement）
+
+        Args:
+            user_id: 使用者 ID
+            entries: 已合併（level_id 不重複）的進度
+
+        Returns:
+            Insert: RETURNING level_progress 各欄位的 statement
+        """
+        rows = values(
+            column("level_id", String),
+            column("is_completed", Boolean),
+            column("best_steps", Integer),
+            column("stars_collected", Integer),
+            name="incoming",
+        ).data([
+            (entry.level_id, entry.is_completed, entry.best_steps, entry.stars_collected)
+            for entry in entries
+        ])
+        now = func.now()
+        # 整欄皆為 NULL 時 VALUES 會推斷為 text，明確轉型
+        source = (
+            select(
+                literal(user_id, Integer),
+                rows.c.level_id,
+                rows.c.is_completed,
+                cast(rows.c.best_steps, Integer),
+                cast(rows.c.stars_collected, Integer),
+                now,
+                now,
+            )
+            .select_from(rows)
+            .join(Level, Level.id == rows.c.level_id)
+            # 固定寫入順序：level_stats 觸發器依列順序鎖定各關卡的統計列，
+            # 兩個批次包含重疊關卡時以相同順序取鎖，不會互相死結
+            .order_by(rows.c.level_id)
+        )
+
+        table = LevelProgress.__table__
+        stmt = insert(LevelProgress).from_select(
+            ["user_id", "level_id", "is_completed", "best_steps", "stars_collected",
+             "created_at", "updated_at"],
+            source,
+        )
+        return stmt.on_conflict_do_update(
+            constraint="uq_level_progress_user_level",
+            set_={
+                "is_completed": table.c.is_completed | stmt.excluded.is_completed,
+                "best_steps": func.least(table.c.best_steps, stmt.excluded.best_steps),
+                "stars_collected": func.greatest(
+                    table.c.stars_collected, stmt.excluded.stars_collected
+                ),
+                "updated_at": now,
+            },
+        ).returning(*table.c)
@@ -1,13 +1,18 @@
 """發布服務層 - 策略模式實現
 
 使用策略模式消除狀態機的 if/elif 分支，符合開放封閉原則。
+每個策略同時提供同步 execute 與非同步 execute_async（settings.db_async）。
 """
 from abc import ABC, abstractmethod
 from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.user import User
 from app.models.level import Level, LevelStatus
+from app.services.async_level_service import refresh_level
+from app.services.level_cache import level_list_cache, visible_list
+from app.services.level_query_service import LevelQueryService
 
 
 class PublishStrategy(ABC):
@@ -27,6 +32,20 @@ class PublishStrategy(ABC):
         """
         pass
 
+    @abstractmethod
+    async def execute_async(self, db: AsyncSession, level: Level, solution: dict) -> Level:
+        """執行發布策略（非同步）
+
+        Args:
+            db: 非同步資料庫 session
+            level: 要發布的關卡
+            solution: 解題資料
+
+        Returns:
+            Level: 發布後的關卡
+        """
+        pass
+
 
 class AdminOfficialPublish(PublishStrategy):
     """管理員發布為官方關卡策略"""
@@ -50,22 +69,37 @@ class AdminOfficialPublish(PublishStrategy):
         Returns:
             Level: status=PUBLISHED, is_official=True
         """
-        level.status = LevelStatus.PUBLISHED
-        level.is_official = True
-        level.solution = solution
-
-        # 處理 official_order
-        if self.official_order is not None:
-            level.official_order = self.official_order
-        else:
+        official_order = self.official_order
+        if official_order is None:
             # 自動分配下一個序號
-            max_order_result = db.query(Level.official_order).order_by(Level.official_order.desc()).first()
-            level.official_order = (max_order_result[0] + 1) if max_order_result else 1
+            official_order = db.execute(LevelQueryService.next_official_order()).scalar_one()
+        before = visible_list(level)
+        self._apply(level, solution, official_order)
 
         db.commit()
+        level_list_cache.invalidate_for(before, level)
         db.refresh(level)
         return level
 
+    async def execute_async(self, db: AsyncSession, level: Level, solution: dict) -> Level:
+        """執行官方關卡發布（非同步）"""
+        official_order = self.official_order
+        if official_order is None:
+            official_order = (await db.execute(LevelQueryService.next_official_order())).scalar_one()
+        before = visible_list(level)
+        self._apply(level, solution, official_order)
+
+        await db.commit()
+        level_list_cache.invalidate_for(before, level)
+        return await refresh_level(db, level)
+
+    @staticmethod
+    def _apply(level: Level, solution: dict, official_order: int) -> None:
+        level.status = LevelStatus.PUBLISHED
+        level.is_official = True
+        level.solution = solution
+        level.official_order = official_order
+
 
 class AdminCommunityPublish(PublishStrategy):
     """管理員發布為社群關卡策略"""
@@ -81,13 +115,27 @@ class AdminCommunityPublish(PublishStrategy):
         Returns:
             Level: status=PUBLISHED, is_official=False
         """
-        level.status = LevelStatus.PUBLISHED
-        level.is_official = False
-        level.solution = solution
+        before = visible_list(level)
+        self._apply(level, solution)
         db.commit()
+        level_list_cache.invalidate_for(before, level)
         db.refresh(level)
         return level
 
+    async def execute_async(self, db: AsyncSession, level: Level, solution: dict) -> Level:
+        """執行社群關卡發布（非同步）"""
+        before = visible_list(level)
+        self._apply(level, solution)
+        await db.commit()
+        level_list_cache.invalidate_for(before, level)
+        return await refresh_level(db, level)
+
+    @staticmethod
+    def _apply(level: Level, solution: dict) -> None:
+        level.status = LevelStatus.PUBLISHED
+        level.is_official = False
+        level.solution = solution
+
 
 class UserSubmitForReview(PublishStrategy):
     """一般使用者提交審核策略"""
@@ -103,12 +151,26 @@ class UserSubmitForReview(PublishStrategy):
         Returns:
             Level: status=PENDING（待審核）
         """
-        level.status = LevelStatus.PENDING
-        level.solution = solution
+        before = visible_list(level)
+        self._apply(level, solution)
         db.commit()
+        level_list_cache.invalidate_for(before, level)
         db.refresh(level)
         return level
 
+    async def execute_async(self, db: AsyncSession, level: Level, solution: dict) -> Level:
+        """執行提交審核（非同步）"""
+        before = visible_list(level)
+        self._apply(level, solution)
+        await db.commit()
+        level_list_cache.invalidate_for(before, level)
+        return await refresh_level(db, level)
+
+    @staticmethod
+    def _apply(level: Level, solution: dict) -> None:
+        level.status = LevelStatus.PENDING
+        level.solution = solution
+
 
 def get_publish_strategy(
     user: User,
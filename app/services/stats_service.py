@@ -0,0 +1,89 @@
+"""關卡統計服務 - 讀取 level_stats 彙總
+
+level_stats 由 level_progress 的觸發器在同一交易內增減（alembic f7c2d4e8b1a6），
+單筆/批次進度 upsert、刪除關卡或使用者的連帶刪除都會反映，讀取端只需以主鍵
+取一列，與遊玩人數無關。
+
+最佳與中位數步數由完成者的 best_steps 直方圖計算：直方圖的鍵數受步數範圍限制，
+不隨人數成長。
+"""
+from typing import Optional
+
+from sqlalchemy import Select, select
+from sqlalchemy.engine import Row
+
+from app.models.level import Level, LevelStatus
+from app.models.stats import LevelStats
+from app.schemas.progress import LevelStatsOut
+
+
+class StatsService:
+    """關卡統計查詢"""
+
+    @staticmethod
+    def stats_query(level_id: str) -> Select:
+        """已發布關卡的統計（levels LEFT JOIN level_stats；尚無人遊玩時統計欄位為 NULL）
+
+        Args:
+            level_id: 關卡 ID
+
+        Returns:
+            Select: 關卡不存在或未發布時無結果
+        """
+        return (
+            select(
+                Level.id.label("level_id"),
+                LevelStats.players,
+                LevelStats.completions,
+                LevelStats.steps_histogram,
+                LevelStats.stars_histogram,
+            )
+            .outerjoin(LevelStats, LevelStats.level_id == Level.id)
+            .where(Level.id == level_id, Level.status == LevelStatus.PUBLISHED)
+        )
+
+    @staticmethod
+    def median(histogram: dict[int, int]) -> Optional[float]:
+        """直方圖的中位數（偶數筆時取中間兩值的平均）
+
+        Args:
+            histogram: 值 -> 次數
+
+        Returns:
+            float | None: 直方圖為空時為 None
+        """
+        total = sum(histogram.values())
+        if total == 0:
+            return None
+        lower_rank, upper_rank = (total - 1) // 2, total // 2
+        lower = upper = None
+        seen = 0
+        for value in sorted(histogram):
+            seen += histogram[value]
+            if lower is None and seen > lower_rank:
+                lower = value
+            if seen > upper_rank:
+                upper = value
+                break
+        return (lower + upper) / 2
+
+    @staticmethod
+    def as_out(row: Row) -> LevelStatsOut:
+        """將 stats_query 的結果轉為回應
+
+        Args:
+            row: stats_query 的一列
+
+        Returns:
+            LevelStatsOut: 最佳/中位數步數由直方圖計算
+        """
+        steps = {int(k): v for k, v in (row.steps_histogram or {}).items()}
+        stars = {int(k): v for k, v in (row.stars_histogram or {}).items()}
+        return LevelStatsOut(
+            level_id=row.level_id,
+            players=row.players or 0,
+            completions=row.completions or 0,
+            best_steps=min(steps) if steps else None,
+            median_steps=StatsService.median(steps),
+            stars_distribution=dict(sorted(stars.items())),
+        )
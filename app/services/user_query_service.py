@@ -0,0 +1,68 @@
+"""使用者列表查詢層（管理用）
+
+只投影 UserOut 欄位（不讀 hashed_password），keyset 分頁。
+查詢函數只建立 statement 不執行，同步與非同步 session 皆可共用。
+"""
+from typing import Any, Callable, Optional
+
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.engine import Row
+
+from app.core.pagination import decode_cursor
+from app.core.search import contains_pattern
+from app.models.user import User
+
+USER_COLUMNS = (User.id, User.username, User.is_superuser)
+
+# 排序：名稱 → (排序欄, 游標鍵型別)，皆為正序
+USER_SORTS = {
+    "id": (User.id, int),
+    "username": (User.username, str),
+}
+
+
+class UserQueryService:
+    """使用者列表查詢 statement 建構"""
+
+    @staticmethod
+    def admin_users_page(
+        cursor: str | None,
+        limit: int,
+        sort: str = "id",
+        is_superuser: Optional[bool] = None,
+        q: Optional[str] = None,
+    ) -> Select:
+        """管理員使用者分頁
+
+        Args:
+            cursor: 上一頁游標（需與 sort 相同）
+            limit: 每頁筆數（會多取一筆用於判斷下一頁）
+            sort: id / username（正序）
+            is_superuser: 只列管理員或一般使用者
+            q: 使用者名稱子字串（pg_trgm 索引）
+        """
+        stmt = select(*USER_COLUMNS)
+        if is_superuser is not None:
+            stmt = stmt.where(User.is_superuser == is_superuser)
+        if q:
+            stmt = stmt.where(User.username.ilike(contains_pattern(q)))
+
+        key, key_type = USER_SORTS[sort]
+        if sort == "id":
+            if cursor:
+                (user_id,) = decode_cursor(cursor, int)
+                stmt = stmt.where(User.id > user_id)
+            return stmt.order_by(User.id).limit(limit + 1)
+
+        if cursor:
+            value, user_id = decode_cursor(cursor, key_type, int)
+            stmt = stmt.where(tuple_(key, User.id) > (value, user_id))
+        return stmt.order_by(key, User.id).limit(limit + 1)
+
+    @staticmethod
+    def cursor_key(sort: str) -> Callable[[Row], tuple[Any, ...]]:
+        """使用者列表游標鍵"""
+        if sort == "id":
+            return lambda row: (row.id,)
+        name = USER_SORTS[sort][0].key
+        return lambda row: (getattr(row, name), row.id)
@@ -0,0 +1,192 @@
+"""解答驗證服務 - 以伺服器端引擎執行 solution / 使用者儲存的程式
+
+進度驗證結果以 (level_id, level.updated_at, 指令雜湊) 為 key 存在程序內 LRU：
+關卡或程式一改 key 就不同，不需要主動失效；同一程式重複提交不必重跑。
+棋盤另以 (level_id, level.updated_at) 快取，未命中時也省下解析地圖的成本。
+"""
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.core.cache import MemoryCache
+from app.engine import (
+    COMMAND_KEYS,
+    Board,
+    BoardError,
+    ExecutionResult,
+    Outcome,
+    Program,
+    ProgramError,
+    compile_program,
+    execute,
+    run_program,
+)
+from app.models.level import Level
+from app.schemas.progress import LevelProgressUpdate
+
+# key 已含版本，不會讀到過期結果；TTL 只是讓冷門項目最終被釋放
+_MEMO_TTL_SECONDS = 24 * 3600.0
+_BOARD_CACHE_ENTRIES = 256
+
+_result_memo = MemoryCache(max_entries=settings.progress_memo_entries, default_ttl=_MEMO_TTL_SECONDS)
+_board_cache = MemoryCache(max_entries=_BOARD_CACHE_ENTRIES, default_ttl=_MEMO_TTL_SECONDS)
+
+
+def _level_version(level: Level) -> str:
+    return f"{level.id}:{level.updated_at.isoformat()}"
+
+
+def _commands_digest(commands: dict[str, Any]) -> str:
+    """指令的穩定雜湊（只看 f0/f1/f2，key 順序不影響）"""
+    canonical = json.dumps(
+        [list(commands.get(key) or ()) for key in COMMAND_KEYS],
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+class VerificationService:
+    """解答驗證"""
+
+    @staticmethod
+    def verify_solution(level: Level, solution: dict) -> ExecutionResult:
+        """在關卡地圖上執行 solution，確認能收集所有星星
+
+        Args:
+            level: 關卡（需已載入 map_data/config）
+            solution: 解題資料 {commands_f0, commands_f1, commands_f2, steps_count}
+
+        Returns:
+            ExecutionResult: 執行結果（solved）
+
+        Raises:
+            HTTPException 400: 程式格式錯誤、違反關卡設定或未能完成關卡
+        """
+        try:
+            result = run_program(
+                level.map_data, level.config, solution, max_steps=settings.engine_max_steps
+            )
+        except (ProgramError, BoardError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"解答無效: {e}",
+            )
+
+        if not result.solved:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"解答未能完成關卡（{result.outcome.value}，"
+                    f"星星 {result.stars_collected}/{result.total_stars}，{result.steps} 步）"
+                ),
+            )
+        return result
+
+    @staticmethod
+    def checked_solution(level: Level, solution: dict) -> dict:
+        """發布前處理 solution：開啟 settings.verify_solutions 時驗證並以實際步數取代 steps_count
+
+        Args:
+            level: 關卡
+            solution: 解題資料
+
+        Returns:
+            dict: 要儲存的解題資料
+        """
+        if not settings.verify_solutions:
+            return solution
+        result = VerificationService.verify_solution(level, solution)
+        return {**solution, "steps_count": result.steps}
+
+    @staticmethod
+    def run_memoized(level: Level, commands: dict[str, Any]) -> dict[str, Any]:
+        """執行使用者程式（結果依關卡版本與指令雜湊快取）
+
+        Args:
+            level: 關卡（需已載入 map_data/config/updated_at）
+            commands: {commands_f0, commands_f1, commands_f2}
+
+        Returns:
+            dict: {outcome, steps, stars_collected, total_stars}
+
+        Raises:
+            HTTPException 400: 程式格式錯誤或違反關卡設定
+            HTTPException 422: 關卡地圖無法執行
+        """
+        version = _level_version(level)
+        key = f"{version}:{_commands_digest(commands)}"
+        cached = _result_memo.get(key)
+        if cached is not None:
+            return cached
+
+        board = _board_cache.get(version)
+        if board is None:
+            try:
+                board = Board.from_map(level.map_data)
+            except BoardError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"關卡地圖無法執行: {e}",
+                )
+            _board_cache.set(version, board)
+        try:
+            program = compile_program(Program.from_commands(commands, config=level.config))
+        except ProgramError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"程式無效: {e}",
+            )
+
+        result = execute(board, program, max_steps=settings.engine_max_steps)
+        summary = {
+            "outcome": result.outcome.value,
+            "steps": result.steps,
+            "stars_collected": result.stars_collected,
+            "total_stars": result.total_stars,
+        }
+        _result_memo.set(key, summary)
+        return summary
+
+    @staticmethod
+    def verified_progress(
+        level: Level,
+        commands: Optional[dict[str, Any]],
+        data: LevelProgressUpdate,
+    ) -> LevelProgressUpdate:
+        """開啟 settings.verify_progress 時，以儲存的程式重新執行並取代回報的進度數值
+
+        回報值只決定「要不要驗證」；採用的 is_completed/best_steps/stars_collected
+        一律來自伺服器端執行結果，未完成關卡時不更新 best_steps。
+
+        Args:
+            level: 關卡
+            commands: 使用者儲存的程式（LevelProgram.commands，未儲存為 None）
+            data: 客戶端回報的進度
+
+        Returns:
+            LevelProgressUpdate: 要寫入的進度
+
+        Raises:
+            HTTPException 400: 回報了成績但尚未儲存程式，或程式無效
+        """
+        if not settings.verify_progress:
+            return data
+        if not data.is_completed and data.best_steps is None and data.stars_collected is None:
+            return data
+        if commands is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="尚未儲存此關卡的程式，無法驗證進度",
+            )
+
+        result = VerificationService.run_memoized(level, commands)
+        solved = result["outcome"] == Outcome.SOLVED.value
+        return LevelProgressUpdate(
+            is_completed=solved,
+            best_steps=result["steps"] if solved else None,
+            stars_collected=result["stars_collected"],
+        )
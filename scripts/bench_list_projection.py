@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Block42 Backend - 列表查詢投影 Benchmark
+
+描述:
+    比較列表端點的兩種查詢方式：
+    - orm: db.query(Level).options(joinedload(Level.author))（舊做法，載入全部 JSONB）
+    - projection: LevelQueryService 投影查詢（只取列表欄位 + users.username）
+
+    在單一交易中植入測試資料，量測完畢後 rollback，不會留下任何資料。
+    傳輸量以 octet_length(row::text) 估算（等同 text protocol 下的 payload 大小）。
+
+Usage:
+    python scripts/bench_list_projection.py --levels 2000 --map-size 64
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nanoid import generate
+from sqlalchemy import Text, cast, func, insert, select
+from sqlalchemy.orm import joinedload
+
+from app.core.map_codec import encode_map
+from app.database import SessionLocal
+from app.models.level import Level, LevelStatus
+from app.models.user import User
+from app.services import LevelQueryService
+
+
+def build_map(size: int) -> dict:
+    """產生 size x size 全滿地圖"""
+    colors = "RGB"
+    return {
+        "gridSize": size,
+        "padding": 0,
+        "bounds": {"minX": 0, "minY": 0, "maxX": size - 1, "maxY": size - 1},
+        "start": {"x": 0, "y": 0, "dir": 1},
+        "stars": [{"x": size - 1, "y": size - 1}],
+        "tiles": [
+            {"x": x, "y": y, "color": random.choice(colors)}
+            for y in range(size)
+            for x in range(size)
+        ],
+    }
+
+
+def seed(db, count: int, map_size: int) -> None:
+    """植入 count 筆已發布社群關卡"""
+    user = User(username=f"bench_{generate(size=8)}", hashed_password="x", is_superuser=False)
+    db.add(user)
+    db.flush()
+
+    map_data = build_map(map_size)
+    map_packed = encode_map(map_data)
+    config = {"f0": 10, "f1": 5, "f2": 0, "tools": {"paint_red": True, "paint_green": False, "paint_blue": False}}
+    solution = {"commands_f0": ["F"] * 10, "commands_f1": [], "commands_f2": [], "steps_count": 10}
+    rows = [
+        {
+            "id": generate(size=12),
+            "author_id": user.id,
+            "title": f"bench level {i}",
+            "status": LevelStatus.PUBLISHED,
+            "is_official": False,
+            "official_order": 0,
+            "map_data": map_data,
+            "map_packed": map_packed,
+            "config": config,
+            "solution": solution,
+        }
+        for i in range(count)
+    ]
+    db.execute(insert(Level), rows)
+    db.flush()
+
+
+def payload_bytes(db, stmt) -> int:
+    """估算查詢結果的傳輸量"""
+    subq = stmt.subquery()
+    row_text = cast(subq.table_valued(), Text)
+    return db.execute(select(func.coalesce(func.sum(func.octet_length(row_text)), 0))).scalar_one()
+
+
+def run(label: str, fn, rounds: int) -> float:
+    """執行 rounds 次並回傳每秒列數"""
+    fn()  # 暖機
+    start = time.perf_counter()
+    total = 0
+    for _ in range(rounds):
+        total += len(fn())
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed
+    print(f"{label:<12} {total:>8} rows  {elapsed:8.3f}s  {rate:12.0f} rows/s")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="列表查詢投影 benchmark")
+    parser.add_argument("--levels", type=int, default=2000, help="植入關卡數")
+    parser.add_argument("--map-size", type=int, default=64, help="地圖邊長（最大 128）")
+    parser.add_argument("--rounds", type=int, default=5, help="每種查詢執行次數")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        seed(db, args.levels, args.map_size)
+
+        orm_query = (
+            db.query(Level)
+            .options(joinedload(Level.author))
+            .filter(Level.is_official == False, Level.status == LevelStatus.PUBLISHED)
+            .order_by(Level.created_at.desc())
+        )
+        projection = LevelQueryService.community_page(None, args.levels)
+
+        def orm_rows():
+            db.expunge_all()
+            return orm_query.all()
+
+        def projection_rows():
+            return db.execute(projection).all()
+
+        orm_stmt = (
+            select(Level, User)
+            .outerjoin(User, User.id == Level.author_id)
+            .where(Level.is_official == False, Level.status == LevelStatus.PUBLISHED)
+        )
+        orm_bytes = payload_bytes(db, orm_stmt)
+        projection_bytes = payload_bytes(db, projection)
+
+        print(f"levels={args.levels} map={args.map_size}x{args.map_size}")
+        print(f"{'orm':<12} {orm_bytes / 1024 / 1024:10.2f} MiB transferred")
+        print(f"{'projection':<12} {projection_bytes / 1024 / 1024:10.2f} MiB transferred")
+        orm_rate = run("orm", orm_rows, args.rounds)
+        projection_rate = run("projection", projection_rows, args.rounds)
+        print(f"bytes: {orm_bytes / max(projection_bytes, 1):.1f}x smaller, "
+              f"throughput: {projection_rate / orm_rate:.1f}x faster")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
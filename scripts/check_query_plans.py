@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Block42 Backend - 熱門查詢執行計畫檢查
+
+描述:
+    對路由使用的每個 levels 查詢執行 EXPLAIN (FORMAT JSON)，計畫中出現
+    levels 的 Seq Scan 即失敗（exit 1）。用於確認索引（alembic d4f8a2c6e1b3 等）
+    確實被選用。
+
+    預設在交易內灌入測試資料（使用者、各狀態關卡）並 ANALYZE，檢查完 ROLLBACK，
+    不會留下資料；--no-seed 則直接檢查現有資料。資料量太少時 planner 會合理地選擇
+    seq scan，--levels 不宜低於數千筆。
+
+    管理員關卡列表只檢查帶篩選條件的查詢；無篩選的第一頁由 planner 自行選擇。
+
+    需先 `alembic upgrade head`。
+
+Usage:
+    python scripts/check_query_plans.py
+    python scripts/check_query_plans.py --levels 100000 --users 2000
+    python scripts/check_query_plans.py --no-seed
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import Select, select, text
+from sqlalchemy.engine import Connection
+
+from app.database import engine
+from app.models.level import Level, LevelStatus
+from app.models.progress import LevelProgress
+from app.models.program import LevelProgram
+from app.services import LevelQueryService, StatsService
+
+CHECKED_TABLES = {"levels", "level_progress", "level_programs", "level_stats"}
+
+# 狀態分布：大多已發布，待審核只佔少數（審核佇列索引的典型使用情境）
+SEED_SQL = """
+INSERT INTO users (username, hashed_password, is_superuser)
+SELECT 'plan_check_' || i, 'x', false FROM generate_series(1, :users) AS i;
+
+INSERT INTO levels (id, author_id, title, status, is_official, official_order,
+                    map_data, map_packed, config, created_at, updated_at)
+SELECT
+    'pc' || lpad(i::text, 10, '0'),
+    u.id,
+    'plan check ' || i,
+    (CASE
+        WHEN i % 100 < 80 THEN 'PUBLISHED'
+        WHEN i % 100 < 82 THEN 'PENDING'
+        WHEN i % 100 < 97 THEN 'DRAFT'
+        ELSE 'REJECTED'
+    END)::levelstatus,
+    i % 100 < 4,
+    CASE WHEN i % 100 < 4 THEN i ELSE 0 END,
+    '{}'::jsonb,
+    '\\x'::bytea,
+    '{}'::jsonb,
+    now() - i * interval '1 minute',
+    now() - (i % 977) * interval '1 minute'
+FROM generate_series(1, :levels) AS i
+JOIN LATERAL (
+    SELECT id FROM users WHERE username = 'plan_check_' || (1 + i % :users)
+) AS u ON true;
+
+ANALYZE users;
+ANALYZE levels;
+"""
+
+
+def seq_scans(plan: dict) -> Iterator[str]:
+    """列出計畫樹中受檢查資料表的 Seq Scan"""
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in CHECKED_TABLES:
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+
+def explain(conn: Connection, stmt: Select) -> dict:
+    """EXPLAIN (FORMAT JSON)，回傳最上層計畫節點"""
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    raw = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + compiled.string, compiled.params).scalar_one()
+    plan = raw if isinstance(raw, list) else json.loads(raw)
+    return plan[0]["Plan"]
+
+
+def node_summary(plan: dict) -> str:
+    """計畫樹中的掃描節點（用於輸出）"""
+    nodes = []
+
+    def walk(node: dict) -> None:
+        if "Relation Name" in node:
+            index = f" using {node['Index Name']}" if "Index Name" in node else ""
+            nodes.append(f"{node['Node Type']} on {node['Relation Name']}{index}")
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan)
+    return "; ".join(nodes)
+
+
+def hot_queries(conn: Connection) -> list[tuple[str, Select]]:
+    """路由使用的 levels 查詢（游標取自實際資料）"""
+    sample = conn.execute(
+        select(Level.author_id, Level.id)
+        .where(Level.status == LevelStatus.PUBLISHED)
+        .limit(1)
+    ).first()
+    if sample is None:
+        raise SystemExit("沒有已發布的關卡，請不要使用 --no-seed 或先建立資料")
+    author_id, level_id = sample
+
+    def second_page_cursor(stmt: Select, key) -> str | None:
+        rows = conn.execute(stmt).all()
+        return LevelQueryService.build_page(rows, 20, key)["next_cursor"]
+
+    official_cursor = second_page_cursor(
+        LevelQueryService.official_page(None, 20), LevelQueryService.official_cursor_key
+    )
+    community_cursor = second_page_cursor(
+        LevelQueryService.community_page(None, 20), LevelQueryService.community_cursor_key
+    )
+
+    queries = [
+        ("official list", LevelQueryService.official_page(None, 20)),
+        ("community list", LevelQueryService.community_page(None, 20)),
+        ("designer list", LevelQueryService.author_levels(author_id)),
+        ("admin queue", LevelQueryService.pending_levels()),
+        ("admin queue (difficulty)", LevelQueryService.pending_levels("difficulty")),
+        ("next official order", LevelQueryService.next_official_order()),
+        ("admin levels (pending)", LevelQueryService.admin_levels_page(None, 50, status="pending")),
+        ("admin levels (author)", LevelQueryService.admin_levels_page(None, 50, author_id=author_id)),
+        ("admin levels (title search)", LevelQueryService.admin_levels_page(None, 50, q="check 1234")),
+        ("level stats", StatsService.stats_query(level_id)),
+        ("level progress", select(LevelProgress).where(LevelProgress.user_id == author_id)),
+        ("level program", select(LevelProgram).where(
+            LevelProgram.user_id == author_id, LevelProgram.level_id == level_id
+        )),
+    ]
+    if official_cursor:
+        queries.append(("official list (page 2)", LevelQueryService.official_page(official_cursor, 20)))
+    if community_cursor:
+        queries.append(("community list (page 2)", LevelQueryService.community_page(community_cursor, 20)))
+    return queries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="熱門查詢執行計畫檢查")
+    parser.add_argument("--levels", type=int, default=50_000, help="灌入的關卡數")
+    parser.add_argument("--users", type=int, default=1_000, help="灌入的使用者數")
+    parser.add_argument("--no-seed", action="store_true", help="不灌資料，直接檢查現有資料")
+    args = parser.parse_args()
+
+    failures = []
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            if not args.no_seed:
+                for statement in SEED_SQL.split(";\n"):
+                    if statement.strip():
+                        conn.execute(text(statement), {"levels": args.levels, "users": args.users})
+
+            for name, stmt in hot_queries(conn):
+                plan = explain(conn, stmt)
+                scans = sorted(set(seq_scans(plan)))
+                status = "FAIL" if scans else "ok"
+                print(f"{status:<4}  {name:<26} {node_summary(plan)}")
+                if scans:
+                    failures.append(name)
+        finally:
+            trans.rollback()
+
+    if failures:
+        print(f"\n{len(failures)} 個查詢使用 seq scan: {', '.join(failures)}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
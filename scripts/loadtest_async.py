@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Block42 Backend - 同步/非同步資料庫模式負載測試
+
+描述:
+    以固定併發數持續對單一端點發送 GET，回報吞吐量與延遲分位數。
+    用於比較 DB_ASYNC=false（threadpool，約 40 個 in-flight 上限）與
+    DB_ASYNC=true（AsyncEngine）在資料庫變慢時每個 worker 可承載的併發量。
+
+    模擬慢資料庫：在 PostgreSQL 前放 toxiproxy 之類的延遲代理（例如每個封包 +50ms），
+    讓 DATABASE_URL 指向代理。
+    兩種模式請使用相同的 uvicorn 設定（單一 worker）：
+
+        DB_ASYNC=false uv run uvicorn app.main:app --workers 1 --port 8000
+        DB_ASYNC=true  uv run uvicorn app.main:app --workers 1 --port 8000
+
+    只使用標準函式庫，不需額外安裝 HTTP client。
+
+Usage:
+    python scripts/loadtest_async.py --concurrency 200 --duration 20
+    python scripts/loadtest_async.py --path /api/v1/levels/official --concurrency 500
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+async def fetch(host: str, port: int, path: str) -> int:
+    """發送單一 HTTP/1.1 GET 並回傳狀態碼"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("ascii")
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()  # 讀完 body 直到連線關閉
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def worker(host: str, port: int, path: str, deadline: float, latencies: list, errors: list) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            code = await fetch(host, port, path)
+        except OSError as e:
+            errors.append(str(e))
+            continue
+        if code >= 400:
+            errors.append(f"HTTP {code}")
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(base_url: str, path: str, concurrency: int, duration: float) -> None:
+    url = urlsplit(base_url)
+    host, port = url.hostname or "localhost", url.port or 80
+    latencies: list[float] = []
+    errors: list[str] = []
+    deadline = time.perf_counter() + duration
+
+    await asyncio.gather(*[
+        worker(host, port, path, deadline, latencies, errors)
+        for _ in range(concurrency)
+    ])
+
+    print(f"target       {base_url}{path}")
+    print(f"concurrency  {concurrency}")
+    print(f"requests     {len(latencies)} ok, {len(errors)} failed")
+    if not latencies:
+        return
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"throughput   {len(latencies) / duration:.1f} req/s")
+    print(f"latency p50  {quantiles[49] * 1000:.1f} ms")
+    print(f"latency p99  {quantiles[98] * 1000:.1f} ms")
+    print(f"latency max  {latencies[-1] * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="同步/非同步資料庫模式負載測試")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/api/v1/levels/community")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=20.0, help="秒")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.base_url, args.path, args.concurrency, args.duration))
+
+
+if __name__ == "__main__":
+    main()
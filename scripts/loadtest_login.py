@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Block42 Backend - 登入尖峰測試
+
+描述:
+    模擬上課開始時大量學生同時登入：多個執行緒同時 POST /auth/login，
+    另一組執行緒持續 GET /levels/official，回報兩者的延遲分位數與 503 數量。
+    bcrypt 在專用執行緒池執行時，關卡讀取延遲不應隨登入量明顯上升；
+    超過 PASSWORD_HASH_QUEUE 的登入會立即收到 503。
+
+    伺服器端先啟動：
+        uv run uvicorn app.main:app --workers 1 --port 8000
+
+Usage:
+    python scripts/loadtest_login.py --username alice --password secret
+    python scripts/loadtest_login.py --username alice --password secret --logins 500 --threads 200
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def request(url: str, body=None) -> int:
+    """發送請求，回傳狀態碼"""
+    data = None if body is None else json.dumps(body).encode()
+    req = urllib.request.Request(url, data=data, method="POST" if body is not None else "GET")
+    req.add_header("Content-Type", "application/json")
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def summary(name: str, values: list[float]) -> str:
+    if len(values) < 2:
+        return f"{name:<8} n={len(values)}"
+    q = statistics.quantiles(values, n=100)
+    return (f"{name:<8} n={len(values):<5} p50 {q[49] * 1000:7.1f} ms   "
+            f"p95 {q[94] * 1000:7.1f} ms   p99 {q[98] * 1000:7.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="登入尖峰測試")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=300, help="登入請求數")
+    parser.add_argument("--threads", type=int, default=100, help="登入併發數")
+    parser.add_argument("--readers", type=int, default=8, help="同時讀取關卡列表的執行緒數")
+    args = parser.parse_args()
+
+    api = args.base_url.rstrip("/") + "/api/v1"
+    credentials = {"username": args.username, "password": args.password}
+    results: dict[str, list[float]] = {"login": [], "read": []}
+    statuses: dict[int, int] = {}
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def timed(kind: str, url: str, body=None) -> None:
+        start = time.perf_counter()
+        code = request(url, body)
+        elapsed = time.perf_counter() - start
+        with lock:
+            if kind == "login":
+                statuses[code] = statuses.get(code, 0) + 1
+            if code == 200:
+                results[kind].append(elapsed)
+
+    def reader() -> None:
+        while not done.is_set():
+            timed("read", f"{api}/levels/official?limit=20")
+
+    readers = [threading.Thread(target=reader) for _ in range(args.readers)]
+    for thread in readers:
+        thread.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(lambda _: timed("login", f"{api}/auth/login", credentials), range(args.logins)))
+    duration = time.perf_counter() - started
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    print(f"logins       {args.logins} in {duration:.1f}s, status {dict(sorted(statuses.items()))}")
+    print(summary("login", results["login"]))
+    print(summary("read", results["read"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Block42 Backend - 進度/程式 upsert 併發測試
+
+描述:
+    多個執行緒同時對同一 (使用者, 關卡) 發送 PUT /levels/{id}/progress 與
+    PUT /levels/{id}/program，回報失敗數（舊版讀-改-寫在並行首次儲存時會撞上
+    uq_level_progress_user_level / uq_level_program_user_level 而回 500）
+    與延遲分位數（p50/p95/p99）。
+
+    結束後讀回進度，確認合併結果正確：best_steps 為所有送出值的最小值、
+    stars_collected 為最大值、任一請求完成即 is_completed。
+    伺服器需以 VERIFY_PROGRESS=false 執行（驗證模式會以伺服器端執行結果取代送出值）。
+
+    測試前會先刪除該使用者在此關卡的進度，讓第一批請求同時走「新增」路徑；
+    刪除需要資料庫連線（DATABASE_URL），其餘只透過 HTTP。
+
+    伺服器端先啟動：
+        uv run uvicorn app.main:app --workers 1 --port 8000
+
+Usage:
+    python scripts/loadtest_upsert.py --username alice --password secret --level-id abc123def456
+    python scripts/loadtest_upsert.py --username alice --password secret --level-id abc123def456 \\
+        --threads 64 --requests 5000 --mode progress
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def request(base_url: str, method: str, path: str, body=None, token: str | None = None) -> tuple[int, dict]:
+    """發送 JSON 請求，回傳 (狀態碼, 回應內容)"""
+    data = None if body is None else json.dumps(body).encode()
+    req = urllib.request.Request(base_url + path, data=data, method=method)
+    req.add_header("Content-Type", "application/json")
+    if token:
+        req.add_header("Authorization", f"Bearer {token}")
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status, json.loads(resp.read() or b"null")
+    except urllib.error.HTTPError as e:
+        return e.code, {"detail": e.read().decode(errors="replace")}
+
+
+def reset_rows(user_id: int, level_id: str) -> None:
+    """刪除既有進度與程式，讓測試從「新增」開始"""
+    from sqlalchemy import delete
+
+    from app.database import SessionLocal
+    from app.models.program import LevelProgram
+    from app.models.progress import LevelProgress
+
+    with SessionLocal() as db:
+        for model in (LevelProgress, LevelProgram):
+            db.execute(delete(model).where(model.user_id == user_id, model.level_id == level_id))
+        db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="進度/程式 upsert 併發測試")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--level-id", required=True)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000, help="總請求數")
+    parser.add_argument("--mode", choices=("both", "progress", "program"), default="both")
+    parser.add_argument("--no-reset", action="store_true", help="不刪除既有進度（不需資料庫連線）")
+    args = parser.parse_args()
+
+    api = args.base_url.rstrip("/") + "/api/v1"
+    code, body = request(api, "POST", "/auth/login", {"username": args.username, "password": args.password})
+    if code != 200:
+        raise SystemExit(f"登入失敗: {code} {body}")
+    token = body["access_token"]
+    code, me = request(api, "GET", "/auth/users/me", token=token)
+    if code != 200:
+        raise SystemExit(f"讀取使用者失敗: {code} {me}")
+    if not args.no_reset:
+        reset_rows(me["id"], args.level_id)
+
+    kinds = ("progress", "program") if args.mode == "both" else (args.mode,)
+    rng = random.Random(42)
+    jobs = []
+    for i in range(args.requests):
+        kind = kinds[i % len(kinds)]
+        if kind == "progress":
+            payload = {
+                "is_completed": rng.random() < 0.2,
+                "best_steps": rng.randint(10, 1000),
+                "stars_collected": rng.randint(0, 5),
+            }
+        else:
+            payload = {"commands_f0": ["F"] * rng.randint(1, 8), "commands_f1": [], "commands_f2": []}
+        jobs.append((kind, payload))
+
+    latencies: dict[str, list[float]] = {kind: [] for kind in kinds}
+    errors: list[str] = []
+    lock = threading.Lock()
+
+    def send(job: tuple[str, dict]) -> None:
+        kind, payload = job
+        start = time.perf_counter()
+        code, body = request(api, "PUT", f"/levels/{args.level_id}/{kind}", payload, token)
+        elapsed = time.perf_counter() - start
+        with lock:
+            if code == 200:
+                latencies[kind].append(elapsed)
+            else:
+                errors.append(f"{kind} HTTP {code}: {str(body)[:120]}")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(send, jobs))
+    duration = time.perf_counter() - started
+
+    print(f"target       {api}/levels/{args.level_id}/[{'|'.join(kinds)}]")
+    print(f"threads      {args.threads}")
+    print(f"requests     {sum(map(len, latencies.values()))} ok, {len(errors)} failed")
+    print(f"throughput   {args.requests / duration:.1f} req/s")
+    for kind, values in latencies.items():
+        if len(values) < 2:
+            continue
+        quantiles = statistics.quantiles(values, n=100)
+        print(f"{kind:<9}    p50 {quantiles[49] * 1000:7.1f} ms   p95 {quantiles[94] * 1000:7.1f} ms   "
+              f"p99 {quantiles[98] * 1000:7.1f} ms   max {max(values) * 1000:7.1f} ms")
+    for error in errors[:10]:
+        print(f"  {error}")
+
+    if "progress" in kinds and not args.no_reset:
+        sent = [payload for kind, payload in jobs if kind == "progress"]
+        code, rows = request(api, "GET", "/levels/progress", token=token)
+        row = next((r for r in rows if r["level_id"] == args.level_id), None) if code == 200 else None
+        expected = {
+            "is_completed": any(p["is_completed"] for p in sent),
+            "best_steps": min(p["best_steps"] for p in sent),
+            "stars_collected": max(p["stars_collected"] for p in sent),
+        }
+        actual = {key: row[key] for key in expected} if row else None
+        status = "ok" if actual == expected else "MISMATCH"
+        print(f"merge check  {status}  expected {expected}  actual {actual}")
+        if actual != expected:
+            raise SystemExit(1)
+    if errors:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Block42 Backend - 已發布關卡批次重新驗證
+
+描述:
+    遊戲規則或 LevelConfig 語意改變後，確認每個已發布關卡儲存的 solution
+    是否仍能完成其 map_data。
+
+    - 以 server-side cursor（stream_results + yield_per）串流讀取，不會一次載入所有關卡
+    - 以 ProcessPoolExecutor（預設為 CPU 核心數）平行執行 app.engine，
+      每個 task 處理一批關卡以攤平程序間傳輸成本，並限制同時在途的批次數
+    - 輸出 CSV 報表：id, status(pass/fail/error), outcome, steps, stored_steps, stars
+    - --flag 會把失敗結果寫入 levels.metadata.verification，並清除已通過關卡的舊標記
+
+Usage:
+    python scripts/reverify_levels.py --report reverify.csv
+    python scripts/reverify_levels.py --workers 8 --flag
+    python scripts/reverify_levels.py --workers 1 --limit 2000   # 對照單核耗時
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import Text, bindparam, func, literal, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.config import settings
+from app.database import engine
+from app.engine import BoardError, ProgramError, run_program
+from app.models.level import Level, LevelStatus
+
+REPORT_FIELDS = [
+    "id", "status", "outcome", "steps", "stored_steps",
+    "stars_collected", "total_stars", "detail",
+]
+
+# (id, map_data, config, solution)
+Job = tuple[str, dict, dict, dict | None]
+
+
+def verify_level(job: Job, max_steps: int) -> dict[str, Any]:
+    """執行單一關卡的 solution（於 worker 程序中執行）"""
+    level_id, map_data, config, solution = job
+    row: dict[str, Any] = {"id": level_id}
+    if not solution:
+        return {**row, "status": "error", "outcome": "no_solution"}
+    try:
+        result = run_program(map_data, config, solution, max_steps=max_steps)
+    except (BoardError, ProgramError) as e:
+        return {**row, "status": "error", "outcome": "invalid", "detail": str(e)}
+    return {
+        **row,
+        "status": "pass" if result.solved else "fail",
+        "outcome": result.outcome.value,
+        "steps": result.steps,
+        "stored_steps": solution.get("steps_count"),
+        "stars_collected": result.stars_collected,
+        "total_stars": result.total_stars,
+    }
+
+
+def verify_batch(jobs: list[Job], max_steps: int) -> list[dict[str, Any]]:
+    """worker 入口：一次處理一批關卡"""
+    return [verify_level(job, max_steps) for job in jobs]
+
+
+def stream_jobs(conn, batch_size: int, limit: int | None) -> Iterator[list[Job]]:
+    """以 server-side cursor 串流已發布關卡，每次產出一批"""
+    stmt = (
+        select(Level.id, Level.map_data, Level.config, Level.solution)
+        .where(Level.status == LevelStatus.PUBLISHED)
+        .order_by(Level.id)
+    )
+    if limit:
+        stmt = stmt.limit(limit)
+    result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+    for partition in result.partitions():
+        yield [tuple(row) for row in partition]
+
+
+def run_pool(
+    batches: Iterable[list[Job]], workers: int, max_steps: int
+) -> Iterator[dict[str, Any]]:
+    """以程序池執行，最多 workers*2 個批次在途（讀取速度與運算速度互相牽制）"""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for batch in batches:
+            pending.add(pool.submit(verify_batch, batch, max_steps))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        for future in pending:
+            yield from future.result()
+
+
+def flag_results(failed: list[dict[str, Any]], passed_ids: list[str]) -> None:
+    """寫入失敗標記並清除已通過關卡的舊標記（不更新 updated_at，不影響 ETag）"""
+    levels = Level.__table__
+    checked_at = datetime.now(UTC).isoformat()
+    set_flag = (
+        update(levels)
+        .where(levels.c.id == bindparam("b_id"))
+        .values(
+            metadata=func.coalesce(levels.c.metadata, text("'{}'::jsonb"))
+            .op("||")(bindparam("b_flag", type_=JSONB)),
+            updated_at=levels.c.updated_at,
+        )
+    )
+    clear_flag = (
+        update(levels)
+        .where(levels.c.id.in_(bindparam("b_ids", expanding=True)))
+        .where(levels.c.metadata.has_key("verification"))
+        .values(
+            metadata=levels.c.metadata.op("-")(literal("verification", Text)),
+            updated_at=levels.c.updated_at,
+        )
+    )
+    with engine.begin() as conn:
+        if failed:
+            conn.execute(set_flag, [
+                {
+                    "b_id": row["id"],
+                    "b_flag": {"verification": {
+                        "status": row["status"],
+                        "outcome": row["outcome"],
+                        "steps": row.get("steps"),
+                        "detail": row.get("detail"),
+                        "checked_at": checked_at,
+                    }},
+                }
+                for row in failed
+            ])
+        for start in range(0, len(passed_ids), 1000):
+            conn.execute(clear_flag, {"b_ids": passed_ids[start:start + 1000]})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="已發布關卡批次重新驗證")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker 程序數")
+    parser.add_argument("--batch-size", type=int, default=200, help="每個 task 的關卡數（亦為 yield_per）")
+    parser.add_argument("--max-steps", type=int, default=settings.engine_max_steps)
+    parser.add_argument("--limit", type=int, default=None, help="只檢查前 N 筆（依 id 排序）")
+    parser.add_argument("--report", default="reverify_report.csv", help="CSV 報表路徑")
+    parser.add_argument("--flag", action="store_true", help="將結果寫入 levels.metadata.verification")
+    args = parser.parse_args()
+
+    counts = {"pass": 0, "fail": 0, "error": 0}
+    failed: list[dict[str, Any]] = []
+    passed_ids: list[str] = []
+    started = time.perf_counter()
+
+    with open(args.report, "w", newline="", encoding="utf-8") as report, engine.connect() as conn:
+        writer = csv.DictWriter(report, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        batches = stream_jobs(conn, args.batch_size, args.limit)
+        for row in run_pool(batches, args.workers, args.max_steps):
+            writer.writerow(row)
+            counts[row["status"]] += 1
+            if row["status"] == "pass":
+                passed_ids.append(row["id"])
+            else:
+                failed.append(row)
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    print(f"checked      {total} published levels with {args.workers} workers")
+    print(f"pass/fail    {counts['pass']} / {counts['fail']} (error {counts['error']})")
+    print(f"elapsed      {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} levels/s)")
+    print(f"report       {args.report}")
+
+    if args.flag:
+        flag_results(failed, passed_ids)
+        print(f"flagged      {len(failed)} levels in metadata.verification")
+
+
+if __name__ == "__main__":
+    main()